@@ -0,0 +1,109 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from tux.benchmarks import seed as seeding
+from tux.benchmarks.suite import (
+    BASELINE_PATH,
+    BenchmarkResult,
+    build_benchmarks,
+    compare,
+    load_baseline,
+    run_benchmark,
+    save_baseline,
+)
+from tux.database.client import LOCAL_HOSTS, db
+from tux.utils.config import CONFIG
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tux.benchmarks",
+        description="Benchmark the database controllers against seeded data and compare with a stored baseline.",
+    )
+    parser.add_argument("--seed", action="store_true", help="Replace the benchmark data before running.")
+    parser.add_argument("--seed-only", action="store_true", help="Replace the benchmark data without running.")
+    parser.add_argument("--clear", action="store_true", help="Delete the benchmark data after running.")
+    parser.add_argument("--levels", type=int, default=100_000, help="Levels rows to seed.")
+    parser.add_argument("--cases", type=int, default=50_000, help="Cases to seed.")
+    parser.add_argument("--snippets", type=int, default=10_000, help="Snippets to seed per guild.")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per benchmark.")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls per benchmark.")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this.")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative slowdown of the median.")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="The baseline file.")
+    parser.add_argument("--update-baseline", action="store_true", help="Store the results as the new baseline.")
+    parser.add_argument(
+        "--require-baseline",
+        action="store_true",
+        help="Fail when the baseline is missing or empty, e.g. in CI.",
+    )
+    parser.add_argument("--allow-remote", action="store_true", help="Allow seeding a non-local database.")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+
+    host = urlparse(CONFIG.DATABASE_URL).hostname
+    if (args.seed or args.seed_only or args.clear) and host not in LOCAL_HOSTS and not args.allow_remote:
+        logger.critical(f"Refusing to write benchmark data to {host}; pass --allow-remote to override.")
+        return 2
+
+    await db.connect()
+
+    try:
+        if args.seed or args.seed_only:
+            await seeding.seed(args.levels, args.cases, args.snippets)
+
+        if args.seed_only:
+            return 0
+
+        results: dict[str, BenchmarkResult] = {}
+
+        for benchmark in build_benchmarks(args.levels, args.cases, args.snippets):
+            if args.filter in benchmark.name:
+                results[benchmark.name] = result = await run_benchmark(benchmark, args.iterations, args.warmup)
+                logger.info(
+                    f"{benchmark.name}: median {result.median_ms:.2f}ms, p95 {result.p95_ms:.2f}ms, "
+                    f"{result.queries:g} queries/call",
+                )
+
+        if args.clear:
+            await seeding.clear()
+
+    finally:
+        await db.disconnect()
+
+    if args.update_baseline:
+        save_baseline(load_baseline(args.baseline) | results, args.baseline)
+        logger.info("Baseline updated.")
+        return 0
+
+    return check_regressions(results, args)
+
+
+def check_regressions(results: dict[str, BenchmarkResult], args: argparse.Namespace) -> int:
+    if not (baseline := load_baseline(args.baseline)):
+        if args.require_baseline:
+            logger.error(f"No baseline stored at {args.baseline}, nothing to compare with.")
+            return 1
+
+        logger.warning("No baseline stored yet; run with --update-baseline to create one.")
+        return 0
+
+    if regressions := compare(results, baseline, args.tolerance):
+        for regression in regressions:
+            logger.error(f"Regression in {regression.name}: {regression.reason}")
+        return 1
+
+    logger.info(f"No regressions across {len(results)} benchmarks.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,182 @@
+import argparse
+import asyncio
+import gc
+import itertools
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any
+
+import discord
+from discord.state import ChunkRequest
+from loguru import logger
+
+from tux.loadtest.fixtures import SyntheticGuild, member_payload, user_payload
+from tux.utils.member_cache import PROFILES, MemberCacheProfile
+
+# Members per GUILD_MEMBERS_CHUNK, as sent by Discord
+CHUNK_SIZE = 1000
+# Share of members that are online, and so have a presence
+ONLINE_SHARE = 0.3
+
+
+@dataclass
+class MemoryResult:
+    profile: str
+    cached_members: int
+    memory_bytes: int
+    seconds: float
+
+
+def presence_payload(guild_id: int, member_id: int) -> dict[str, Any]:
+    return {
+        "user": {"id": str(member_id)},
+        "guild_id": str(guild_id),
+        "status": "online",
+        "activities": [{"name": "SuperTuxKart", "type": 0, "created_at": 0}],
+        "client_status": {"desktop": "online"},
+    }
+
+
+def chunk(state: Any, guild: SyntheticGuild) -> None:
+    """
+    Cache every member of the guild the way discord.py handles a chunk request, with presences if received.
+    """
+
+    request = ChunkRequest(guild.id, 0, asyncio.get_running_loop(), state._get_guild, cache=True)
+    state._chunk_requests[request.nonce] = request
+
+    batches = list(itertools.batched(guild.member_ids, CHUNK_SIZE))
+
+    for index, batch in enumerate(batches):
+        data: dict[str, Any] = {
+            "guild_id": str(guild.id),
+            "members": [member_payload(member_id, guild.random_roles()) for member_id in batch],
+            "chunk_index": index,
+            "chunk_count": len(batches),
+            "nonce": request.nonce,
+        }
+
+        if state._intents.presences:
+            online = [member_id for member_id in batch if guild.random.random() < ONLINE_SHARE]
+            data["presences"] = [presence_payload(guild.id, member_id) for member_id in online]
+
+        state.parse_guild_members_chunk(data)
+
+
+async def measure(
+    profile: MemberCacheProfile,
+    members: int,
+    events: int,
+    chunked: bool,
+    seed: int = 0,
+) -> MemoryResult:
+    """
+    Measure the memory a guild takes in discord.py's cache under a member cache profile.
+
+    The guild arrives the way Discord sends large guilds, without its members, and is chunked if the
+    profile chunks at startup (or `chunked` is set, for a guild chunked on first need). A stream of
+    messages, joins and voice and presence updates follows.
+
+    Parameters
+    ----------
+    profile : MemberCacheProfile
+        The profile to measure.
+    members : int
+        The number of members in the guild.
+    events : int
+        The number of gateway events to feed after startup.
+    chunked : bool
+        Whether to chunk the guild even if the profile does not chunk at startup.
+    seed : int
+        The random seed, so every profile sees the same guild and events.
+
+    Returns
+    -------
+    MemoryResult
+        The cached members and the memory allocated for the guild and its events.
+    """
+
+    client = discord.Client(
+        intents=profile.intents(),
+        member_cache_flags=profile.member_cache_flags(),
+        chunk_guilds_at_startup=profile.chunk_at_startup,
+    )
+    await client._async_setup_hook()  # pyright: ignore[reportPrivateUsage]
+
+    state: Any = client._connection  # pyright: ignore[reportPrivateUsage]
+    state.user = discord.ClientUser(state=state, data=user_payload(1, bot=True))
+
+    guild = SyntheticGuild(members=members, seed=seed)
+    payload = guild.guild_payload() | {"members": [], "large": True}
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    discord_guild = state._add_guild_from_data(payload)
+    del payload
+
+    if profile.chunk_at_startup or chunked:
+        chunk(state, guild)
+
+    for (event_type, data), _ in zip(
+        guild.events({"message": 0.85, "reaction": 0.05, "join": 0.05, "voice": 0.05}),
+        range(events),
+        strict=False,
+    ):
+        state.parsers[event_type](data)
+
+        if profile.presences and guild.random.random() < 0.5:
+            state.parse_presence_update(presence_payload(guild.id, guild.random.choice(guild.member_ids)))
+
+    seconds = time.perf_counter() - start
+    gc.collect()
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    result = MemoryResult(profile.name, len(discord_guild.members), memory, seconds)
+    await client.close()
+    return result
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tux.benchmarks.memory",
+        description="Compare the memory the member cache profiles use for a large synthetic guild.",
+    )
+    parser.add_argument("--members", type=int, default=100_000, help="Members in the synthetic guild.")
+    parser.add_argument("--events", type=int, default=10_000, help="Gateway events to feed after startup.")
+    parser.add_argument(
+        "--profiles",
+        default=",".join(PROFILES),
+        help="Comma-separated profiles to compare.",
+    )
+    return parser.parse_args()
+
+
+async def main() -> None:
+    args = parse_args()
+    results: list[MemoryResult] = []
+
+    for name in args.profiles.split(","):
+        profile = PROFILES[name]
+        results.append(await measure(profile, args.members, args.events, chunked=False))
+
+        # Profiles that chunk lazily hold the whole member list once a cog needs it
+        if not profile.chunk_at_startup:
+            result = await measure(profile, args.members, args.events, chunked=True)
+            result.profile = f"{name} (chunked)"
+            results.append(result)
+
+    logger.info(f"Member cache memory for a {args.members}-member guild after {args.events} events:")
+
+    for result in results:
+        logger.info(
+            f"  {result.profile:<20} {result.memory_bytes / 1024 / 1024:8.1f} MiB, "
+            f"{result.cached_members} members cached, {result.seconds:.1f}s",
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+import random
+from datetime import UTC, datetime, timedelta
+
+from loguru import logger
+
+from prisma.enums import CaseType
+from tux.database.client import db
+from tux.database.controllers.case_search import CaseSearchController
+
+# Guild IDs far below any real snowflake, so benchmark data never collides with real guilds
+BENCHMARK_GUILD_IDS: tuple[int, ...] = (1001, 1002)
+BENCHMARK_GUILD_ID = BENCHMARK_GUILD_IDS[0]
+
+# Rows are inserted in batches of this size
+BATCH_SIZE = 5000
+
+
+async def clear() -> None:
+    """
+    Delete all benchmark data.
+    """
+
+    where = {"guild_id": {"in": list(BENCHMARK_GUILD_IDS)}}
+
+    await db.levels.delete_many(where=where)
+    await db.case.delete_many(where=where)
+    await db.snippet.delete_many(where=where)
+    await db.afkmodel.delete_many(where=where)
+    await db.reminder.delete_many(where=where)
+    await db.starboardmessage.delete_many(where={"message_guild_id": {"in": list(BENCHMARK_GUILD_IDS)}})
+    await db.starboard.delete_many(where=where)
+    await db.guildconfig.delete_many(where=where)
+    await db.guild.delete_many(where=where)
+
+
+async def seed(levels: int = 100_000, cases: int = 50_000, snippets: int = 10_000, seed: int = 0) -> None:
+    """
+    Replace the benchmark data with realistic volumes.
+
+    Levels and cases go to the main benchmark guild; every benchmark guild gets `snippets` snippets,
+    so guild filters are exercised against other guilds' rows.
+
+    Parameters
+    ----------
+    levels : int
+        The number of levels rows.
+    cases : int
+        The number of cases.
+    snippets : int
+        The number of snippets per guild.
+    seed : int
+        The random seed, so every run benchmarks the same data.
+    """
+
+    rng = random.Random(seed)
+    now = datetime.now(UTC)
+    case_types = list(CaseType)
+
+    await clear()
+    # Generated before the cases are inserted, so the local database is not rewritten once they are
+    await CaseSearchController().ensure_search_columns()
+
+    for guild_id in BENCHMARK_GUILD_IDS:
+        await db.guild.create(data={"guild_id": guild_id, "case_count": cases if guild_id == BENCHMARK_GUILD_ID else 0})
+        await db.guildconfig.create(
+            data={"guild_id": guild_id, "prefix": "$", "mod_log_id": 1, "perm_level_1_role_id": 1},
+        )
+
+    for start in range(0, levels, BATCH_SIZE):
+        await db.levels.create_many(
+            data=[
+                {
+                    "member_id": member_id,
+                    "guild_id": BENCHMARK_GUILD_ID,
+                    "xp": rng.uniform(0, 50_000),
+                    "level": rng.randint(0, 60),
+                    "last_message": now - timedelta(minutes=rng.randint(0, 100_000)),
+                }
+                for member_id in range(start + 1, min(start + BATCH_SIZE, levels) + 1)
+            ],
+        )
+
+    for start in range(0, cases, BATCH_SIZE):
+        await db.case.create_many(
+            data=[
+                {
+                    "guild_id": BENCHMARK_GUILD_ID,
+                    "case_number": case_number,
+                    "case_type": rng.choice(case_types),
+                    "case_reason": "Benchmark case",
+                    "case_moderator_id": rng.randint(1, 50),
+                    "case_user_id": rng.randint(1, levels or 1),
+                    "case_created_at": now - timedelta(minutes=cases - case_number),
+                }
+                for case_number in range(start + 1, min(start + BATCH_SIZE, cases) + 1)
+            ],
+        )
+
+    for guild_id in BENCHMARK_GUILD_IDS:
+        for start in range(0, snippets, BATCH_SIZE):
+            await db.snippet.create_many(
+                data=[
+                    {
+                        "snippet_name": f"snippet-{index}",
+                        "snippet_content": "Benchmark snippet content " * rng.randint(1, 20),
+                        "snippet_user_id": rng.randint(1, 1000),
+                        "guild_id": guild_id,
+                        "uses": rng.randint(0, 5000),
+                    }
+                    for index in range(start, min(start + BATCH_SIZE, snippets))
+                ],
+            )
+
+    await db.afkmodel.create_many(
+        data=[
+            {
+                "member_id": member_id,
+                "nickname": f"user{member_id}",
+                "reason": "Benchmark",
+                "guild_id": BENCHMARK_GUILD_ID,
+            }
+            for member_id in range(1, 1001)
+        ],
+    )
+
+    await db.reminder.create_many(
+        data=[
+            {
+                "reminder_content": "Benchmark reminder",
+                "reminder_expires_at": now + timedelta(minutes=rng.randint(-60, 10_000)),
+                "reminder_channel_id": 1,
+                "reminder_user_id": rng.randint(1, 1000),
+                "guild_id": BENCHMARK_GUILD_ID,
+            }
+            for _ in range(5000)
+        ],
+    )
+
+    await db.starboard.create(
+        data={
+            "guild_id": BENCHMARK_GUILD_ID,
+            "starboard_channel_id": 1,
+            "starboard_emoji": "⭐",
+            "starboard_threshold": 3,
+        },
+    )
+    await db.starboardmessage.create_many(
+        data=[
+            {
+                "message_id": message_id,
+                "message_content": "Benchmark message",
+                "message_expires_at": now + timedelta(days=7),
+                "message_channel_id": 1,
+                "message_user_id": rng.randint(1, 1000),
+                "message_guild_id": BENCHMARK_GUILD_ID,
+                "star_count": rng.randint(3, 30),
+                "starboard_message_id": message_id + 1_000_000,
+            }
+            for message_id in range(1, 5001)
+        ],
+    )
+
+    logger.info(
+        f"Seeded {levels} levels rows, {cases} cases and {snippets} snippets per guild "
+        f"for {len(BENCHMARK_GUILD_IDS)} benchmark guilds.",
+    )
@@ -0,0 +1,239 @@
+import json
+import random
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from prisma.enums import CaseType
+from tux.benchmarks.seed import BENCHMARK_GUILD_ID
+from tux.database.controllers import DatabaseController
+from tux.database.controllers.levels import LevelsController
+from tux.database.tracing import query_tracer
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+
+@dataclass
+class Benchmark:
+    """
+    A controller method call to time, built fresh for every iteration so arguments can vary.
+    """
+
+    name: str
+    call: Callable[[random.Random], Awaitable[Any]]
+
+
+@dataclass
+class BenchmarkResult:
+    median_ms: float
+    p95_ms: float
+    queries: float
+
+
+@dataclass
+class Regression:
+    name: str
+    reason: str
+
+
+def build_benchmarks(levels: int = 100_000, cases: int = 50_000, snippets: int = 10_000) -> list[Benchmark]:
+    """
+    Build the benchmarks for the controllers, against the seeded benchmark guild.
+
+    Parameters
+    ----------
+    levels : int
+        The number of seeded levels rows, to pick existing members.
+    cases : int
+        The number of seeded cases, to pick existing case numbers.
+    snippets : int
+        The number of seeded snippets per guild, to pick existing names.
+
+    Returns
+    -------
+    list[Benchmark]
+        The benchmarks.
+    """
+
+    db = DatabaseController()
+    levels_db = LevelsController()
+    guild_id = BENCHMARK_GUILD_ID
+
+    def member(rng: random.Random) -> int:
+        return rng.randint(1, levels)
+
+    def snippet_name(rng: random.Random) -> str:
+        return f"snippet-{rng.randrange(snippets)}"
+
+    return [
+        # Levels
+        Benchmark("levels.get_xp", lambda rng: levels_db.get_xp(member(rng), guild_id)),
+        Benchmark("levels.get_xp_and_level", lambda rng: levels_db.get_xp_and_level(member(rng), guild_id)),
+        Benchmark("levels.get_last_message_time", lambda rng: levels_db.get_last_message_time(member(rng), guild_id)),
+        Benchmark("levels.is_blacklisted", lambda rng: levels_db.is_blacklisted(member(rng), guild_id)),
+        Benchmark(
+            "levels.update_xp_and_level",
+            lambda rng: levels_db.update_xp_and_level(
+                member(rng),
+                guild_id,
+                rng.uniform(0, 50_000),
+                rng.randint(0, 60),
+                datetime.now(UTC),
+            ),
+        ),
+        # Cases
+        Benchmark("case.get_next_case_number", lambda rng: db.case.get_next_case_number(guild_id)),
+        Benchmark("case.get_case_by_number", lambda rng: db.case.get_case_by_number(guild_id, rng.randint(1, cases))),
+        Benchmark("case.get_all_cases_by_user_id", lambda rng: db.case.get_all_cases_by_user_id(guild_id, member(rng))),
+        Benchmark(
+            "case.get_cases_by_options",
+            lambda rng: db.case.get_cases_by_options(guild_id, {"case_moderator_id": rng.randint(1, 50)}),
+        ),
+        Benchmark(
+            "case.insert_case",
+            lambda rng: db.case.insert_case(guild_id, member(rng), 1, CaseType.WARN, "Benchmark"),
+        ),
+        # Every seeded case reason matches, the worst case for ranking; no seeded case matches the second query
+        Benchmark("case_search.search", lambda rng: db.case_search.search(guild_id, "benchmark", 10)),
+        Benchmark("case_search.search_no_match", lambda rng: db.case_search.search(guild_id, "ban evasion", 10)),
+        # Snippets
+        Benchmark(
+            "snippet.get_snippet_by_name_and_guild_id",
+            lambda rng: db.snippet.get_snippet_by_name_and_guild_id(snippet_name(rng), guild_id),
+        ),
+        Benchmark(
+            "snippet.get_snippet_by_exact_name_and_guild_id",
+            lambda rng: db.snippet.get_snippet_by_exact_name_and_guild_id(snippet_name(rng), guild_id),
+        ),
+        Benchmark(
+            "snippet.get_snippet_names_by_guild_id",
+            lambda rng: db.snippet.get_snippet_names_by_guild_id(guild_id),
+        ),
+        # AFK
+        Benchmark("afk.get_afk_member", lambda rng: db.afk.get_afk_member(rng.randint(1, 2000), guild_id=guild_id)),
+        Benchmark("afk.is_perm_afk", lambda rng: db.afk.is_perm_afk(rng.randint(1, 2000), guild_id=guild_id)),
+        # Starboard
+        Benchmark("starboard.get_starboard_by_guild_id", lambda rng: db.starboard.get_starboard_by_guild_id(guild_id)),
+        Benchmark(
+            "starboard_message.get_starboard_message_by_id",
+            lambda rng: db.starboard_message.get_starboard_message_by_id(rng.randint(1, 5000), guild_id),
+        ),
+        Benchmark(
+            "starboard_message.update_star_count",
+            lambda rng: db.starboard_message.update_star_count(rng.randint(1, 5000), guild_id, rng.randint(3, 30)),
+        ),
+        # Guild config
+        Benchmark("guild_config.get_guild_prefix", lambda rng: db.guild_config.get_guild_prefix(guild_id)),
+        Benchmark("guild_config.get_log_channel", lambda rng: db.guild_config.get_log_channel(guild_id, "mod")),
+        Benchmark("guild_config.get_perm_level_roles", lambda rng: db.guild_config.get_perm_level_roles(guild_id, 1)),
+        # Reminders
+        Benchmark("reminder.get_unsent_reminders", lambda rng: db.reminder.get_unsent_reminders()),
+    ]
+
+
+async def run_benchmark(benchmark: Benchmark, iterations: int, warmup: int, seed: int = 0) -> BenchmarkResult:
+    """
+    Time a benchmark and count the queries it issues per call.
+
+    Parameters
+    ----------
+    benchmark : Benchmark
+        The benchmark to run.
+    iterations : int
+        The number of timed calls.
+    warmup : int
+        The number of untimed calls first.
+    seed : int
+        The random seed for the call arguments.
+
+    Returns
+    -------
+    BenchmarkResult
+        The median and 95th percentile call time and the mean queries per call.
+    """
+
+    rng = random.Random(seed)
+
+    for _ in range(warmup):
+        await benchmark.call(rng)
+
+    timings: list[float] = []
+    queries = 0
+
+    for _ in range(iterations):
+        with query_tracer.trace(f"benchmark:{benchmark.name}") as trace:
+            start = time.perf_counter()
+            await benchmark.call(rng)
+            timings.append(time.perf_counter() - start)
+
+        queries += trace.query_count
+
+    timings.sort()
+
+    return BenchmarkResult(
+        median_ms=statistics.median(timings) * 1000,
+        p95_ms=timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000,
+        queries=queries / iterations,
+    )
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, BenchmarkResult]:
+    if not path.exists():
+        return {}
+
+    return {name: BenchmarkResult(**result) for name, result in json.loads(path.read_text()).items()}
+
+
+def save_baseline(results: dict[str, BenchmarkResult], path: Path = BASELINE_PATH) -> None:
+    path.write_text(json.dumps({name: asdict(result) for name, result in sorted(results.items())}, indent=2) + "\n")
+
+
+def compare(
+    results: dict[str, BenchmarkResult],
+    baseline: dict[str, BenchmarkResult],
+    tolerance: float = 0.25,
+    slack_ms: float = 0.5,
+) -> list[Regression]:
+    """
+    Compare results against a baseline.
+
+    Any increase in queries per call is a regression, since query counts are deterministic. A median slower
+    than the baseline by more than `tolerance` (a fraction) plus `slack_ms` is a regression too; the
+    absolute slack keeps sub-millisecond calls from failing on noise.
+
+    Parameters
+    ----------
+    results : dict[str, BenchmarkResult]
+        The new results.
+    baseline : dict[str, BenchmarkResult]
+        The baseline results.
+    tolerance : float
+        The allowed relative slowdown of the median.
+    slack_ms : float
+        The allowed absolute slowdown of the median, in milliseconds.
+
+    Returns
+    -------
+    list[Regression]
+        The regressions found.
+    """
+
+    regressions: list[Regression] = []
+
+    for name, result in results.items():
+        if (base := baseline.get(name)) is None:
+            continue
+
+        if result.queries > base.queries:
+            regressions.append(Regression(name, f"{result.queries:g} queries per call, was {base.queries:g}"))
+
+        if result.median_ms > base.median_ms * (1 + tolerance) + slack_ms:
+            regressions.append(
+                Regression(name, f"median {result.median_ms:.2f}ms, was {base.median_ms:.2f}ms"),
+            )
+
+    return regressions
@@ -1,15 +1,62 @@
 import asyncio
+import time
+from collections.abc import Callable, Coroutine
 from typing import Any
 
+import discord
+import sentry_sdk
+from discord import app_commands
 from discord.ext import commands
 from loguru import logger
 
 from tux.cog_loader import CogLoader
 from tux.database.client import db
+from tux.database.tracing import query_tracer
+from tux.utils.config import CONFIG
+from tux.utils.log_dispatcher import log_dispatcher
+from tux.utils.member_cache import MemberNeeds
+from tux.utils.metrics import COMMAND_LATENCY, COMMANDS_TOTAL, LISTENER_LATENCY
+from tux.utils.stall_detector import stall_detector
 
 
-class Tux(commands.Bot):
+class TuxCommandTree(app_commands.CommandTree["Tux"]):
+    async def _call(self, interaction: discord.Interaction["Tux"]) -> None:
+        """
+        Runs an app command in a Sentry transaction, attributing the database queries it issues to the command
+        and timing it.
+
+        Slash commands, including hybrid commands used as slash commands, never go through `Tux.invoke`.
+        """
+
+        if interaction.type is not discord.InteractionType.application_command:
+            await super()._call(interaction)
+            return
+
+        command = interaction.command.qualified_name if interaction.command else "unknown"
+        start = time.perf_counter()
+        failed = True
+
+        try:
+            with (
+                sentry_sdk.start_transaction(
+                    op="command",
+                    name=f"command:{command}",
+                    custom_sampling_context={"cog": interaction.command.module if interaction.command else ""},
+                ),
+                query_tracer.trace(f"command:{command}"),
+            ):
+                await super()._call(interaction)
+
+            failed = interaction.command_failed
+
+        finally:
+            COMMAND_LATENCY.observe(time.perf_counter() - start, command=command)
+            COMMANDS_TOTAL.inc(command=command, status="error" if failed else "success")
+
+
+class Tux(commands.AutoShardedBot):
     def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("tree_cls", TuxCommandTree)
         super().__init__(*args, **kwargs)
         self.setup_task = asyncio.create_task(self.setup())
         self.is_shutting_down = False
@@ -19,6 +66,9 @@ class Tux(commands.Bot):
         Sets up the bot by connecting to the database and loading cogs.
         """
 
+        if CONFIG.STALL_DETECTOR_ENABLED:
+            stall_detector.start()
+
         try:
             # Connect to Prisma
             logger.info("Setting up Prisma client...")
@@ -34,6 +84,7 @@ class Tux(commands.Bot):
         await self.load_extension("jishaku")
         # Load cogs via CogLoader
         await self.load_cogs()
+        self.check_member_needs()
 
     async def load_cogs(self) -> None:
         """
@@ -43,6 +94,80 @@ class Tux(commands.Bot):
         logger.info("Loading cogs...")
         await CogLoader.setup(self)
 
+    def check_member_needs(self) -> None:
+        """
+        Checks the member cache needs cogs declare against the intents the bot was started with.
+        """
+
+        needs = {name: getattr(cog, "member_needs", MemberNeeds.NONE) for name, cog in self.cogs.items()}
+
+        presences = [name for name, need in needs.items() if MemberNeeds.PRESENCES in need]
+
+        if presences and not self.intents.presences:
+            logger.warning(
+                f"{', '.join(presences)} need presences, but the member cache profile does not receive them."
+            )
+
+        if not self._connection._chunk_guilds:  # pyright: ignore[reportPrivateUsage]
+            member_list = [name for name, need in needs.items() if MemberNeeds.MEMBER_LIST in need]
+            logger.info(f"Guilds are chunked on first use by {', '.join(member_list) or 'no cogs'}.")
+
+    def cluster_guild_ids(self) -> list[int] | None:
+        """
+        Gets the IDs of the guilds this process serves when it runs a slice of the shards, so work over every
+        guild's rows, such as expiring tempbans, is only done by one process. Returns None when this process runs
+        every shard.
+        """
+
+        return None if CONFIG.SHARD_IDS is None else [guild.id for guild in self.guilds]
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Runs an event listener, attributing the database queries it issues to the listener and timing it.
+        """
+
+        listener = getattr(coro, "__qualname__", event_name)
+        start = time.perf_counter()
+
+        with (
+            sentry_sdk.start_transaction(
+                op="event",
+                name=f"event:{event_name}:{listener}",
+                custom_sampling_context={"cog": getattr(coro, "__module__", "")},
+            ),
+            query_tracer.trace(f"event:{listener}"),
+        ):
+            await super()._run_event(coro, event_name, *args, **kwargs)
+
+        LISTENER_LATENCY.observe(time.perf_counter() - start, listener=listener)
+
+    async def invoke(self, ctx: commands.Context[Any]) -> None:
+        """
+        Invokes a command, attributing the database queries it issues to the command and timing it.
+        """
+
+        command = ctx.command.qualified_name if ctx.command else "unknown"
+        start = time.perf_counter()
+
+        with (
+            sentry_sdk.start_transaction(
+                op="command",
+                name=f"command:{command}",
+                custom_sampling_context={"cog": ctx.command.module if ctx.command else ""},
+            ),
+            query_tracer.trace(f"command:{command}"),
+        ):
+            await super().invoke(ctx)
+
+        COMMAND_LATENCY.observe(time.perf_counter() - start, command=command)
+        COMMANDS_TOTAL.inc(command=command, status="error" if ctx.command_failed else "success")
+
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         """
@@ -68,7 +193,9 @@ class Tux(commands.Bot):
         self.is_shutting_down = True
         logger.info("Shutting down...")
 
+        await log_dispatcher.flush()
         await self.close()
+        stall_detector.stop()
 
         if tasks := [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]:
             logger.debug(f"Cancelling {len(tasks)} outstanding tasks.")
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import sys
+
+from loguru import logger
+
+from tux.cluster.supervisor import ClusterSupervisor, fetch_gateway_info
+from tux.utils.config import CONFIG
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tux.cluster",
+        description="Run Tux's shards across several bot processes, restarting any that exit.",
+    )
+    parser.add_argument("--clusters", type=int, default=CONFIG.CLUSTERS, help="The number of bot processes.")
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=CONFIG.SHARD_COUNT,
+        help="The total number of shards; defaults to Discord's recommendation.",
+    )
+    parser.add_argument("--socket", default=CONFIG.CLUSTER_SOCKET_PATH, help="The cluster bus socket path.")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+
+    if not CONFIG.TOKEN:
+        logger.critical("No token provided, exiting.")
+        return 1
+
+    recommended_shards, max_concurrency = await fetch_gateway_info(CONFIG.TOKEN)
+    shard_count = args.shards or recommended_shards
+
+    if shard_count < recommended_shards:
+        logger.warning(f"Running {shard_count} shards, fewer than the {recommended_shards} Discord recommends.")
+
+    await ClusterSupervisor(shard_count, args.clusters, args.socket, max_concurrency).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
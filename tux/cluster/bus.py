@@ -0,0 +1,165 @@
+import asyncio
+import contextlib
+import inspect
+import json
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from loguru import logger
+
+Handler = Callable[[dict[str, Any]], Awaitable[None] | None]
+
+# Topics carrying cache invalidations are named "invalidate:<cache>" and carry {"guild_id": int | None}
+INVALIDATE_PREFIX = "invalidate:"
+
+# Longest wait between attempts to reconnect to the supervisor, in seconds
+MAX_RECONNECT_DELAY = 30
+
+
+def encode(message: dict[str, Any]) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+class ClusterBus:
+    """
+    Publish/subscribe between the bot processes of a sharded deployment, relayed by the cluster supervisor.
+
+    Messages are only delivered to the *other* processes, so publishers apply a change locally themselves.
+    Without a supervisor, when one process runs every shard, publishing does nothing.
+    """
+
+    def __init__(self) -> None:
+        self.handlers: defaultdict[str, list[Handler]] = defaultdict(list)
+        self.writer: asyncio.StreamWriter | None = None
+        self.task: asyncio.Task[None] | None = None
+        self.cluster_id = 0
+
+    @property
+    def connected(self) -> bool:
+        return self.writer is not None
+
+    def subscribe(self, topic: str, handler: Handler) -> None:
+        self.handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Handler) -> None:
+        with contextlib.suppress(ValueError):
+            self.handlers[topic].remove(handler)
+
+    def start(self, path: str, cluster_id: int) -> None:
+        """
+        Connect to the supervisor's socket in the background, reconnecting whenever the connection drops.
+
+        Parameters
+        ----------
+        path : str
+            The path of the supervisor's Unix socket.
+        cluster_id : int
+            The ID of this process, sent with every message.
+        """
+
+        if self.task is None:
+            self.cluster_id = cluster_id
+            self.task = asyncio.create_task(self._run(path))
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.task
+            self.task = None
+
+    async def _run(self, path: str) -> None:
+        delay = 1
+        reconnecting = False
+
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(path)
+
+            except OSError as e:
+                logger.warning(f"Could not connect to the cluster bus at {path}: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                continue
+
+            self.writer = writer
+            delay = 1
+            logger.info(f"Cluster {self.cluster_id} connected to the cluster bus.")
+
+            # Invalidations published while disconnected were missed, so drop every cache that listens for them
+            if reconnecting:
+                for topic in [topic for topic in self.handlers if topic.startswith(INVALIDATE_PREFIX)]:
+                    await self._dispatch(topic, {"guild_id": None})
+
+            try:
+                while line := await reader.readline():
+                    await self._receive(line)
+
+            except ConnectionError:
+                pass
+
+            finally:
+                self.writer = None
+                writer.close()
+
+            logger.warning("Lost the cluster bus connection, reconnecting...")
+            reconnecting = True
+
+    async def _receive(self, line: bytes) -> None:
+        try:
+            message = json.loads(line)
+            topic, data = message["topic"], message["data"]
+
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed cluster bus message: {line[:200]!r}")
+            return
+
+        await self._dispatch(topic, data)
+
+    async def _dispatch(self, topic: str, data: dict[str, Any]) -> None:
+        for handler in list(self.handlers.get(topic, ())):
+            try:
+                result = handler(data)
+                if inspect.isawaitable(result):
+                    await result
+
+            except Exception as e:
+                logger.exception(f"Cluster bus handler for {topic} failed: {e}")
+
+    async def publish(self, topic: str, data: dict[str, Any]) -> None:
+        """
+        Send a message to the other bot processes. Messages are dropped while disconnected.
+
+        Parameters
+        ----------
+        topic : str
+            The topic to publish on.
+        data : dict[str, Any]
+            The JSON-serializable message.
+        """
+
+        if self.writer is None:
+            return
+
+        self.writer.write(encode({"topic": topic, "origin": self.cluster_id, "data": data}))
+
+        with contextlib.suppress(ConnectionError):
+            await self.writer.drain()
+
+    async def invalidate(self, cache: str, guild_id: int | None = None) -> None:
+        """
+        Tell the other bot processes to drop a cache entry.
+
+        Parameters
+        ----------
+        cache : str
+            The name of the cache.
+        guild_id : int | None
+            The guild whose entries are stale, or None for the whole cache.
+        """
+
+        await self.publish(f"{INVALIDATE_PREFIX}{cache}", {"guild_id": guild_id})
+
+
+cluster_bus = ClusterBus()
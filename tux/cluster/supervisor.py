@@ -0,0 +1,245 @@
+import asyncio
+import contextlib
+import math
+import os
+import signal
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import httpx
+from loguru import logger
+
+# Discord allows one identify per `max_concurrency` bucket every 5 seconds
+IDENTIFY_INTERVAL = 5.0
+# A cluster that stayed up this long has its restart backoff reset, in seconds
+STABLE_UPTIME = 300
+MAX_RESTART_DELAY = 300
+# Time a cluster gets to shut down gracefully before it is killed, in seconds
+SHUTDOWN_TIMEOUT = 30
+
+
+@dataclass
+class Cluster:
+    """
+    A bot process and the shards it runs.
+    """
+
+    id: int
+    shard_ids: list[int]
+    process: asyncio.subprocess.Process | None = None
+    restarts: int = 0
+    started_at: float = 0.0
+
+
+def assign_shards(shard_count: int, clusters: int) -> list[list[int]]:
+    """
+    Split the shards into contiguous, evenly sized ranges, one per cluster.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total number of shards.
+    clusters : int
+        The number of clusters; capped at the number of shards.
+
+    Returns
+    -------
+    list[list[int]]
+        The shard IDs of each cluster.
+    """
+
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+
+    assignments: list[list[int]] = []
+    start = 0
+
+    for cluster_id in range(clusters):
+        end = start + size + (cluster_id < extra)
+        assignments.append(list(range(start, end)))
+        start = end
+
+    return assignments
+
+
+async def fetch_gateway_info(token: str) -> tuple[int, int]:
+    """
+    Get Discord's recommended shard count and identify concurrency for the bot.
+
+    Parameters
+    ----------
+    token : str
+        The bot token.
+
+    Returns
+    -------
+    tuple[int, int]
+        The recommended shard count and the max identify concurrency.
+    """
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        response = await client.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"},
+        )
+        response.raise_for_status()
+        data = response.json()
+
+    return data["shards"], data["session_start_limit"]["max_concurrency"]
+
+
+class ClusterSupervisor:
+    """
+    Runs each cluster of shards in its own bot process, restarts clusters that exit, and relays
+    cluster bus messages between them over a Unix socket.
+
+    Parameters
+    ----------
+    shard_count : int
+        The total number of shards.
+    clusters : int
+        The number of bot processes.
+    socket_path : str
+        The path of the cluster bus socket.
+    max_concurrency : int
+        Discord's identify concurrency, used to stagger cluster startup.
+    """
+
+    def __init__(self, shard_count: int, clusters: int, socket_path: str, max_concurrency: int = 1) -> None:
+        self.shard_count = shard_count
+        self.clusters = [
+            Cluster(cluster_id, shard_ids) for cluster_id, shard_ids in enumerate(assign_shards(shard_count, clusters))
+        ]
+        self.socket_path = Path(socket_path)
+        self.max_concurrency = max_concurrency
+        self.writers: set[asyncio.StreamWriter] = set()
+        self.stopping = asyncio.Event()
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Relay every message a bot process sends to all the other bot processes.
+        """
+
+        self.writers.add(writer)
+
+        try:
+            while line := await reader.readline():
+                for other in list(self.writers):
+                    if other is not writer:
+                        other.write(line)
+
+        except ConnectionError:
+            pass
+
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def spawn(self, cluster: Cluster) -> asyncio.subprocess.Process:
+        env = os.environ | {
+            "TUX_CLUSTER_ID": str(cluster.id),
+            "TUX_SHARD_IDS": ",".join(map(str, cluster.shard_ids)),
+            "TUX_SHARD_COUNT": str(self.shard_count),
+            "TUX_CLUSTER_SOCKET": str(self.socket_path),
+        }
+
+        # A new session keeps a Ctrl+C in the terminal from reaching the clusters before the supervisor stops them
+        cluster.process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-m",
+            "tux.main",
+            env=env,
+            start_new_session=True,
+        )
+        cluster.started_at = time.monotonic()
+
+        logger.info(
+            f"Started cluster {cluster.id} (shards {cluster.shard_ids[0]}-{cluster.shard_ids[-1]}) "
+            f"as PID {cluster.process.pid}.",
+        )
+
+        return cluster.process
+
+    async def watch(self, cluster: Cluster) -> None:
+        """
+        Keep a cluster running, restarting it with exponential backoff whenever it exits.
+        """
+
+        while not self.stopping.is_set():
+            process = await self.spawn(cluster)
+            code = await process.wait()
+
+            if self.stopping.is_set():
+                return
+
+            if time.monotonic() - cluster.started_at > STABLE_UPTIME:
+                cluster.restarts = 0
+
+            delay = min(IDENTIFY_INTERVAL * 2**cluster.restarts, MAX_RESTART_DELAY)
+            cluster.restarts += 1
+
+            logger.error(f"Cluster {cluster.id} exited with code {code}, restarting in {delay:.0f}s.")
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.stopping.wait(), delay)
+
+    async def terminate(self, cluster: Cluster) -> None:
+        if cluster.process is None or cluster.process.returncode is not None:
+            return
+
+        # The bot shuts down gracefully on SIGINT, the same as on Ctrl+C
+        cluster.process.send_signal(signal.SIGINT)
+
+        try:
+            await asyncio.wait_for(cluster.process.wait(), SHUTDOWN_TIMEOUT)
+
+        except TimeoutError:
+            logger.warning(f"Cluster {cluster.id} did not shut down in {SHUTDOWN_TIMEOUT}s, killing it.")
+            cluster.process.kill()
+            await cluster.process.wait()
+
+    async def run(self) -> None:
+        """
+        Start the cluster bus and the clusters, and run until SIGINT or SIGTERM.
+        """
+
+        loop = asyncio.get_running_loop()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self.stopping.set)
+
+        self.socket_path.unlink(missing_ok=True)
+        server = await asyncio.start_unix_server(self.handle_client, self.socket_path)
+
+        logger.info(
+            f"Running {self.shard_count} shards in {len(self.clusters)} clusters, "
+            f"cluster bus on {self.socket_path}.",
+        )
+
+        watchers: list[asyncio.Task[None]] = []
+
+        for cluster in self.clusters:
+            watchers.append(asyncio.create_task(self.watch(cluster)))
+
+            # Give each cluster time to identify its shards before the next one starts
+            identify_rounds = math.ceil(len(cluster.shard_ids) / self.max_concurrency)
+
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self.stopping.wait(), IDENTIFY_INTERVAL * identify_rounds)
+
+            if self.stopping.is_set():
+                break
+
+        await self.stopping.wait()
+        logger.info("Stopping clusters...")
+
+        await asyncio.gather(*(self.terminate(cluster) for cluster in self.clusters))
+        await asyncio.gather(*watchers)
+
+        server.close()
+        await server.wait_closed()
+        self.socket_path.unlink(missing_ok=True)
+
+        logger.info("All clusters stopped.")
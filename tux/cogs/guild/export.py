@@ -5,9 +5,13 @@ from discord.ext import commands
 from tux.bot import Tux
 from tux.ui.embeds import EmbedCreator
 from tux.utils import checks, exports
+from tux.utils.guild_stats import guild_stats
+from tux.utils.member_cache import MemberNeeds, member_cache
 
 
 class Export(commands.Cog):
+    member_needs = MemberNeeds.MEMBER_LIST
+
     def __init__(self, bot: Tux) -> None:
         self.bot = bot
 
@@ -34,36 +38,67 @@ class Export(commands.Cog):
 
         assert interaction.guild
 
-        bans = [entry async for entry in interaction.guild.bans(limit=10000)]
         valid_flags = ["user", "display", "id", "reason", "mention", "created"]
 
-        if not bans:
-            embed = EmbedCreator.create_embed(
-                bot=self.bot,
-                embed_type=EmbedCreator.INFO,
-                user_name=interaction.user.name,
-                user_display_avatar=interaction.user.display_avatar.url,
-                title=f"{interaction.guild} Banned Users",
-                description="There are no banned users in this server.",
-            )
-
-            return await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=30)
-
         if flags and "--help" not in flags:
-            file = await exports.get_ban_list_csv(
+            await interaction.response.defer()
+
+            files, total = await exports.get_ban_list_csv(
                 interaction,
-                bans,
+                interaction.guild.bans(limit=None),
                 valid_flags,
                 flags.split(sep=" ") if flags else [],
             )
 
-            return await interaction.response.send_message(file=file)
+            if not total:
+                await interaction.followup.send(embed=self._no_bans_embed(interaction), ephemeral=True)
+                return
+
+            for file in files:
+                await interaction.followup.send(file=file)
+
+            return
+
+        # Walking a long ban list outlasts the 3 seconds an interaction has to respond, so the count comes from
+        # the guild stats service, or the response is deferred while the bans are counted
+        if (stats := guild_stats.peek(interaction.guild.id)) and stats.bans is not None:
+            total = stats.bans
+        else:
+            await interaction.response.defer()
+            total = 0
 
-        title = f"Total Bans in {interaction.guild}: {len(bans)}"
+            async for _ in interaction.guild.bans(limit=None):
+                total += 1
+
+        if not total:
+            embed = self._no_bans_embed(interaction)
+
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed)
+                return
+
+            await interaction.response.send_message(embed=embed, ephemeral=True, delete_after=30)
+            return
+
+        title = f"Total Bans in {interaction.guild}: {total}"
         data_description = "banned users"
         embed = await exports.get_help_embed(valid_flags, title, data_description)
 
-        return await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+            return
+
+        await interaction.response.send_message(embed=embed)
+
+    def _no_bans_embed(self, interaction: discord.Interaction) -> discord.Embed:
+        return EmbedCreator.create_embed(
+            bot=self.bot,
+            embed_type=EmbedCreator.INFO,
+            user_name=interaction.user.name,
+            user_display_avatar=interaction.user.display_avatar.url,
+            title=f"{interaction.guild} Banned Users",
+            description="There are no banned users in this server.",
+        )
 
     @export.command(name="members")
     @app_commands.guild_only()
@@ -86,24 +121,29 @@ class Export(commands.Cog):
 
         assert interaction.guild
 
-        members = list(interaction.guild.members)
         valid_flags = ["user", "display", "id", "mention", "created"]
 
         if flags and "--help" not in flags:
-            file = await exports.get_member_list_csv(
+            await interaction.response.defer()
+            await member_cache.ensure_members(self.bot, interaction.guild)
+
+            files, _ = await exports.get_member_list_csv(
                 interaction,
-                members,
+                interaction.guild.members,
                 valid_flags,
                 flags.split(sep=" ") if flags else [],
             )
 
-            return await interaction.response.send_message(file=file)
+            for file in files:
+                await interaction.followup.send(file=file)
+
+            return
 
-        title = f"Total Members in {interaction.guild}: {len(members)}"
+        title = f"Total Members in {interaction.guild}: {interaction.guild.member_count}"
         data_description = "members"
         embed = await exports.get_help_embed(valid_flags, title, data_description)
 
-        return await interaction.response.send_message(embed=embed)
+        await interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: Tux) -> None:
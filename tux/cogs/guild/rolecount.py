@@ -1,10 +1,18 @@
+import datetime
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 from reactionmenu import ViewButton, ViewMenu
 
 from tux.bot import Tux
+from tux.database.controllers import DatabaseController
 from tux.ui.embeds import EmbedCreator
+from tux.utils.member_cache import MemberNeeds, member_cache
+from tux.utils.role_stats import role_stats
+
+# Days of role history shown at most, which keeps the history in one embed
+MAX_HISTORY_DAYS = 90
 
 des_ids = [
     [1175177565086953523, "_kde"],
@@ -147,6 +155,8 @@ misc_ids = [
 
 
 class RoleCount(commands.Cog):
+    member_needs = MemberNeeds.MEMBER_LIST
+
     def __init__(self, bot: Tux):
         self.bot = bot
         self.roles_emoji_mapping = {
@@ -156,6 +166,24 @@ class RoleCount(commands.Cog):
             "misc": misc_ids,
             "vanity": vanity_ids,
         }
+        self.db = DatabaseController().role_snapshot
+        # Emoji name -> emoji, built on first use and reset when emojis change
+        self.emoji_map: dict[str, discord.Emoji] | None = None
+
+    @commands.Cog.listener()
+    async def on_guild_emojis_update(
+        self,
+        guild: discord.Guild,
+        before: list[discord.Emoji],
+        after: list[discord.Emoji],
+    ) -> None:
+        self.emoji_map = None
+
+    def _get_emoji(self, name: str) -> discord.Emoji | None:
+        if self.emoji_map is None:
+            self.emoji_map = {emoji.name: emoji for emoji in self.bot.emojis}
+
+        return self.emoji_map.get(name)
 
     @app_commands.command(name="rolecount")
     @app_commands.describe(which="Which option to list!")
@@ -190,6 +218,63 @@ class RoleCount(commands.Cog):
             # Process the roles and emojis for the selected option
             await self._process_roles(interaction, roles_emojis, which)
 
+    @app_commands.command(name="rolehistory")
+    @app_commands.describe(role="The role to show the history of.", days="How many days back to show.")
+    @app_commands.guild_only()
+    async def rolehistory(
+        self,
+        interaction: discord.Interaction,
+        role: discord.Role,
+        days: app_commands.Range[int, 1, MAX_HISTORY_DAYS] = 30,
+    ) -> None:
+        """
+        Show the daily number of users in a role.
+
+        Parameters
+        ----------
+        interaction : discord.Interaction
+            The interaction object.
+        role : discord.Role
+            The role to show the history of.
+        days : int
+            How many days back to show.
+        """
+
+        assert interaction.guild
+
+        today = datetime.datetime.now(datetime.UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        snapshots = await self.db.get_role_history(
+            interaction.guild.id,
+            role.id,
+            today - datetime.timedelta(days=days),
+        )
+
+        if snapshots:
+            lines: list[str] = []
+            previous: int | None = None
+
+            for snapshot in snapshots:
+                line = f"`{snapshot.snapshot_date:%Y-%m-%d}` {snapshot.member_count} users"
+                if previous is not None:
+                    line += f" ({snapshot.member_count - previous:+})"
+                lines.append(line)
+                previous = snapshot.member_count
+
+            description = "\n".join(lines)
+        else:
+            description = "No daily counts of this role have been stored yet."
+
+        embed = EmbedCreator.create_embed(
+            bot=self.bot,
+            embed_type=EmbedCreator.INFO,
+            user_name=interaction.user.name,
+            user_display_avatar=interaction.user.display_avatar.url,
+            title=f"{role.name} History",
+            description=description,
+        )
+
+        await interaction.response.send_message(embed=embed)
+
     async def _process_roles(
         self,
         interaction: discord.Interaction,
@@ -209,16 +294,28 @@ class RoleCount(commands.Cog):
             The selected option.
         """
 
+        assert interaction.guild
+
+        # Chunking a large guild can take longer than an interaction may go unanswered
+        if not member_cache.is_chunked(interaction.guild):
+            await interaction.response.defer()
+            await member_cache.ensure_members(self.bot, interaction.guild)
+
+        counts = role_stats.get(interaction.guild)
         role_data: list[tuple[discord.Role, list[int | str]]] = []
 
         for role_emoji in roles_emojis:
             role_id = int(role_emoji[0])
 
-            if interaction.guild and (role := interaction.guild.get_role(role_id)):
+            if role := interaction.guild.get_role(role_id):
                 role_data.append((role, role_emoji))
 
         # Sort roles by the number of members in descending order
-        sorted_roles = sorted(role_data, key=lambda x: len(x[0].members), reverse=True)
+        sorted_roles = sorted(role_data, key=lambda x: counts[x[0].id], reverse=True)
+
+        # Member counts from a week ago, to show the trend of each role
+        today = datetime.datetime.now(datetime.UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+        previous_counts = await self.db.get_snapshots_on(interaction.guild.id, today - datetime.timedelta(days=7))
 
         pages: list[discord.Embed] = []
 
@@ -235,6 +332,7 @@ class RoleCount(commands.Cog):
                 (str(role_emoji[0]), str(role_emoji[1])),
                 which,
                 pages,
+                (counts[role.id], previous_counts.get(role.id)),
             )
 
         if embed.fields:
@@ -251,6 +349,7 @@ class RoleCount(commands.Cog):
         role_emoji: tuple[str, str],
         which: discord.app_commands.Choice[str],
         pages: list[discord.Embed],
+        member_counts: tuple[int, int | None],
     ) -> tuple[int, discord.Embed]:
         """
         Format the embed with the role data.
@@ -271,6 +370,8 @@ class RoleCount(commands.Cog):
             The selected option.
         pages : list[discord.Embed]
             The list of embeds to send.
+        member_counts : tuple[int, int | None]
+            The current member count of the role and its count a week ago, if known.
 
         Returns
         -------
@@ -283,11 +384,16 @@ class RoleCount(commands.Cog):
             embed = self._create_embed(interaction, which)
             role_count = 0
 
-        emoji = discord.utils.get(self.bot.emojis, name=role_emoji[1]) or f":{role_emoji[1]}:" or "❔"
+        emoji = self._get_emoji(role_emoji[1]) or f":{role_emoji[1]}:" or "❔"
+
+        current_count, previous_count = member_counts
+        value = f"{current_count} users"
+        if previous_count is not None:
+            value += f" ({current_count - previous_count:+} this week)"
 
         embed.add_field(
             name=f"{emoji!s} {role.name}",
-            value=f"{len(role.members)} users",
+            value=value,
             inline=True,
         )
 
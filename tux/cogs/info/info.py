@@ -7,9 +7,13 @@ from reactionmenu import ViewButton, ViewMenu
 from tux.bot import Tux
 from tux.ui.embeds import EmbedCreator, EmbedType
 from tux.utils.flags import generate_usage
+from tux.utils.guild_stats import guild_stats
+from tux.utils.member_cache import MemberNeeds, member_cache
 
 
 class Info(commands.Cog):
+    member_needs = MemberNeeds.MEMBER_LIST
+
     def __init__(self, bot: Tux) -> None:
         self.bot = bot
         self.info.usage = generate_usage(self.info)
@@ -57,6 +61,12 @@ class Info(commands.Cog):
         assert guild
         assert guild.icon
 
+        if not member_cache.is_chunked(guild):
+            await ctx.defer()
+            await member_cache.ensure_members(self.bot, guild)
+
+        stats = guild_stats.get(guild)
+
         embed: discord.Embed = (
             EmbedCreator.create_embed(
                 embed_type=EmbedType.INFO,
@@ -69,16 +79,16 @@ class Info(commands.Cog):
             )
             .add_field(name="Owner", value=str(guild.owner.mention) if guild.owner else "Unknown")
             .add_field(name="Vanity URL", value=guild.vanity_url_code or "None")
-            .add_field(name="Boosts", value=guild.premium_subscription_count)
+            .add_field(name="Boosts", value=stats.boosts)
             .add_field(name="Text Channels", value=len(guild.text_channels))
             .add_field(name="Voice Channels", value=len(guild.voice_channels))
             .add_field(name="Forum Channels", value=len(guild.forums))
             .add_field(name="Emojis", value=f"{len(guild.emojis)}/{2 * guild.emoji_limit}")
             .add_field(name="Stickers", value=f"{len(guild.stickers)}/{guild.sticker_limit}")
-            .add_field(name="Roles", value=len(guild.roles))
-            .add_field(name="Humans", value=sum(not member.bot for member in guild.members))
-            .add_field(name="Bots", value=sum(member.bot for member in guild.members))
-            .add_field(name="Bans", value=len([entry async for entry in guild.bans(limit=2000)]))
+            .add_field(name="Roles", value=stats.roles)
+            .add_field(name="Humans", value=stats.humans)
+            .add_field(name="Bots", value=stats.bots)
+            .add_field(name="Bans", value=stats.bans if stats.bans is not None else "Unknown")
         )
 
         await ctx.send(embed=embed)
@@ -4,9 +4,13 @@ from discord.ext import commands
 
 from tux.bot import Tux
 from tux.ui.embeds import EmbedCreator
+from tux.utils.guild_stats import guild_stats
+from tux.utils.member_cache import MemberNeeds, member_cache
 
 
 class MemberCount(commands.Cog):
+    member_needs = MemberNeeds.MEMBER_LIST
+
     def __init__(self, bot: Tux) -> None:
         self.bot = bot
 
@@ -23,12 +27,19 @@ class MemberCount(commands.Cog):
 
         assert interaction.guild
 
+        # Chunking a large guild can take longer than an interaction may go unanswered
+        if not member_cache.is_chunked(interaction.guild):
+            await interaction.response.defer()
+            await member_cache.ensure_members(self.bot, interaction.guild)
+
+        stats = guild_stats.get(interaction.guild)
+
         # Get the member count for the server (total members)
-        members = interaction.guild.member_count
-        # Get the number of humans in the server (subtract bots from total members)
-        humans = sum(not member.bot for member in interaction.guild.members)
-        # Get the number of bots in the server (subtract humans from total members)
-        bots = sum(member.bot for member in interaction.guild.members if member.bot)
+        members = stats.members
+        # Get the number of humans in the server
+        humans = stats.humans
+        # Get the number of bots in the server
+        bots = stats.bots
         # Get the number of staff members in the server
         staff_role = discord.utils.get(interaction.guild.roles, name="%wheel")
         staff = len(staff_role.members) if staff_role else 0
@@ -48,7 +59,10 @@ class MemberCount(commands.Cog):
         if staff > 0:
             embed.add_field(name="Staff", value=str(staff), inline=True)
 
-        await interaction.response.send_message(embed=embed)
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.response.send_message(embed=embed)
 
 
 async def setup(bot: Tux) -> None:
@@ -1,11 +1,19 @@
+from io import BytesIO
+
 import discord
 from discord.ext import commands
+from loguru import logger
 
 from tux.bot import Tux
 from tux.cogs.services.levels import LevelsService
 from tux.ui.embeds import EmbedCreator, EmbedType
+from tux.ui.rank_card import RankCard, rank_card_renderer
 from tux.utils.config import CONFIG
 from tux.utils.flags import generate_usage
+from tux.utils.rank_index import rank_index
+
+# Members shown per leaderboard page
+LEADERBOARD_PAGE_SIZE = 10
 
 
 class Level(commands.Cog):
@@ -13,6 +21,10 @@ class Level(commands.Cog):
         self.bot = bot
         self.levels_service = LevelsService(bot)
         self.level.usage = generate_usage(self.level)
+        self.leaderboard.usage = generate_usage(self.leaderboard)
+
+    async def cog_unload(self) -> None:
+        rank_card_renderer.shutdown()
 
     @commands.guild_only()
     @commands.hybrid_command(
@@ -40,10 +52,14 @@ class Level(commands.Cog):
             member = ctx.author if isinstance(ctx.author, discord.Member) else None
             assert member
 
-        xp = await self.levels_service.levels_controller.get_xp(member.id, ctx.guild.id)
-        level = await self.levels_service.levels_controller.get_level(member.id, ctx.guild.id)
+        xp, level = await self.levels_service.levels_controller.get_xp_and_level(member.id, ctx.guild.id)
+        ranking = await rank_index.get(ctx.guild.id, self.levels_service.levels_controller.get_guild_rankings)
+        rank = ranking.rank(member.id)
+        rank_display = f"Rank #{rank} of {len(ranking)}" if rank else "Unranked"
 
-        if self.levels_service.enable_xp_cap and level >= self.levels_service.max_level:
+        capped = self.levels_service.enable_xp_cap and level >= self.levels_service.max_level
+
+        if capped:
             max_xp = self.levels_service.calculate_xp_for_level(self.levels_service.max_level)
             level_display = self.levels_service.max_level
             xp_display = f"{round(max_xp)} (limit reached)"
@@ -51,6 +67,36 @@ class Level(commands.Cog):
             level_display = level
             xp_display = f"{round(xp)}"
 
+        if CONFIG.RANK_CARDS:
+            xp_progress, xp_required = self.levels_service.get_level_progress(xp, level)
+
+            # A capped member's bar stays full
+            if capped:
+                xp_progress = xp_required
+
+            card = RankCard(
+                name=member.display_name,
+                avatar_key=member.display_avatar.key,
+                level=level_display,
+                xp=round(xp),
+                progress=xp_progress,
+                required=xp_required,
+                color=str(discord.Color.blurple()),
+            )
+
+            # The first render starts the worker processes, which can take longer than an interaction allows
+            await ctx.defer()
+
+            try:
+                image = await rank_card_renderer.render(member, card)
+
+            except Exception as e:
+                logger.error(f"Failed to render the rank card of {member}, sending an embed instead: {e}")
+
+            else:
+                await ctx.send(rank_display, file=discord.File(BytesIO(image), filename="rank.png"))
+                return
+
         if CONFIG.SHOW_XP_PROGRESS:
             xp_progress, xp_required = self.levels_service.get_level_progress(xp, level)
             progress_bar = self.levels_service.generate_progress_bar(xp_progress, xp_required)
@@ -62,12 +108,12 @@ class Level(commands.Cog):
                 custom_color=discord.Color.blurple(),
                 custom_author_text=f"{member.name}",
                 custom_author_icon_url=member.display_avatar.url,
-                custom_footer_text=f"Total XP: {xp_display}",
+                custom_footer_text=f"Total XP: {xp_display} • {rank_display}",
             )
         else:
             embed: discord.Embed = EmbedCreator.create_embed(
                 embed_type=EmbedType.DEFAULT,
-                description=f"**Level {level_display}** - `XP: {xp_display}`",
+                description=f"**Level {level_display}** - `XP: {xp_display}` - {rank_display}",
                 custom_color=discord.Color.blurple(),
                 custom_author_text=f"{member.name}",
                 custom_author_icon_url=member.display_avatar.url,
@@ -75,6 +121,51 @@ class Level(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @commands.guild_only()
+    @commands.hybrid_command(
+        name="leaderboard",
+        aliases=["lb"],
+    )
+    async def leaderboard(self, ctx: commands.Context[Tux], page: int = 1) -> None:
+        """
+        Shows the members with the most XP.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+
+        page : int
+            The page of the leaderboard to show.
+        """
+
+        assert ctx.guild
+
+        ranking = await rank_index.get(ctx.guild.id, self.levels_service.levels_controller.get_guild_rankings)
+        pages = max(1, -(-len(ranking) // LEADERBOARD_PAGE_SIZE))
+        page = min(max(page, 1), pages)
+        offset = (page - 1) * LEADERBOARD_PAGE_SIZE
+
+        lines: list[str] = []
+
+        for rank, (member_id, xp) in enumerate(ranking.page(offset, LEADERBOARD_PAGE_SIZE), start=offset + 1):
+            level = self.levels_service.calculate_level(xp)
+
+            if self.levels_service.enable_xp_cap:
+                level = min(level, self.levels_service.max_level)
+
+            lines.append(f"**#{rank}** <@{member_id}> - Level {level} (`{round(xp)} XP`)")
+
+        embed: discord.Embed = EmbedCreator.create_embed(
+            embed_type=EmbedType.DEFAULT,
+            title=f"{ctx.guild.name} Leaderboard",
+            description="\n".join(lines) or "Nobody has earned XP yet.",
+            custom_color=discord.Color.blurple(),
+            custom_footer_text=f"Page {page} of {pages}",
+        )
+
+        await ctx.send(embed=embed)
+
 
 async def setup(bot: Tux) -> None:
     await bot.add_cog(Level(bot))
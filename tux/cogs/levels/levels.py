@@ -1,13 +1,22 @@
+import asyncio
 import datetime
+import gzip
+import io
+from typing import Literal
 
 import discord
 from discord.ext import commands
 
 from tux.bot import Tux
 from tux.cogs.services.levels import LevelsService
+from tux.cogs.services.xp_role_sync import XpRoleSync
 from tux.ui.embeds import EmbedCreator, EmbedType
 from tux.utils import checks
 from tux.utils.flags import generate_usage
+from tux.utils.xp_transfer import get_format, parse_levels_file, serialize_levels
+
+# Skipped rows listed in the import report
+SKIPPED_ROWS_SHOWN = 10
 
 
 class Levels(commands.Cog):
@@ -19,6 +28,10 @@ class Levels(commands.Cog):
         self.reset.usage = generate_usage(self.reset)
         self.blacklist.usage = generate_usage(self.blacklist)
         self.set_xp.usage = generate_usage(self.set_xp)
+        self.sync_roles.usage = generate_usage(self.sync_roles)
+        self.recompute.usage = generate_usage(self.recompute)
+        self.export_xp.usage = generate_usage(self.export_xp)
+        self.import_xp.usage = generate_usage(self.import_xp)
 
     @commands.hybrid_group(
         name="levels",
@@ -185,6 +198,168 @@ class Levels(commands.Cog):
 
         await ctx.send(embed=embed)
 
+    @checks.has_pl(2)
+    @commands.guild_only()
+    @levels.command(name="syncroles", aliases=["sr"])
+    async def sync_roles(self, ctx: commands.Context[Tux]) -> None:
+        """
+        Gives every member the XP role of their level and removes their other XP roles.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+        """
+
+        assert ctx.guild
+
+        sync = self.bot.get_cog("XpRoleSync")
+        assert isinstance(sync, XpRoleSync)
+
+        if sync.enqueue(ctx.guild.id, restart=True):
+            description = "XP roles will be synced for every member. Only members whose roles are wrong are updated."
+        else:
+            description = "An XP role sync is already queued for this server."
+
+        embed: discord.Embed = EmbedCreator.create_embed(
+            embed_type=EmbedType.INFO,
+            title="XP Role Sync",
+            description=description,
+            custom_color=discord.Color.blurple(),
+        )
+
+        await ctx.send(embed=embed)
+
+    @checks.has_pl(5)
+    @commands.guild_only()
+    @levels.command(name="recompute")
+    async def recompute(self, ctx: commands.Context[Tux]) -> None:
+        """
+        Recomputes every member's stored level from their XP, e.g. after the level formula changed.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+        """
+
+        assert ctx.guild
+
+        await ctx.defer()
+        checked, changed = await self.levels_service.recompute_levels(ctx.guild.id)
+
+        embed: discord.Embed = EmbedCreator.create_embed(
+            embed_type=EmbedType.INFO,
+            title="Levels Recomputed",
+            description=f"Checked **{checked}** members, **{changed}** had an outdated level.",
+            custom_color=discord.Color.blurple(),
+        )
+
+        await ctx.send(embed=embed)
+
+    @checks.has_pl(5)
+    @commands.guild_only()
+    @levels.command(name="export")
+    async def export_xp(self, ctx: commands.Context[Tux], file_format: Literal["csv", "jsonl"] = "csv") -> None:
+        """
+        Exports the XP of every member as a CSV or JSONL file.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+
+        file_format : Literal["csv", "jsonl"]
+            The format of the file.
+        """
+
+        assert ctx.guild
+
+        await ctx.defer()
+
+        records = await self.levels_service.levels_controller.get_guild_levels(ctx.guild.id)
+        data = await asyncio.to_thread(serialize_levels, records, file_format)
+        timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d_%H%M%S")
+        filename = f"{ctx.guild.id}_levels_{timestamp}.{file_format}"
+
+        if len(data) > ctx.guild.filesize_limit:
+            data = await asyncio.to_thread(gzip.compress, data)
+            filename = f"{filename}.gz"
+
+        if len(data) > ctx.guild.filesize_limit:
+            embed: discord.Embed = EmbedCreator.create_embed(
+                embed_type=EmbedType.ERROR,
+                title="XP Export",
+                description="The export is larger than this server's upload limit, even compressed.",
+            )
+            await ctx.send(embed=embed)
+            return
+
+        await ctx.send(
+            content=f"Exported the XP of {len(records)} members.", file=discord.File(io.BytesIO(data), filename)
+        )
+
+    @checks.has_pl(5)
+    @commands.guild_only()
+    @levels.command(name="import")
+    async def import_xp(self, ctx: commands.Context[Tux], file: discord.Attachment) -> None:
+        """
+        Imports XP from a CSV or JSONL file, overwriting the XP of the members in it.
+
+        The file needs `member_id` and `xp` columns, and may have `blacklisted` and `last_message` columns.
+        Levels are computed from XP. Files exported with `levels export` can be imported as they are.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+
+        file : discord.Attachment
+            The CSV or JSONL file, optionally gzip-compressed.
+        """
+
+        assert ctx.guild
+
+        await ctx.defer()
+
+        try:
+            get_format(file.filename)
+            imported = await asyncio.to_thread(parse_levels_file, await file.read(), file.filename)
+
+        except (ValueError, UnicodeDecodeError, OSError) as e:
+            embed: discord.Embed = EmbedCreator.create_embed(
+                embed_type=EmbedType.ERROR,
+                title="XP Import",
+                description=f"Could not read the file: {e}",
+            )
+            await ctx.send(embed=embed)
+            return
+
+        count = await self.levels_service.import_levels(ctx.guild.id, imported) if imported.rows else 0
+
+        # Imported levels may call for different XP roles
+        if count and isinstance(sync := self.bot.get_cog("XpRoleSync"), XpRoleSync):
+            sync.enqueue(ctx.guild.id, restart=True)
+
+        description = f"Imported the XP of **{count}** members, skipped **{len(imported.skipped)}** rows."
+
+        if imported.skipped:
+            lines = [f"Line {line}: {reason}" for line, reason in imported.skipped[:SKIPPED_ROWS_SHOWN]]
+
+            if (more := len(imported.skipped) - SKIPPED_ROWS_SHOWN) > 0:
+                lines.append(f"... and {more} more")
+
+            description += "\n```" + "\n".join(lines) + "```"
+
+        embed: discord.Embed = EmbedCreator.create_embed(
+            embed_type=EmbedType.INFO,
+            title="XP Import",
+            description=description,
+            custom_color=discord.Color.blurple(),
+        )
+
+        await ctx.send(embed=embed)
+
 
 async def setup(bot: Tux) -> None:
     await bot.add_cog(Levels(bot))
@@ -10,6 +10,7 @@ from tux.bot import Tux
 from tux.database.controllers import DatabaseController
 from tux.ui.embeds import EmbedCreator, EmbedType
 from tux.utils.constants import CONST
+from tux.utils.log_dispatcher import log_dispatcher
 
 
 class ModerationCogBase(commands.Cog):
@@ -80,7 +81,7 @@ class ModerationCogBase(commands.Cog):
         log_type: str,
     ) -> None:
         """
-        Send an embed to the log channel.
+        Queue an embed for the log channel; queued embeds are sent together, up to 10 per message.
 
         Parameters
         ----------
@@ -98,7 +99,8 @@ class ModerationCogBase(commands.Cog):
         if log_channel_id:
             log_channel = ctx.guild.get_channel(log_channel_id)
             if isinstance(log_channel, discord.TextChannel):
-                await log_channel.send(embed=embed)
+                # Queued rather than sent, so a burst of actions is coalesced into few log messages
+                log_dispatcher.send(log_channel, embed)
 
     async def send_dm(
         self,
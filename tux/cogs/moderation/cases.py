@@ -1,18 +1,25 @@
 import discord
 from discord.ext import commands
+from loguru import logger
 from reactionmenu import ViewButton, ViewMenu
 
 from prisma.enums import CaseType
 from prisma.models import Case
 from prisma.types import CaseWhereInput
 from tux.bot import Tux
+from tux.database.controllers.case_search import CaseSearchResult
 from tux.ui.embeds import EmbedCreator, EmbedType
 from tux.utils import checks
 from tux.utils.constants import CONST
-from tux.utils.flags import CaseModifyFlags, CasesViewFlags, generate_usage
+from tux.utils.flags import CaseModifyFlags, CasesSearchFlags, CasesViewFlags, generate_usage
 
 from . import ModerationCogBase
 
+# Results per page of a case search
+SEARCH_PAGE_SIZE = 10
+# Characters of a reason or note shown in search results
+SEARCH_PREVIEW_LENGTH = 80
+
 emojis: dict[str, int] = {
     "active_case_emoji": 1268115730344443966,
     "inactive_case_emoji": 1268115712627441715,
@@ -34,6 +41,17 @@ class Cases(ModerationCogBase):
         self.cases.usage = generate_usage(self.cases)
         self.cases_view.usage = generate_usage(self.cases_view, CasesViewFlags)
         self.cases_modify.usage = generate_usage(self.cases_modify, CaseModifyFlags)
+        self.cases_search.usage = generate_usage(self.cases_search, CasesSearchFlags)
+
+    async def cog_load(self) -> None:
+        try:
+            if not await self.db.case_search.search_columns_ready():
+                logger.warning(
+                    "Case search columns are not set up, run `python -m tux.database.search_setup` to set them up.",
+                )
+
+        except Exception as e:
+            logger.error(f"Failed to check the case search columns: {e}")
 
     @commands.hybrid_group(
         name="cases",
@@ -126,6 +144,77 @@ class Cases(ModerationCogBase):
         if case.case_number is not None:
             await self._update_case(ctx, case, flags)
 
+    @cases.command(
+        name="search",
+        aliases=["s", "find"],
+    )
+    @commands.guild_only()
+    @checks.has_pl(2)
+    async def cases_search(
+        self,
+        ctx: commands.Context[Tux],
+        *,
+        flags: CasesSearchFlags,
+    ) -> None:
+        """
+        Search the reasons of moderation cases and the content of notes in the server.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context in which the command is being invoked.
+        flags : CasesSearchFlags
+            The flags for the command. (query, page)
+        """
+
+        assert ctx.guild
+
+        page = max(flags.page, 1)
+        results, total, capped = await self.db.case_search.search(
+            ctx.guild.id,
+            flags.query,
+            SEARCH_PAGE_SIZE,
+            (page - 1) * SEARCH_PAGE_SIZE,
+        )
+
+        if not results:
+            message = "No cases or notes found." if page == 1 else f"There is no page {page} of results."
+            await ctx.send(message, ephemeral=True)
+            return
+
+        pages = -(-total // SEARCH_PAGE_SIZE)
+
+        embed = EmbedCreator.create_embed(
+            bot=self.bot,
+            embed_type=EmbedType.CASE,
+            title=f"Search Results ({total}{'+' if capped else ''})",
+            description="\n".join(self._format_search_result(result) for result in results),
+            custom_footer_text=f"Page {page} of {pages}"
+            + (" • Only the most recent matches are ranked, refine the query to see older ones" if capped else ""),
+        )
+
+        await ctx.send(embed=embed, ephemeral=True)
+
+    def _format_search_result(self, result: CaseSearchResult) -> str:
+        content = discord.utils.escape_markdown(result.content.replace("\n", " "))
+
+        if len(content) > SEARCH_PREVIEW_LENGTH:
+            content = f"{content[: SEARCH_PREVIEW_LENGTH - 1]}…"
+
+        date = discord.utils.format_dt(result.created_at, "R") if result.created_at else ":interrobang:"
+        number = f"{result.number:04d}" if result.number is not None else "0000"
+
+        if result.kind == "note":
+            return f"Note `{number}`\u2002<@{result.user_id}>\u2002__{date}__\n> {content}"
+
+        case_type = CaseType(result.case_type) if result.case_type else None
+        case_type_emoji = self._format_emoji(self._get_case_type_emoji(case_type)) if case_type else ""
+
+        return (
+            f"Case `{number}`\u2002{case_type_emoji or result.case_type}\u2002<@{result.user_id}>"
+            f"\u2002__{date}__\n> {content}"
+        )
+
     async def _view_single_case(
         self,
         ctx: commands.Context[Tux],
@@ -1,3 +1,8 @@
+import contextlib
+import datetime
+import re
+from collections.abc import Awaitable, Callable
+
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -5,13 +10,87 @@ from loguru import logger
 
 from tux.bot import Tux
 from tux.utils import checks
-from tux.utils.flags import generate_usage
+from tux.utils.flags import PurgeFlags, generate_usage
+from tux.utils.functions import parse_time_string
+from tux.utils.purge import PurgeFilter, PurgeJob, PurgeProgress
+
+MAX_PURGE = 50_000
+
+
+def parse_bound(value: str | None) -> discord.Object | datetime.datetime | None:
+    """
+    Parse a before or after bound: a message ID, or a time ago such as 1d.
+
+    Raises
+    ------
+    ValueError
+        If the value is neither.
+    """
+
+    if value is None:
+        return None
+
+    if value.isdigit():
+        return discord.Object(id=int(value))
+
+    return datetime.datetime.now(datetime.UTC) - parse_time_string(value)
+
+
+def format_progress(progress: PurgeProgress, channel: discord.TextChannel | discord.Thread, limit: int) -> str:
+    if progress.done:
+        text = f"Purged {progress.deleted} messages from {channel.mention} after scanning {progress.scanned}."
+    else:
+        text = f"Purging {channel.mention}: deleted {progress.deleted} of up to {limit}, scanned {progress.scanned}."
+
+    if progress.queued:
+        text += f" {progress.queued} messages older than 14 days are being deleted one at a time."
+
+    if progress.failed:
+        text += f" {progress.failed} could not be deleted."
+
+    return text
 
 
 class Purge(commands.Cog):
     def __init__(self, bot: Tux) -> None:
         self.bot = bot
-        self.prefix_purge.usage = generate_usage(self.prefix_purge)
+        self.prefix_purge.usage = generate_usage(self.prefix_purge, PurgeFlags)
+
+    async def run_purge(
+        self,
+        channel: discord.TextChannel | discord.Thread,
+        limit: int,
+        message_filter: PurgeFilter,
+        before: discord.abc.Snowflake | datetime.datetime | None,
+        after: discord.abc.Snowflake | datetime.datetime | None,
+        update: Callable[[str], Awaitable[object]],
+        moderator: discord.abc.User,
+    ) -> None:
+        """
+        Purge a channel, reporting the progress live through `update`.
+        """
+
+        async def on_progress(progress: PurgeProgress) -> None:
+            # A long purge can outlive the interaction token or the status message; the purge goes on regardless
+            with contextlib.suppress(discord.HTTPException):
+                await update(format_progress(progress, channel, limit))
+
+        job = PurgeJob(
+            channel,
+            limit,
+            message_filter,
+            before=before,
+            after=after,
+            on_progress=on_progress,
+            reason=f"Purge by {moderator}",
+        )
+
+        try:
+            await job.run()
+
+        except discord.HTTPException as error:
+            logger.error(f"An error occurred while purging messages: {error}")
+            await update(f"An error occurred while purging messages: {error}")
 
     @app_commands.command(name="purge")
     @app_commands.guild_only()
@@ -21,9 +100,17 @@ class Purge(commands.Cog):
         interaction: discord.Interaction,
         limit: int,
         channel: discord.TextChannel | discord.Thread | None = None,
+        user: discord.User | None = None,
+        bots: bool = False,
+        regex: str | None = None,
+        attachments: bool = False,
+        links: bool = False,
+        invites: bool = False,
+        before: str | None = None,
+        after: str | None = None,
     ) -> None:
         """
-        Deletes a set number of messages in a channel.
+        Deletes messages in a channel, optionally only those matching every given filter.
 
         Parameters
         ----------
@@ -33,44 +120,69 @@ class Purge(commands.Cog):
             The number of messages to delete.
         channel : discord.TextChannel | discord.Thread | None
             The channel to delete messages from.
-
-        Raises
-        ------
-        discord.Forbidden
-            If the bot is unable to delete messages.
-        discord.HTTPException
-            If an error occurs while deleting messages.
+        user : discord.User | None
+            Only delete messages from this user.
+        bots : bool
+            Only delete messages from bots.
+        regex : str | None
+            Only delete messages matching this regular expression.
+        attachments : bool
+            Only delete messages with attachments.
+        links : bool
+            Only delete messages with links.
+        invites : bool
+            Only delete messages with Discord invites.
+        before : str | None
+            Only delete messages before this message ID, or older than this. (e.g. 1d, 2h)
+        after : str | None
+            Only delete messages after this message ID, or newer than this. (e.g. 1d, 2h)
         """
 
         assert interaction.guild
 
+        await interaction.response.defer(ephemeral=True)
+
         # Check if the limit is within the valid range
-        if limit < 1 or limit > 500:
-            await interaction.response.defer(ephemeral=True)
-            return await interaction.followup.send(
-                "Invalid amount, maximum 500, minimum 1.",
-                ephemeral=True,
-            )
+        if limit < 1 or limit > MAX_PURGE:
+            await interaction.followup.send(f"Invalid amount, maximum {MAX_PURGE}, minimum 1.", ephemeral=True)
+            return
 
         # If the channel is not specified, default to the current channel
         if channel is None:
             # Check if the current channel is a text channel
             if not isinstance(interaction.channel, discord.TextChannel | discord.Thread):
-                await interaction.response.defer(ephemeral=True)
-                return await interaction.followup.send(
-                    "Invalid channel type, must be a text channel.",
-                    ephemeral=True,
-                )
+                await interaction.followup.send("Invalid channel type, must be a text channel.", ephemeral=True)
+                return
+
             channel = interaction.channel
 
-        # Purge the specified number of messages
         try:
-            await interaction.response.defer(ephemeral=True)
-            await interaction.edit_original_response(content="Purging messages...")
-            await channel.purge(limit=limit)
-            await interaction.edit_original_response(content=f"Purged {limit} messages in {channel.mention}.")
-        except Exception as error:
-            await interaction.edit_original_response(content=f"An error occurred while purging messages: {error}")
+            message_filter = PurgeFilter(
+                author_id=user.id if user else None,
+                bots=bots,
+                pattern=re.compile(regex) if regex else None,
+                attachments=attachments,
+                links=links,
+                invites=invites,
+            )
+            before_bound = parse_bound(before)
+            after_bound = parse_bound(after)
+
+        except (re.error, ValueError) as error:
+            await interaction.followup.send(f"Invalid filter: {error}", ephemeral=True)
+            return
+
+        await interaction.edit_original_response(content="Purging messages...")
+
+        await self.run_purge(
+            channel,
+            limit,
+            message_filter,
+            before_bound,
+            after_bound,
+            lambda content: interaction.edit_original_response(content=content),
+            interaction.user,
+        )
 
     @commands.command(
         name="purge",
@@ -83,9 +195,11 @@ class Purge(commands.Cog):
         ctx: commands.Context[Tux],
         limit: int,
         channel: discord.TextChannel | discord.Thread | None = None,
+        *,
+        flags: PurgeFlags,
     ) -> None:
         """
-        Deletes a set number of messages in a channel.
+        Deletes messages in a channel, optionally only those matching every given filter.
 
         Parameters
         ----------
@@ -95,23 +209,18 @@ class Purge(commands.Cog):
             The number of messages to delete.
         channel : discord.TextChannel | discord.Thread | None
             The channel to delete messages from.
-
-        Raises
-        ------
-        discord.Forbidden
-            If the bot is unable to delete messages.
-        discord.HTTPException
-            If an error occurs while deleting messages.
+        flags : PurgeFlags
+            The filters for the messages to delete.
         """
 
         assert ctx.guild
 
         # Check if the limit is within the valid range
-        if limit < 1 or limit > 500:
-            await ctx.send("Invalid amount, maximum 500, minimum 1.", ephemeral=True)
+        if limit < 1 or limit > MAX_PURGE:
+            await ctx.send(f"Invalid amount, maximum {MAX_PURGE}, minimum 1.", ephemeral=True)
             return
 
-        # If the channel is not specified, default to the current channe
+        # If the channel is not specified, default to the current channel
         if channel is None:
             # Check if the current channel is a text channel
             if not isinstance(ctx.channel, discord.TextChannel | discord.Thread):
@@ -120,17 +229,40 @@ class Purge(commands.Cog):
 
             channel = ctx.channel
 
-        # Purge the specified number of messages
         try:
-            await channel.purge(limit=limit + 1)
+            message_filter = PurgeFilter(
+                author_id=flags.user.id if flags.user else None,
+                bots=flags.bots,
+                pattern=re.compile(flags.regex) if flags.regex else None,
+                attachments=flags.attachments,
+                links=flags.links,
+                invites=flags.invites,
+            )
+            before = parse_bound(flags.before)
+            after = parse_bound(flags.after)
 
-        except Exception as error:
-            logger.error(f"An error occurred while purging messages: {error}")
-            await ctx.send(f"An error occurred while purging messages: {error}", ephemeral=True)
+        except (re.error, ValueError) as error:
+            await ctx.send(f"Invalid filter: {error}", ephemeral=True)
             return
 
-        # Send a confirmation message
-        await ctx.send(f"Purged {limit} messages from {channel.mention}.", ephemeral=True)
+        # The command message goes too, and the purge starts below it so the status message is never scanned
+        if channel == ctx.channel:
+            before = before or ctx.message
+
+            with contextlib.suppress(discord.HTTPException):
+                await ctx.message.delete()
+
+        status = await ctx.send("Purging messages...")
+
+        await self.run_purge(
+            channel,
+            limit,
+            message_filter,
+            before,
+            after,
+            lambda content: status.edit(content=content),
+            ctx.author,
+        )
 
 
 async def setup(bot: Tux) -> None:
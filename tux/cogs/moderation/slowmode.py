@@ -7,6 +7,9 @@ from loguru import logger
 from tux.bot import Tux
 from tux.utils import checks
 
+# Discord's longest slowmode, in seconds
+MAX_SLOWMODE = 21600
+
 
 class Slowmode(commands.Cog):
     def __init__(self, bot: Tux) -> None:
@@ -114,15 +117,15 @@ class Slowmode(commands.Cog):
             await ctx.send("Invalid delay value, must be an integer.", ephemeral=True)
             return
 
-        if not (0 <= delay_seconds <= 21600):
+        if not (0 <= delay_seconds <= MAX_SLOWMODE):
             await ctx.send(
-                "The slowmode delay must be between 0 and 21600 seconds.",
+                f"The slowmode delay must be between 0 and {MAX_SLOWMODE} seconds.",
                 ephemeral=True,
             )
             return
 
         try:
-            await channel.edit(slowmode_delay=delay_seconds)
+            await self.apply_slowmode(channel, delay_seconds)
 
             await ctx.send(
                 f"Slowmode set to {delay_seconds} seconds in {channel.mention}.",
@@ -133,6 +136,27 @@ class Slowmode(commands.Cog):
             await ctx.send(f"Failed to set slowmode. Error: {error}", ephemeral=True)
             logger.error(f"Failed to set slowmode. Error: {error}")
 
+    @staticmethod
+    async def apply_slowmode(
+        channel: discord.TextChannel | discord.Thread,
+        delay_seconds: int,
+        reason: str | None = None,
+    ) -> None:
+        """
+        Set the slowmode of a channel, clamped to Discord's limits.
+
+        Parameters
+        ----------
+        channel : discord.TextChannel | discord.Thread
+            The channel to set the slowmode of.
+        delay_seconds : int
+            The slowmode delay, in seconds.
+        reason : str | None
+            The reason for the audit log.
+        """
+
+        await channel.edit(slowmode_delay=min(max(delay_seconds, 0), MAX_SLOWMODE), reason=reason)
+
     @staticmethod
     def _parse_delay(delay: str) -> int | None:
         try:
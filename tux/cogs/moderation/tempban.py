@@ -82,7 +82,7 @@ class TempBan(ModerationCogBase):
 
     @tasks.loop(hours=1)
     async def tempban_check(self) -> None:
-        expired_temp_bans = await self.db.case.get_expired_tempbans()
+        expired_temp_bans = await self.db.case.get_expired_tempbans(self.bot.cluster_guild_ids())
 
         for temp_ban in expired_temp_bans:
             # Get the guild from the cache or fetch it from the API
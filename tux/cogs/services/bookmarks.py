@@ -39,10 +39,14 @@ class Bookmarks(commands.Cog):
         embed = self._create_bookmark_embed(message)
 
         # Get the user who reacted to the message
-        user = self.bot.get_user(payload.user_id)
+        user = payload.member or self.bot.get_user(payload.user_id)
         if user is None:
-            logger.error(f"User not found for ID: {payload.user_id}")
-            return
+            try:
+                user = await self.bot.fetch_user(payload.user_id)
+
+            except discord.HTTPException:
+                logger.error(f"User not found for ID: {payload.user_id}")
+                return
 
         # Send the bookmarked message to the user
         await self._send_bookmark(user, message, embed, payload.emoji)
@@ -73,7 +77,7 @@ class Bookmarks(commands.Cog):
 
     @staticmethod
     async def _send_bookmark(
-        user: discord.User,
+        user: discord.User | discord.Member,
         message: discord.Message,
         embed: discord.Embed,
         emoji: discord.PartialEmoji,
@@ -83,7 +87,7 @@ class Bookmarks(commands.Cog):
 
         Parameters
         ----------
-        user : discord.User
+        user : discord.User | discord.Member
             The user to send the bookmarked message to.
         message : discord.Message
             The message that was bookmarked.
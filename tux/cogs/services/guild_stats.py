@@ -0,0 +1,127 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+from loguru import logger
+
+from tux.bot import Tux
+from tux.utils.guild_stats import guild_stats
+from tux.utils.member_cache import member_cache
+
+
+class GuildStatsService(commands.Cog):
+    """
+    Keeps the per-guild statistics cache current from gateway events.
+    Member, role and channel counts are taken from the cache at ready; bans are counted once through the API.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.ban_count_tasks: dict[int, asyncio.Task[None]] = {}
+
+    async def cog_unload(self) -> None:
+        for task in self.ban_count_tasks.values():
+            task.cancel()
+
+    def _load_guild(self, guild: discord.Guild) -> None:
+        stats = guild_stats.compute(guild)
+
+        if stats.bans is None and guild.id not in self.ban_count_tasks:
+            self.ban_count_tasks[guild.id] = asyncio.create_task(self._count_bans(guild))
+
+    async def _count_bans(self, guild: discord.Guild) -> None:
+        """
+        Count the bans of a guild once, so later lookups need no API calls.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to count bans for.
+        """
+
+        try:
+            count = 0
+            async for _ in guild.bans(limit=None):
+                count += 1
+
+        except discord.Forbidden:
+            logger.warning(f"Missing permissions to count bans in guild {guild.name}.")
+
+        except discord.HTTPException as e:
+            logger.error(f"Failed to count bans in guild {guild.name}: {e}")
+
+        else:
+            if stats := guild_stats.peek(guild.id):
+                stats.bans = count
+            logger.debug(f"Counted {count} bans in guild {guild.name}.")
+
+        finally:
+            self.ban_count_tasks.pop(guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        for guild in self.bot.guilds:
+            self._load_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        self._load_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_members_cached(self, guild: discord.Guild) -> None:
+        self._load_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        guild_stats.remove(guild.id)
+        member_cache.remove(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        if stats := guild_stats.peek(after.id):
+            stats.boosts = after.premium_subscription_count or 0
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        if stats := guild_stats.peek(member.guild.id):
+            stats.add_member(member)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent) -> None:
+        # on_member_remove is only dispatched for cached members
+        if stats := guild_stats.peek(payload.guild_id):
+            stats.remove_member(payload.user)
+
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild: discord.Guild, user: discord.User | discord.Member) -> None:
+        if (stats := guild_stats.peek(guild.id)) and stats.bans is not None:
+            stats.bans += 1
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild: discord.Guild, user: discord.User) -> None:
+        if (stats := guild_stats.peek(guild.id)) and stats.bans is not None:
+            stats.bans = max(stats.bans - 1, 0)
+
+    @commands.Cog.listener()
+    async def on_guild_role_create(self, role: discord.Role) -> None:
+        if stats := guild_stats.peek(role.guild.id):
+            stats.roles += 1
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if stats := guild_stats.peek(role.guild.id):
+            stats.roles = max(stats.roles - 1, 0)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        if stats := guild_stats.peek(channel.guild.id):
+            stats.channels += 1
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if stats := guild_stats.peek(channel.guild.id):
+            stats.channels = max(stats.channels - 1, 0)
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(GuildStatsService(bot))
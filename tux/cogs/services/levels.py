@@ -1,4 +1,7 @@
+import bisect
 import datetime
+import hashlib
+import json
 import time
 
 import discord
@@ -10,6 +13,11 @@ from tux.database.controllers.levels import LevelsController
 from tux.main import get_prefix
 from tux.ui.embeds import EmbedCreator
 from tux.utils.config import CONFIG
+from tux.utils.rank_index import rank_index
+from tux.utils.xp_transfer import XpImport
+
+# Levels whose XP thresholds are precomputed; higher levels fall back to the formula
+LEVEL_TABLE_SIZE = 1000
 
 
 class LevelsService(commands.Cog):
@@ -19,9 +27,32 @@ class LevelsService(commands.Cog):
         self.xp_cooldown = CONFIG.XP_COOLDOWN
         self.levels_exponent = CONFIG.LEVELS_EXPONENT
         self.xp_roles = {role["level"]: role["role_id"] for role in CONFIG.XP_ROLES}
+        self.role_levels = sorted(self.xp_roles)
         self.xp_multipliers = {role["role_id"]: role["multiplier"] for role in CONFIG.XP_MULTIPLIERS}
         self.max_level = max(item["level"] for item in CONFIG.XP_ROLES)
         self.enable_xp_cap = CONFIG.ENABLE_XP_CAP
+        # The XP needed for each level, so finding a level is a binary search instead of a fractional power
+        self.level_thresholds = [self.xp_for_level_formula(level) for level in range(LEVEL_TABLE_SIZE + 1)]
+        # Changes whenever the settings deciding each member's XP role change, so members are synced again
+        self.roles_hash = hashlib.sha256(
+            json.dumps([sorted(self.xp_roles.items()), self.levels_exponent]).encode(),
+        ).hexdigest()
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """
+        Loads the XP ranking of every guild, so rank lookups never have to sort the levels table.
+        """
+        for guild in self.bot.guilds:
+            try:
+                await rank_index.get(guild.id, self.levels_controller.get_guild_rankings)
+
+            except Exception as e:
+                logger.error(f"Error loading the XP ranking for guild {guild.name}: {e}")
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        rank_index.remove(guild.id)
 
     @commands.Cog.listener("on_message")
     async def xp_listener(self, message: discord.Message) -> None:
@@ -40,11 +71,11 @@ class LevelsService(commands.Cog):
         if any(message.content.startswith(prefix) for prefix in prefixes):
             return
 
-        member = message.guild.get_member(message.author.id)
-        if member is None:
+        # Guild messages carry the author's member data, so this works whether or not the member is cached
+        if not isinstance(message.author, discord.Member):
             return
 
-        await self.process_xp_gain(member, message.guild)
+        await self.process_xp_gain(message.author, message.guild)
 
     async def process_xp_gain(self, member: discord.Member, guild: discord.Guild) -> None:
         """
@@ -82,6 +113,64 @@ class LevelsService(commands.Cog):
             logger.debug(f"User {member.name} leveled up from {current_level} to {new_level} in guild {guild.name}")
             await self.handle_level_up(member, guild, new_level)
 
+    async def recompute_levels(self, guild_id: int) -> tuple[int, int]:
+        """
+        Recomputes the stored level of every member of a guild from their XP, e.g. after LEVELS_EXPONENT changed.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        tuple[int, int]
+            The number of members checked and the number whose level changed.
+        """
+        records = await self.levels_controller.get_guild_levels(guild_id)
+        changed: dict[int, int] = {}
+
+        for record in records:
+            if (level := self.calculate_level(record.xp)) != record.level:
+                changed[record.member_id] = level
+
+        await self.levels_controller.update_levels(guild_id, changed)
+        return len(records), len(changed)
+
+    async def import_levels(self, guild_id: int, imported: XpImport) -> int:
+        """
+        Stores the XP of every valid row of an import file, computing each member's level from their XP.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        imported : XpImport
+            The parsed import file.
+
+        Returns
+        -------
+        int
+            The number of members imported.
+        """
+        rows = [
+            {
+                "member_id": row.member_id,
+                "xp": row.xp,
+                "level": self.calculate_level(row.xp),
+                "blacklisted": row.blacklisted,
+                "last_message": row.last_message.isoformat() if row.last_message else None,
+            }
+            for row in imported.rows
+        ]
+
+        return await self.levels_controller.import_levels(
+            guild_id,
+            rows,
+            imported.has_blacklisted,
+            imported.has_last_message,
+        )
+
     def is_on_cooldown(self, last_message_time: datetime.datetime) -> bool:
         """
         Checks if the member is on cooldown.
@@ -129,18 +218,39 @@ class LevelsService(commands.Cog):
         new_level : int
             The new level of the member.
         """
-        roles_to_assign = [guild.get_role(rid) for lvl, rid in sorted(self.xp_roles.items()) if new_level >= lvl]
-        highest_role = roles_to_assign[-1] if roles_to_assign else None
+        role_id = self.get_level_role(new_level)
+        highest_role = guild.get_role(role_id) if role_id else None
 
-        if highest_role:
+        # Skip the role API calls when the member's roles are already right
+        if highest_role and highest_role not in member.roles:
             await self.try_assign_role(member, highest_role)
 
         roles_to_remove = [r for r in member.roles if r.id in self.xp_roles.values() and r != highest_role]
-        await member.remove_roles(*roles_to_remove)
+
+        if roles_to_remove:
+            await member.remove_roles(*roles_to_remove)
+
         logger.debug(
             f"Assigned role {highest_role.name if highest_role else "None"} to member {member} and removed roles {", ".join(r.name for r in roles_to_remove)}",
         )
 
+    def get_level_role(self, level: int) -> int | None:
+        """
+        Get the XP role for a level: the role of the highest XP_ROLES level reached.
+
+        Parameters
+        ----------
+        level : int
+            The level of the member.
+
+        Returns
+        -------
+        int | None
+            The ID of the role, or None if the level is below every XP role.
+        """
+        index = bisect.bisect_right(self.role_levels, level)
+        return self.xp_roles[self.role_levels[index - 1]] if index else None
+
     @staticmethod
     async def try_assign_role(member: discord.Member, role: discord.Role) -> None:
         """
@@ -172,6 +282,12 @@ class LevelsService(commands.Cog):
         float
             The XP required for the level.
         """
+        if 0 <= level < len(self.level_thresholds):
+            return self.level_thresholds[level]
+
+        return self.xp_for_level_formula(level)
+
+    def xp_for_level_formula(self, level: int) -> float:
         return 500 * (level / 5) ** self.levels_exponent
 
     def calculate_xp_increment(self, member: discord.Member) -> float:
@@ -204,6 +320,9 @@ class LevelsService(commands.Cog):
         int
             The calculated level.
         """
+        if xp < self.level_thresholds[-1]:
+            return bisect.bisect_right(self.level_thresholds, xp) - 1
+
         return int((xp / 500) ** (1 / self.levels_exponent) * 5)
 
     # *NOTE* Do not move this function to utils.py, as this results in a circular import.
@@ -0,0 +1,343 @@
+import asyncio
+import contextlib
+import datetime
+
+import discord
+from discord.ext import commands
+from loguru import logger
+
+from tux.bot import Tux
+from tux.cogs.moderation.slowmode import Slowmode
+from tux.database.controllers import DatabaseController
+from tux.ui.embeds import EmbedCreator, EmbedType
+from tux.utils import checks
+from tux.utils.config import CONFIG
+from tux.utils.log_dispatcher import log_dispatcher
+from tux.utils.raid import BULK_BAN_SIZE, RaidDetector, RaidResponder
+
+RAID_REASON = "Raid protection"
+# Accounts waiting to be acted on at most, across guilds
+MAX_QUEUED = 10_000
+
+
+class RaidProtection(commands.Cog):
+    """
+    Detects join floods and responds to them.
+
+    Joins are counted in a sliding window per guild. When a guild is flooded it enters raid mode: its public
+    text channels get a slowmode, and the young accounts that joined in the flood, and those joining until raid
+    mode ends, are timed out, quarantined or banned by a fixed pool of workers, bans in bulk.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.config = DatabaseController().guild_config
+        self.detector = RaidDetector(
+            CONFIG.RAID_JOIN_THRESHOLD,
+            CONFIG.RAID_JOIN_WINDOW,
+            CONFIG.RAID_DURATION_MINUTES * 60,
+            datetime.timedelta(days=CONFIG.RAID_MIN_ACCOUNT_AGE_DAYS),
+        )
+        self.responder: RaidResponder | None = None
+        self.raids: dict[int, asyncio.Task[None]] = {}
+        # Set to end a guild's raid mode early
+        self.raid_ended: dict[int, asyncio.Event] = {}
+        # The quarantine role of guilds in raid mode, looked up once per raid
+        self.quarantine_roles: dict[int, int | None] = {}
+        # The accounts acted on in guilds in raid mode
+        self.actioned: dict[int, int] = {}
+
+    async def cog_load(self) -> None:
+        self.responder = RaidResponder(
+            self.act,
+            CONFIG.RAID_CONCURRENCY,
+            BULK_BAN_SIZE if CONFIG.RAID_ACTION == "ban" else 1,
+            MAX_QUEUED,
+        )
+
+    async def cog_unload(self) -> None:
+        # Raid mode restores the slowmode of its guild's channels when cancelled, so wait for it to do so
+        raids = list(self.raids.values())
+
+        for task in raids:
+            task.cancel()
+
+        for task in raids:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        if self.responder is not None:
+            await self.responder.close()
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        if not CONFIG.RAID_PROTECTION or member.bot:
+            return
+
+        started, offenders = self.detector.record(member)
+
+        if started:
+            self.raids[member.guild.id] = asyncio.create_task(self.raid_mode(member.guild))
+
+        if offenders and self.responder is not None:
+            self.responder.put(member.guild, offenders)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.detector.remove(guild.id)
+
+        if task := self.raids.get(guild.id):
+            task.cancel()
+
+    async def raid_mode(self, guild: discord.Guild) -> None:
+        """
+        Keep a guild in raid mode until the detector ends it, with its public text channels in slowmode.
+
+        The slowmodes are restored however raid mode ends, including when it is cancelled because the cog is
+        unloaded, unless the bot has left the guild.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild in raid mode.
+        """
+
+        logger.warning(f"Join flood detected in guild {guild.name}, enabling raid mode.")
+        self.actioned[guild.id] = 0
+        ended = self.raid_ended[guild.id] = asyncio.Event()
+        slowmodes: dict[int, int] = {}
+
+        try:
+            await self.send_log(
+                guild,
+                "Raid Mode Enabled",
+                f"**{CONFIG.RAID_JOIN_THRESHOLD}** or more members joined within **{CONFIG.RAID_JOIN_WINDOW}** "
+                f"seconds. New accounts will be acted on with **{CONFIG.RAID_ACTION}** until the joins slow down.",
+            )
+
+            await self.set_slowmodes(guild, slowmodes)
+
+            # Each join that keeps the flood going pushes the end back
+            while not ended.is_set() and (remaining := self.detector.raid_remaining(guild.id)) > 0:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(ended.wait(), remaining)
+
+        finally:
+            # Read before awaiting, since a new raid starting meanwhile resets the count
+            actioned = self.actioned.get(guild.id, 0)
+
+            if self.bot.get_guild(guild.id) is not None:
+                await self.restore_slowmodes(guild, slowmodes)
+
+                logger.info(f"Raid mode ended in guild {guild.name}, {actioned} accounts acted on.")
+                await self.send_log(guild, "Raid Mode Ended", f"**{actioned}** accounts were acted on.")
+
+            # A new raid may have started while the slowmodes were restored; its state is left alone
+            if self.raids.get(guild.id) is asyncio.current_task():
+                self.raids.pop(guild.id, None)
+                self.raid_ended.pop(guild.id, None)
+                self.quarantine_roles.pop(guild.id, None)
+                self.actioned.pop(guild.id, None)
+
+    async def set_slowmodes(self, guild: discord.Guild, previous: dict[int, int]) -> None:
+        """
+        Put the text channels everyone can send messages in into slowmode.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild in raid mode.
+        previous : dict[int, int]
+            Filled with the previous slowmode of every channel that is changed, by channel ID, as channels are
+            changed, so they can be restored even if this is cancelled.
+        """
+
+        if CONFIG.RAID_SLOWMODE_SECONDS <= 0:
+            return
+
+        for channel in guild.text_channels:
+            if (
+                channel.slowmode_delay >= CONFIG.RAID_SLOWMODE_SECONDS
+                or not channel.permissions_for(guild.default_role).send_messages
+                or not channel.permissions_for(guild.me).manage_channels
+            ):
+                continue
+
+            delay = channel.slowmode_delay
+
+            try:
+                await Slowmode.apply_slowmode(channel, CONFIG.RAID_SLOWMODE_SECONDS, RAID_REASON)
+                previous[channel.id] = delay
+
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to set the raid slowmode of {channel.name} in guild {guild.name}: {e}")
+
+    async def restore_slowmodes(self, guild: discord.Guild, previous: dict[int, int]) -> None:
+        """
+        Restore the slowmode raid mode changed, in the channels a moderator has not changed since.
+        """
+
+        for channel_id, delay in previous.items():
+            channel = guild.get_channel(channel_id)
+
+            if not isinstance(channel, discord.TextChannel) or channel.slowmode_delay != CONFIG.RAID_SLOWMODE_SECONDS:
+                continue
+
+            try:
+                await Slowmode.apply_slowmode(channel, delay, RAID_REASON)
+
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to restore the slowmode of {channel.name} in guild {guild.name}: {e}")
+
+    async def act(self, guild: discord.Guild, member_ids: list[int]) -> None:
+        """
+        Time out, quarantine or ban raid accounts, as configured.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild the accounts joined.
+        member_ids : list[int]
+            The IDs of the accounts.
+        """
+
+        if CONFIG.RAID_ACTION == "ban":
+            result = await guild.bulk_ban(
+                [discord.Object(id=member_id) for member_id in member_ids],
+                reason=RAID_REASON,
+                delete_message_seconds=3600,
+            )
+            self.count_actioned(guild, len(result.banned))
+
+            if result.failed:
+                logger.warning(f"Failed to ban {len(result.failed)} raid accounts in guild {guild.name}.")
+
+            return
+
+        role = await self.get_quarantine_role(guild) if CONFIG.RAID_ACTION == "quarantine" else None
+
+        for member_id in member_ids:
+            # Members that already left need no action
+            if (member := guild.get_member(member_id)) is None:
+                continue
+
+            try:
+                if role is not None:
+                    await member.add_roles(role, reason=RAID_REASON)
+                else:
+                    await member.timeout(datetime.timedelta(minutes=CONFIG.RAID_TIMEOUT_MINUTES), reason=RAID_REASON)
+
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to act on raid account {member} in guild {guild.name}: {e}")
+                continue
+
+            self.count_actioned(guild, 1)
+
+    def count_actioned(self, guild: discord.Guild, count: int) -> None:
+        if guild.id in self.actioned:
+            self.actioned[guild.id] += count
+
+    async def get_quarantine_role(self, guild: discord.Guild) -> discord.Role | None:
+        if guild.id not in self.quarantine_roles:
+            self.quarantine_roles[guild.id] = await self.config.get_quarantine_role_id(guild.id)
+
+            if self.quarantine_roles[guild.id] is None:
+                logger.warning(f"Guild {guild.name} has no quarantine role, timing out raid accounts instead.")
+
+        role_id = self.quarantine_roles[guild.id]
+        return guild.get_role(role_id) if role_id else None
+
+    async def send_log(self, guild: discord.Guild, title: str, description: str) -> None:
+        try:
+            log_channel_id = await self.config.get_mod_log_id(guild.id)
+
+        except Exception as e:
+            logger.error(f"Error getting the mod log channel of guild {guild.name}: {e}")
+            return
+
+        log_channel = guild.get_channel(log_channel_id) if log_channel_id else None
+
+        if isinstance(log_channel, discord.TextChannel):
+            embed = EmbedCreator.create_embed(
+                embed_type=EmbedType.WARNING,
+                bot=self.bot,
+                title=title,
+                description=description,
+            )
+            log_dispatcher.send(log_channel, embed)
+
+    @commands.hybrid_group(
+        name="raidmode",
+        aliases=["raid"],
+    )
+    @commands.guild_only()
+    async def raidmode(self, ctx: commands.Context[Tux]) -> None:
+        """
+        Raid protection related commands.
+        """
+
+        if ctx.invoked_subcommand is None:
+            await ctx.send_help("raidmode")
+
+    @checks.has_pl(2)
+    @commands.guild_only()
+    @raidmode.command(name="status")
+    async def status(self, ctx: commands.Context[Tux]) -> None:
+        """
+        Shows whether the guild is in raid mode.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+        """
+
+        assert ctx.guild
+
+        if not CONFIG.RAID_PROTECTION:
+            description = "Raid protection is disabled."
+        elif (remaining := self.detector.raid_remaining(ctx.guild.id)) > 0:
+            description = (
+                f"Raid mode is on, **{self.actioned.get(ctx.guild.id, 0)}** accounts acted on so far. "
+                f"It ends in **{round(remaining / 60)}** minutes unless the joins keep up."
+            )
+        else:
+            description = "Raid mode is off."
+
+        embed = EmbedCreator.create_embed(
+            embed_type=EmbedType.INFO,
+            title="Raid Mode",
+            description=description,
+        )
+
+        await ctx.send(embed=embed)
+
+    @checks.has_pl(2)
+    @commands.guild_only()
+    @raidmode.command(name="end")
+    async def end(self, ctx: commands.Context[Tux]) -> None:
+        """
+        Ends raid mode, restoring the slowmode of the guild's channels.
+
+        Parameters
+        ----------
+        ctx : commands.Context[Tux]
+            The context object for the command.
+        """
+
+        assert ctx.guild
+
+        if self.detector.raid_remaining(ctx.guild.id) <= 0:
+            await ctx.send("The guild is not in raid mode.", ephemeral=True)
+            return
+
+        self.detector.end_raid(ctx.guild.id)
+
+        if ended := self.raid_ended.get(ctx.guild.id):
+            ended.set()
+
+        await ctx.send("Raid mode ended.", ephemeral=True)
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(RaidProtection(bot))
@@ -0,0 +1,96 @@
+import datetime
+
+import discord
+from discord.ext import commands, tasks
+from loguru import logger
+
+from tux.bot import Tux
+from tux.database.controllers import DatabaseController
+from tux.utils.member_cache import MemberNeeds, member_cache
+from tux.utils.role_stats import role_stats
+
+
+class RoleStatsService(commands.Cog):
+    """
+    Keeps live per-role member counts current from member role changes and stores a daily snapshot of them.
+
+    Counts are only kept for guilds whose member list is cached, since role changes of uncached members
+    are not dispatched.
+    """
+
+    member_needs = MemberNeeds.MEMBER_LIST
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.db = DatabaseController().role_snapshot
+        self.store_snapshots.start()
+
+    async def cog_unload(self) -> None:
+        self.store_snapshots.cancel()
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        for guild in self.bot.guilds:
+            if member_cache.is_chunked(guild):
+                role_stats.compute(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        if member_cache.is_chunked(guild):
+            role_stats.compute(guild)
+
+    @commands.Cog.listener()
+    async def on_members_cached(self, guild: discord.Guild) -> None:
+        role_stats.compute(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        role_stats.remove(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if before.roles == after.roles:
+            return
+
+        before_ids = {role.id for role in before.roles}
+        after_ids = {role.id for role in after.roles}
+
+        role_stats.apply_diff(after.guild.id, after_ids - before_ids, before_ids - after_ids)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member) -> None:
+        role_stats.apply_diff(member.guild.id, {role.id for role in member.roles}, set())
+
+    @commands.Cog.listener()
+    async def on_member_remove(self, member: discord.Member) -> None:
+        role_stats.apply_diff(member.guild.id, set(), {role.id for role in member.roles})
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        if (counts := role_stats.peek(role.guild.id)) is not None:
+            counts.pop(role.id, None)
+
+    @tasks.loop(time=datetime.time(hour=0, minute=0, tzinfo=datetime.UTC))
+    async def store_snapshots(self) -> None:
+        """Stores the member count of every role once a day"""
+        today = datetime.datetime.now(datetime.UTC).replace(hour=0, minute=0, second=0, microsecond=0)
+
+        for guild in self.bot.guilds:
+            if (counts := role_stats.peek(guild.id)) is None:
+                logger.debug(f"Skipping role snapshots for guild {guild.name}, its members are not cached.")
+                continue
+
+            try:
+                created = await self.db.insert_snapshots(guild.id, dict(counts), today)
+                logger.debug(f"Stored {created} role snapshots for guild {guild.name}.")
+
+            except Exception as e:
+                logger.error(f"Error storing role snapshots for guild {guild.name}: {e}")
+
+    @store_snapshots.before_loop
+    async def before_store_snapshots(self) -> None:
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(RoleStatsService(bot))
@@ -1,14 +1,95 @@
+import asyncio
+
 import discord
 from discord.ext import commands
+from loguru import logger
 
 from tux.bot import Tux
+from tux.database.controllers import DatabaseController
 from tux.utils.config import CONFIG
 
 
 class TempVc(commands.Cog):
     def __init__(self, bot: Tux) -> None:
         self.bot = bot
+        self.db = DatabaseController().temp_vc
         self.base_vc_name: str = "/tmp/"
+        # Seconds to wait after a user leaves before deleting empty channels
+        self.cleanup_delay: float = 5.0
+
+        # Owner ID -> channel ID, and the reverse, for every temporary channel
+        self.owner_channels: dict[int, int] = {}
+        self.channel_owners: dict[int, int] = {}
+
+        # Channels to check on the next cleanup pass
+        self.pending_cleanup: set[int] = set()
+        self.cleanup_task: asyncio.Task[None] | None = None
+
+    async def cog_unload(self) -> None:
+        if self.cleanup_task is not None:
+            self.cleanup_task.cancel()
+
+    @staticmethod
+    def _get_config_ids() -> tuple[int, int]:
+        return int(CONFIG.TEMPVC_CHANNEL_ID or "0"), int(CONFIG.TEMPVC_CATEGORY_ID or "0")
+
+    def _index_channel(self, channel_id: int, owner_id: int) -> None:
+        if (old_channel_id := self.owner_channels.get(owner_id)) is not None:
+            self.channel_owners.pop(old_channel_id, None)
+
+        self.owner_channels[owner_id] = channel_id
+        self.channel_owners[channel_id] = owner_id
+
+    def _unindex_channel(self, channel_id: int) -> None:
+        if (owner_id := self.channel_owners.pop(channel_id, None)) is not None:
+            self.owner_channels.pop(owner_id, None)
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        """
+        Rebuild the owner index from the stored records and the channels in the temporary category.
+        """
+
+        temp_channel_id, temp_category_id = self._get_config_ids()
+        if temp_channel_id == 0 or temp_category_id == 0:
+            return
+
+        category = self.bot.get_channel(temp_category_id)
+        if not isinstance(category, discord.CategoryChannel):
+            return
+
+        records = {
+            record.channel_id: record.owner_id
+            for record in await self.db.get_all_temp_vcs_by_guild_id(category.guild.id)
+        }
+        live_channels = {channel.id: channel for channel in category.voice_channels if channel.id != temp_channel_id}
+
+        self.owner_channels.clear()
+        self.channel_owners.clear()
+
+        for channel in live_channels.values():
+            if channel.id in records:
+                self._index_channel(channel.id, records[channel.id])
+
+            # Channels created before owners were stored can only be matched by name
+            elif channel.name.startswith(self.base_vc_name) and (
+                owner := category.guild.get_member_named(channel.name.removeprefix(self.base_vc_name))
+            ):
+                self._index_channel(channel.id, owner.id)
+                await self.db.set_temp_vc(channel.id, owner.id, category.guild.id)
+
+        if stale := [channel_id for channel_id in records if channel_id not in live_channels]:
+            await self.db.delete_temp_vcs_by_channel_ids(stale)
+
+        logger.debug(f"Indexed {len(self.channel_owners)} temporary voice channels.")
+
+        self._schedule_cleanup(*self.channel_owners)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        if channel.id in self.channel_owners:
+            self._unindex_channel(channel.id)
+            await self.db.delete_temp_vcs_by_channel_ids([channel.id])
 
     @commands.Cog.listener()
     async def on_voice_state_update(
@@ -32,8 +113,7 @@ class TempVc(commands.Cog):
         """
 
         # Ensure CONFIGants are set correctly
-        temp_channel_id = int(CONFIG.TEMPVC_CHANNEL_ID or "0")
-        temp_category_id = int(CONFIG.TEMPVC_CATEGORY_ID or "0")
+        temp_channel_id, temp_category_id = self._get_config_ids()
         if temp_channel_id == 0 or temp_category_id == 0:
             return
 
@@ -43,7 +123,7 @@ class TempVc(commands.Cog):
 
         # When user leaves any voice channel
         elif before.channel:
-            await self._handle_user_leave(before.channel, after.channel, temp_channel_id, temp_category_id)
+            await self._handle_user_leave(before.channel, after.channel)
 
     async def _handle_user_join(
         self,
@@ -61,25 +141,30 @@ class TempVc(commands.Cog):
             The channel that the member joined.
         """
 
-        for voice_channel in channel.guild.voice_channels:
-            # Check if the channel is a temporary channel and if it is the user's channel
-            if voice_channel.name == self.base_vc_name + member.name:
-                await member.move_to(voice_channel)
+        # Move the user to their existing channel if they have one
+        if (channel_id := self.owner_channels.get(member.id)) is not None:
+            existing_channel = channel.guild.get_channel(channel_id)
+
+            if isinstance(existing_channel, discord.VoiceChannel):
+                self.pending_cleanup.discard(existing_channel.id)
+                await member.move_to(existing_channel)
                 return
 
+            self._unindex_channel(channel_id)
+
         # Create a new channel for the user if it doesn't exist
         new_channel = await channel.clone(name=self.base_vc_name + member.name)
+        self._index_channel(new_channel.id, member.id)
+        await self.db.set_temp_vc(new_channel.id, member.id, channel.guild.id)
         await member.move_to(new_channel)
 
     async def _handle_user_leave(
         self,
         before_channel: discord.VoiceChannel | discord.StageChannel,
         after_channel: discord.VoiceChannel | discord.StageChannel | None,
-        temp_channel_id: int,
-        temp_category_id: int,
     ) -> None:
         """
-        Handle the case when a user leaves a voice channel. Deletes empty temporary channels.
+        Handle the case when a user leaves a voice channel. Schedules empty temporary channels for deletion.
 
         Parameters
         ----------
@@ -87,39 +172,74 @@ class TempVc(commands.Cog):
             The channel the user was in before.
         after_channel : discord.VoiceChannel
             The channel the user moved to. Could be None if the user disconnected.
-        temp_channel_id: int
-            The ID of the temporary voice channel the bot manages.
-        temp_category_id: int
-            The ID of the category holding temporary voice channels.
         """
 
-        # Get the category of the temporary channels
-        category = discord.utils.get(before_channel.guild.categories, id=temp_category_id)
-
         # Check if the channel is a temporary channel
-        if (
-            not category
-            or before_channel.category_id != category.id
-            or before_channel == after_channel
-            or before_channel.id == temp_channel_id
-            or not before_channel.name.startswith(self.base_vc_name)
-        ):
+        if before_channel == after_channel or before_channel.id not in self.channel_owners:
             return
 
-        # Delete the channel if it is empty
         if len(before_channel.members) == 0:
-            await before_channel.delete()
-
-        # Search and delete all empty temporary channels
-        for channel in category.voice_channels:
-            if (
-                not channel.name.startswith(self.base_vc_name)
-                or len(channel.members) != 0
-                or channel.id == temp_channel_id
-            ):
+            self._schedule_cleanup(before_channel.id)
+
+    def _schedule_cleanup(self, *channel_ids: int) -> None:
+        """
+        Queue channels for the next cleanup pass, starting one if none is pending.
+
+        Parameters
+        ----------
+        *channel_ids : int
+            The IDs of the channels to check.
+        """
+
+        self.pending_cleanup.update(channel_ids)
+
+        if self.pending_cleanup and (self.cleanup_task is None or self.cleanup_task.done()):
+            self.cleanup_task = asyncio.create_task(self._cleanup_empty_channels())
+
+    async def _cleanup_empty_channels(self) -> None:
+        """
+        Run cleanup passes until no channels are queued, including those queued while a pass was running.
+        """
+
+        while self.pending_cleanup:
+            await asyncio.sleep(self.cleanup_delay)
+            await self._cleanup_pass()
+
+    async def _cleanup_pass(self) -> None:
+        """
+        Delete every queued temporary channel that is still empty, concurrently.
+        """
+
+        channel_ids = list(self.pending_cleanup)
+        self.pending_cleanup.clear()
+
+        channels: list[discord.VoiceChannel] = []
+
+        for channel_id in channel_ids:
+            channel = self.bot.get_channel(channel_id)
+
+            if isinstance(channel, discord.VoiceChannel) and len(channel.members) == 0:
+                channels.append(channel)
+            elif channel is None:
+                self._unindex_channel(channel_id)
+
+        if not channels:
+            return
+
+        results = await asyncio.gather(*(channel.delete() for channel in channels), return_exceptions=True)
+
+        deleted: list[int] = []
+
+        for channel, result in zip(channels, results, strict=True):
+            if isinstance(result, BaseException) and not isinstance(result, discord.NotFound):
+                logger.error(f"Failed to delete temporary voice channel {channel.name}: {result}")
                 continue
 
-            await channel.delete()
+            self._unindex_channel(channel.id)
+            deleted.append(channel.id)
+
+        if deleted:
+            await self.db.delete_temp_vcs_by_channel_ids(deleted)
 
 
 async def setup(bot: Tux) -> None:
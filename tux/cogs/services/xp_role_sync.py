@@ -0,0 +1,263 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+from loguru import logger
+
+from tux.bot import Tux
+from tux.cogs.services.levels import LevelsService
+from tux.database.controllers import DatabaseController
+from tux.utils.member_cache import MemberNeeds, member_cache
+
+# Pause between role edits, in seconds, so a sync leaves room in the guild's member edit rate limit for
+# moderation commands; discord.py still waits out any 429 on its own
+ROLE_EDIT_INTERVAL = 0.5
+# Members checked between saves of a guild's sync progress
+PROGRESS_INTERVAL = 100
+
+
+class XpRoleSync(commands.Cog):
+    """
+    Brings the XP roles of every member with XP in line with their XP, in guilds whose XP role settings changed since
+    they were last synced, or on request, and the XP roles of members whose level changed in bulk.
+
+    Guilds are synced one at a time by a single worker. Members are checked in ID order and the progress is
+    stored, so a sync interrupted by a restart resumes where it stopped.
+    """
+
+    member_needs = MemberNeeds.MEMBER_LIST
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.levels_service = LevelsService(bot)
+        self.db = DatabaseController().xp_role_sync
+        self.queue: asyncio.Queue[int] = asyncio.Queue()
+        self.queued: set[int] = set()
+        # Guilds to sync every member of, and those of them to sync from the first member, ignoring stored progress
+        self.full_syncs: set[int] = set()
+        self.restarts: set[int] = set()
+        # The new level of members to sync in guilds without a full sync queued
+        self.member_levels: dict[int, dict[int, int]] = {}
+        self.worker: asyncio.Task[None] | None = None
+
+    async def cog_load(self) -> None:
+        self.worker = asyncio.create_task(self.run())
+
+    async def cog_unload(self) -> None:
+        if self.worker is not None:
+            self.worker.cancel()
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        for guild in self.bot.guilds:
+            try:
+                sync = await self.db.get_sync(guild.id)
+
+            except Exception as e:
+                logger.error(f"Error checking the XP role sync of guild {guild.name}: {e}")
+                continue
+
+            if sync is None or sync.roles_hash != self.levels_service.roles_hash or not sync.completed:
+                self.enqueue(guild.id)
+
+    def enqueue(self, guild_id: int, restart: bool = False) -> bool:
+        """
+        Queue a guild for an XP role sync.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        restart : bool
+            Whether to check every member again, even if a sync of the current settings completed.
+
+        Returns
+        -------
+        bool
+            False if the guild was already queued.
+        """
+        self.full_syncs.add(guild_id)
+
+        if restart:
+            self.restarts.add(guild_id)
+
+        return self._put(guild_id)
+
+    def enqueue_members(self, guild_id: int, levels: dict[int, int]) -> None:
+        """
+        Queue an XP role sync of some members of a guild, e.g. the members whose level changed in bulk.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        levels : dict[int, int]
+            A mapping of member ID to new level.
+        """
+        self.member_levels.setdefault(guild_id, {}).update(levels)
+        self._put(guild_id)
+
+    def _put(self, guild_id: int) -> bool:
+        if guild_id in self.queued:
+            return False
+
+        self.queued.add(guild_id)
+        self.queue.put_nowait(guild_id)
+        return True
+
+    async def run(self) -> None:
+        await self.bot.wait_until_ready()
+
+        while True:
+            guild_id = await self.queue.get()
+            self.queued.discard(guild_id)
+            full_sync = guild_id in self.full_syncs
+            restart = guild_id in self.restarts
+            self.full_syncs.discard(guild_id)
+            self.restarts.discard(guild_id)
+            member_levels = self.member_levels.pop(guild_id, {})
+
+            if (guild := self.bot.get_guild(guild_id)) is None:
+                continue
+
+            try:
+                if full_sync:
+                    await self.sync_guild(guild, restart)
+                else:
+                    await self.sync_members(guild, member_levels)
+
+            except Exception as e:
+                logger.error(f"Error syncing XP roles in guild {guild.name}: {e}")
+
+    async def sync_guild(self, guild: discord.Guild, restart: bool = False) -> None:
+        """
+        Give every member of a guild who has gained XP the XP role of their level and remove their other XP roles.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to sync.
+        restart : bool
+            Whether to ignore the progress of an interrupted sync.
+        """
+        roles_hash = self.levels_service.roles_hash
+        sync = await self.db.get_sync(guild.id)
+        start_after = 0
+
+        if sync is not None and not restart and sync.roles_hash == roles_hash and not sync.completed:
+            start_after = sync.last_member_id
+            logger.info(f"Resuming the XP role sync of guild {guild.name} after member {start_after}.")
+
+        await member_cache.ensure_members(self.bot, guild)
+
+        records = {
+            record.member_id: record
+            for record in await self.levels_service.levels_controller.get_guild_levels(guild.id)
+        }
+
+        checked = changed = 0
+        last_member_id = start_after
+
+        for member in sorted(guild.members, key=lambda member: member.id):
+            if member.id <= start_after or member.bot:
+                continue
+
+            record = records.get(member.id)
+
+            # Members who never gained XP keep the roles they have, e.g. XP roles a moderator gave them by hand,
+            # and blacklisted members keep theirs, the same as when they stopped gaining XP
+            if (
+                record is not None
+                and not record.blacklisted
+                and await self.sync_member(member, self.levels_service.calculate_level(record.xp))
+            ):
+                changed += 1
+                await asyncio.sleep(ROLE_EDIT_INTERVAL)
+
+            checked += 1
+            last_member_id = member.id
+
+            if checked % PROGRESS_INTERVAL == 0:
+                await self.db.save_progress(guild.id, roles_hash, last_member_id, completed=False)
+
+        await self.db.save_progress(guild.id, roles_hash, last_member_id, completed=True)
+        logger.info(f"Synced the XP roles of {checked} members in guild {guild.name}, {changed} changed.")
+
+    async def sync_members(self, guild: discord.Guild, levels: dict[int, int]) -> None:
+        """
+        Give some members of a guild the XP role of their new level and remove their other XP roles.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild of the members.
+        levels : dict[int, int]
+            A mapping of member ID to new level.
+        """
+        await member_cache.ensure_members(self.bot, guild)
+
+        changed = 0
+
+        for member_id, level in sorted(levels.items()):
+            if (member := guild.get_member(member_id)) is None or member.bot:
+                continue
+
+            if await self.sync_member(member, level):
+                changed += 1
+                await asyncio.sleep(ROLE_EDIT_INTERVAL)
+
+        logger.info(f"Synced the XP roles of {len(levels)} members in guild {guild.name}, {changed} changed.")
+
+    async def sync_member(self, member: discord.Member, level: int) -> bool:
+        """
+        Give a member the XP role of their level and remove their other XP roles.
+
+        Only the XP roles that differ are added or removed, so other role changes made meanwhile, e.g. a jail
+        or quarantine, are left alone.
+
+        Parameters
+        ----------
+        member : discord.Member
+            The member to sync.
+        level : int
+            The level of the member.
+
+        Returns
+        -------
+        bool
+            Whether the member's roles were edited.
+        """
+        xp_role_ids = set(self.levels_service.xp_roles.values())
+        role_id = self.levels_service.get_level_role(level)
+        target = member.guild.get_role(role_id) if role_id else None
+
+        current = {role for role in member.roles if role.id in xp_role_ids}
+        wanted = {target} if target else set()
+
+        if current == wanted:
+            return False
+
+        try:
+            if added := wanted - current:
+                await member.add_roles(*added, reason="XP role sync")
+
+            if stale := current - wanted:
+                await member.remove_roles(*stale, reason="XP role sync")
+
+        except discord.Forbidden as e:
+            logger.warning(f"Missing permissions to sync the XP roles of {member}: {e}")
+            return False
+
+        except discord.HTTPException as e:
+            logger.error(f"Failed to sync the XP roles of {member}: {e}")
+            return False
+
+        logger.debug(
+            f"Synced XP roles of {member}: added {", ".join(r.name for r in added) or "none"}, "
+            f"removed {", ".join(r.name for r in stale) or "none"}",
+        )
+        return True
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(XpRoleSync(bot))
@@ -0,0 +1,98 @@
+import datetime
+
+import discord
+from discord.ext import commands, tasks
+from loguru import logger
+
+from tux.bot import Tux
+from tux.cogs.services.levels import LevelsService
+from tux.cogs.services.xp_role_sync import XpRoleSync
+from tux.utils.config import CONFIG
+
+
+class XpSeasons(commands.Cog):
+    """
+    Ends XP seasons and decays the XP of inactive members, once a day.
+
+    Both run as set-based updates of each guild's levels rows, batched by member ID. Only members whose level
+    changed get their stored level rewritten and their XP roles synced.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.levels_service = LevelsService(bot)
+        self.maintain_xp.start()
+
+    async def cog_unload(self) -> None:
+        self.maintain_xp.cancel()
+
+    @tasks.loop(time=datetime.time(hour=0, minute=0, tzinfo=datetime.UTC))
+    async def maintain_xp(self) -> None:
+        """Ends the season on its first day, and otherwise decays the XP of inactive members"""
+        now = datetime.datetime.now(datetime.UTC)
+        months = CONFIG.XP_SEASON_MONTHS
+        season_ends = months > 0 and now.day == 1 and (now.month - 1) % months == 0
+
+        if not season_ends and CONFIG.XP_DECAY_DAYS <= 0:
+            return
+
+        for guild in self.bot.guilds:
+            try:
+                if season_ends:
+                    await self.end_season(guild)
+                else:
+                    await self.decay_xp(guild, now - datetime.timedelta(days=CONFIG.XP_DECAY_DAYS))
+
+            except Exception as e:
+                logger.error(f"Error updating the XP of guild {guild.name}: {e}")
+
+    @maintain_xp.before_loop
+    async def before_maintain_xp(self) -> None:
+        await self.bot.wait_until_ready()
+
+    async def end_season(self, guild: discord.Guild) -> None:
+        """
+        Resets the XP and level of every member of a guild.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild whose season ends.
+        """
+        member_ids = await self.levels_service.levels_controller.reset_guild_xp(guild.id)
+        self.sync_roles(guild.id, dict.fromkeys(member_ids, 0))
+        logger.info(f"Ended the XP season of guild {guild.name}, resetting {len(member_ids)} members.")
+
+    async def decay_xp(self, guild: discord.Guild, inactive_since: datetime.datetime) -> None:
+        """
+        Takes XP_DECAY_PERCENT of the XP of every member of a guild who has not sent a message since a given time.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild whose members' XP decays.
+        inactive_since : datetime.datetime
+            Members whose last message is older than this lose XP.
+        """
+        controller = self.levels_service.levels_controller
+        decayed = await controller.decay_xp(guild.id, 1 - CONFIG.XP_DECAY_PERCENT / 100, inactive_since)
+
+        levels = {
+            member_id: new_level
+            for member_id, xp, level in decayed
+            if (new_level := self.levels_service.calculate_level(xp)) != level
+        }
+
+        await controller.update_levels(guild.id, levels)
+        self.sync_roles(guild.id, levels)
+        logger.info(
+            f"Decayed the XP of {len(decayed)} inactive members of guild {guild.name}, {len(levels)} lost a level."
+        )
+
+    def sync_roles(self, guild_id: int, levels: dict[int, int]) -> None:
+        if levels and isinstance(sync := self.bot.get_cog("XpRoleSync"), XpRoleSync):
+            sync.enqueue_members(guild_id, levels)
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(XpSeasons(bot))
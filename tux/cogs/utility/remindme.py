@@ -21,7 +21,7 @@ class RemindMe(commands.Cog):
 
     @tasks.loop(seconds=120)
     async def check_reminders(self):
-        reminders = await self.db.get_unsent_reminders()
+        reminders = await self.db.get_unsent_reminders(self.bot.cluster_guild_ids())
 
         try:
             for reminder in reminders:
@@ -35,6 +35,11 @@ class RemindMe(commands.Cog):
     async def send_reminder(self, reminder: Reminder) -> None:
         user = self.bot.get_user(reminder.reminder_user_id)
 
+        # Users are only cached while one of their members is, so fall back to the API
+        if user is None:
+            with contextlib.suppress(discord.HTTPException):
+                user = await self.bot.fetch_user(reminder.reminder_user_id)
+
         if user is not None:
             embed = EmbedCreator.create_embed(
                 bot=self.bot,
@@ -1,10 +1,13 @@
+import asyncio
 import contextlib
 import datetime
 import string
+import sys
+from collections import OrderedDict, defaultdict
 
 import discord
 from discord import AllowedMentions
-from discord.ext import commands
+from discord.ext import commands, tasks
 from loguru import logger
 from reactionmenu import ViewButton, ViewMenu
 
@@ -15,6 +18,69 @@ from tux.database.controllers import CaseController, DatabaseController
 from tux.ui.embeds import EmbedCreator, EmbedType
 from tux.utils import checks
 from tux.utils.flags import generate_usage
+from tux.utils.snippet_index import SnippetIndex
+
+
+class SnippetCache:
+    """
+    Size-bounded LRU cache of snippet records keyed by guild ID and lowercase snippet name.
+    """
+
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self.entries: OrderedDict[tuple[int, str], Snippet] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, guild_id: int, name: str) -> Snippet | None:
+        key = (guild_id, name.lower())
+        snippet = self.entries.get(key)
+
+        if snippet is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return snippet
+
+    def set(self, snippet: Snippet) -> None:
+        key = (snippet.guild_id, snippet.snippet_name.lower())
+        self.entries[key] = snippet
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def invalidate(self, guild_id: int, name: str) -> None:
+        self.entries.pop((guild_id, name.lower()), None)
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Get usage and memory statistics for the cache.
+
+        Returns
+        -------
+        dict[str, int | float]
+            The entry count, capacity, hits, misses, hit ratio and approximate size of cached content in bytes.
+        """
+
+        return {
+            "entries": len(self.entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "content_bytes": sum(sys.getsizeof(snippet.snippet_content) for snippet in self.entries.values()),
+        }
 
 
 class Snippets(commands.Cog):
@@ -23,6 +89,14 @@ class Snippets(commands.Cog):
         self.db = DatabaseController().snippet
         self.config = DatabaseController().guild_config
         self.case_controller = CaseController()
+        self.index = SnippetIndex(self.db.get_snippet_names_by_guild_id)
+        self.cache = SnippetCache()
+        # Snippet ID -> uses not yet written to the database
+        self.pending_uses: defaultdict[int, int] = defaultdict(int)
+        # Uses currently being written to the database
+        self.flushing_uses: dict[int, int] = {}
+        # The write of flushing_uses, which cancelling a flush does not interrupt
+        self.flush_task: asyncio.Task[None] | None = None
         self.list_snippets.usage = generate_usage(self.list_snippets)
         self.top_snippets.usage = generate_usage(self.top_snippets)
         self.delete_snippet.usage = generate_usage(self.delete_snippet)
@@ -32,6 +106,70 @@ class Snippets(commands.Cog):
         self.create_snippet.usage = generate_usage(self.create_snippet)
         self.edit_snippet.usage = generate_usage(self.edit_snippet)
         self.toggle_snippet_lock.usage = generate_usage(self.toggle_snippet_lock)
+        self.flush_snippet_uses.start()
+
+    async def cog_unload(self) -> None:
+        self.flush_snippet_uses.cancel()
+        await self.flush_pending_uses()
+
+    @tasks.loop(seconds=30)
+    async def flush_snippet_uses(self) -> None:
+        """Regularly writes buffered snippet uses to the database"""
+        await self.flush_pending_uses()
+
+    async def flush_pending_uses(self) -> None:
+        """
+        Write buffered snippet uses to the database as atomic increments.
+
+        The buffer is swapped out before writing so uses recorded during the write are kept for the next flush.
+        The write runs in its own task, so cancelling the flush loop mid-write neither loses nor repeats uses;
+        a later flush waits for it first.
+        """
+
+        if self.flush_task is not None and not self.flush_task.done():
+            await asyncio.shield(self.flush_task)
+
+        if not self.pending_uses:
+            return
+
+        self.flushing_uses = dict(self.pending_uses)
+        self.pending_uses.clear()
+
+        self.flush_task = asyncio.create_task(self.write_uses())
+        await asyncio.shield(self.flush_task)
+
+    async def write_uses(self) -> None:
+        try:
+            await self.db.increment_snippet_uses_batch(self.flushing_uses)
+            logger.debug(f"Flushed uses for {len(self.flushing_uses)} snippets.")
+
+        except Exception as e:
+            logger.error(f"Error flushing snippet uses: {e}")
+
+            for snippet_id, amount in self.flushing_uses.items():
+                self.pending_uses[snippet_id] += amount
+
+        finally:
+            self.flushing_uses = {}
+
+    def get_snippet_uses(self, snippet: Snippet) -> int:
+        """
+        Get the uses of a snippet, including uses not yet written to the database.
+
+        Parameters
+        ----------
+        snippet : Snippet
+            The snippet.
+
+        Returns
+        -------
+        int
+            The total uses of the snippet.
+        """
+
+        return (
+            snippet.uses + self.pending_uses.get(snippet.snippet_id, 0) + self.flushing_uses.get(snippet.snippet_id, 0)
+        )
 
     async def is_snippetbanned(self, guild_id: int, user_id: int) -> bool:
         ban_cases = await self.case_controller.get_all_cases_by_type(guild_id, CaseType.SNIPPETBAN)
@@ -42,6 +180,57 @@ class Snippets(commands.Cog):
 
         return ban_count > unban_count
 
+    async def get_snippet_by_name(self, guild_id: int, name: str) -> Snippet | None:
+        """
+        Get a snippet by name, using the name index to skip lookups for snippets that do not exist.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        name : str
+            The name of the snippet, in any case.
+
+        Returns
+        -------
+        Snippet | None
+            The snippet, or None if it does not exist.
+        """
+
+        snippet_name = await self.index.get(guild_id, name)
+
+        if snippet_name is None:
+            return None
+
+        return await self.db.get_snippet_by_exact_name_and_guild_id(snippet_name, guild_id)
+
+    async def get_suggestions(self, guild_id: int, name: str, limit: int = 3) -> list[str]:
+        """
+        Get snippet names that start with or closely match a name.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        name : str
+            The name that was not found.
+        limit : int
+            The maximum number of suggestions.
+
+        Returns
+        -------
+        list[str]
+            The suggested snippet names.
+        """
+
+        suggestions = await self.index.complete(guild_id, name, limit)
+
+        for suggestion in await self.index.suggest(guild_id, name, limit):
+            if suggestion not in suggestions:
+                suggestions.append(suggestion)
+
+        return suggestions[:limit]
+
     @commands.command(
         name="snippets",
         aliases=["ls"],
@@ -59,10 +248,7 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippets: list[Snippet] = await self.db.get_all_snippets_sorted(newestfirst=True)
-
-        # Remove snippets that are not in the current server
-        snippets = [snippet for snippet in snippets if snippet.guild_id == ctx.guild.id]
+        snippets: list[Snippet] = await self.db.get_all_snippets_by_guild_id_sorted(ctx.guild.id, newestfirst=True)
 
         # If there are no snippets, return
         if not snippets:
@@ -142,7 +328,7 @@ class Snippets(commands.Cog):
             return
 
         # sort the snippets by uses
-        snippets.sort(key=lambda x: x.uses, reverse=True)
+        snippets.sort(key=self.get_snippet_uses, reverse=True)
 
         # print in this format
         # 1. snippet_name | uses: 10
@@ -152,7 +338,7 @@ class Snippets(commands.Cog):
 
         text = "```\n"
         for i, snippet in enumerate(snippets[:10]):
-            text += f"{i + 1}. {snippet.snippet_name.ljust(20)} | uses: {snippet.uses}\n"
+            text += f"{i + 1}. {snippet.snippet_name.ljust(20)} | uses: {self.get_snippet_uses(snippet)}\n"
         text += "```"
 
         # only show top 10, no pagination
@@ -184,7 +370,7 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = await self.get_snippet_by_name(ctx.guild.id, name)
 
         if snippet is None:
             await self.send_snippet_error(ctx, description="Snippet not found.")
@@ -205,6 +391,8 @@ class Snippets(commands.Cog):
             return
 
         await self.db.delete_snippet_by_id(snippet.snippet_id)
+        self.index.remove(ctx.guild.id, snippet.snippet_name)
+        self.cache.invalidate(ctx.guild.id, snippet.snippet_name)
 
         await ctx.send("Snippet deleted.", delete_after=30, ephemeral=True)
         logger.info(f"{ctx.author} deleted the snippet with the name {name}.")
@@ -229,13 +417,15 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = await self.get_snippet_by_name(ctx.guild.id, name)
 
         if snippet is None:
             await self.send_snippet_error(ctx, description="Snippet not found.")
             return
 
         await self.db.delete_snippet_by_id(snippet.snippet_id)
+        self.index.remove(ctx.guild.id, snippet.snippet_name)
+        self.cache.invalidate(ctx.guild.id, snippet.snippet_name)
 
         await ctx.send("Snippet deleted.", delete_after=30, ephemeral=True)
         logger.info(f"{ctx.author} force deleted the snippet with the name {name}.")
@@ -259,7 +449,10 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = self.cache.get(ctx.guild.id, name)
+
+        if snippet is None and (snippet := await self.get_snippet_by_name(ctx.guild.id, name)) is not None:
+            self.cache.set(snippet)
 
         # check if the name contains an underscore
         if "_" in name:
@@ -269,9 +462,12 @@ class Snippets(commands.Cog):
             )
             return
         if snippet is None:
-            await self.send_snippet_error(ctx, description="No snippets found.")
+            description = "No snippets found."
+            if suggestions := await self.get_suggestions(ctx.guild.id, name):
+                description += f" Did you mean {", ".join(f"`{suggestion}`" for suggestion in suggestions)}?"
+            await self.send_snippet_error(ctx, description=description)
             return
-        await self.db.increment_snippet_uses(snippet.snippet_id)
+        self.pending_uses[snippet.snippet_id] += 1
 
         # example text:
         # `/snippets/name.txt` [if locked put '🔒 ' icon]|| [content]
@@ -301,7 +497,7 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = await self.get_snippet_by_name(ctx.guild.id, name)
 
         if snippet is None:
             await self.send_snippet_error(ctx, description="Snippet not found.")
@@ -325,7 +521,7 @@ class Snippets(commands.Cog):
             inline=False,
         )
         embed.add_field(name="Content", value=f"> {snippet.snippet_content}", inline=False)
-        embed.add_field(name="Uses", value=snippet.uses, inline=False)
+        embed.add_field(name="Uses", value=self.get_snippet_uses(snippet), inline=False)
         embed.add_field(name="Locked", value="Yes" if snippet.locked else "No", inline=False)
 
         await ctx.send(embed=embed)
@@ -371,7 +567,7 @@ class Snippets(commands.Cog):
         server_id = ctx.guild.id
 
         # Check if the snippet already exists
-        if await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id) is not None:
+        if await self.index.get(ctx.guild.id, name) is not None:
             await self.send_snippet_error(ctx, description="Snippet already exists.")
             return
 
@@ -385,13 +581,14 @@ class Snippets(commands.Cog):
             )
             return
 
-        await self.db.create_snippet(
+        snippet = await self.db.create_snippet(
             snippet_name=name,
             snippet_content=content,
             snippet_created_at=created_at,
             snippet_user_id=author_id,
             guild_id=server_id,
         )
+        self.index.add(server_id, snippet.snippet_name)
 
         await ctx.send("Snippet created.", delete_after=30, ephemeral=True)
         logger.info(f"{ctx.author} created a snippet with the name {name}.")
@@ -417,7 +614,7 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = await self.get_snippet_by_name(ctx.guild.id, name)
 
         if snippet is None:
             await self.send_snippet_error(ctx, description="Snippet not found.")
@@ -453,6 +650,7 @@ class Snippets(commands.Cog):
             snippet.snippet_id,
             snippet_content=content,
         )
+        self.cache.invalidate(ctx.guild.id, snippet.snippet_name)
 
         await ctx.send("Snippet Edited.", delete_after=30, ephemeral=True)
         logger.info(f"{ctx.author} Edited a snippet with the name {name}.")
@@ -477,13 +675,14 @@ class Snippets(commands.Cog):
 
         assert ctx.guild
 
-        snippet = await self.db.get_snippet_by_name_and_guild_id(name, ctx.guild.id)
+        snippet = await self.get_snippet_by_name(ctx.guild.id, name)
 
         if snippet is None:
             await self.send_snippet_error(ctx, description="Snippet not found.")
             return
 
         status = await self.db.toggle_snippet_lock_by_id(snippet.snippet_id)
+        self.cache.invalidate(ctx.guild.id, snippet.snippet_name)
 
         if status is None:
             await self.send_snippet_error(
@@ -492,7 +691,13 @@ class Snippets(commands.Cog):
             )
             return
 
-        if author := self.bot.get_user(snippet.snippet_user_id):
+        author = self.bot.get_user(snippet.snippet_user_id)
+
+        if author is None:
+            with contextlib.suppress(discord.HTTPException):
+                author = await self.bot.fetch_user(snippet.snippet_user_id)
+
+        if author is not None:
             with contextlib.suppress(discord.Forbidden):
                 await author.send(
                     f"""Your snippet `{snippet.snippet_name}` has been {"locked" if status.locked else "unlocked"}.
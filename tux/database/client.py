@@ -1,3 +1,42 @@
+import time
+from typing import Any
+
+from pydantic import BaseModel
+
 from prisma import Prisma
+from prisma._types import PrismaMethod  # pyright: ignore[reportPrivateUsage]
+from tux.database.tracing import query_tracer
+
+# Database hosts the dev tools may write to without --allow-remote; "postgres" and "db" are the usual compose
+# service names
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "postgres", "db"}
+
+
+class TracedPrisma(Prisma):
+    """
+    Prisma client that reports the latency of every query to the query tracer.
+    """
+
+    async def _execute(
+        self,
+        *,
+        method: PrismaMethod,
+        arguments: dict[str, Any],
+        model: type[BaseModel] | None = None,
+        root_selection: list[str] | None = None,
+    ) -> Any:
+        start = time.perf_counter()
+
+        try:
+            return await super()._execute(
+                method=method,
+                arguments=arguments,
+                model=model,
+                root_selection=root_selection,
+            )
+
+        finally:
+            query_tracer.record(f"{model.__name__}.{method}" if model else method, time.perf_counter() - start)
+
 
-db = Prisma(log_queries=False, auto_register=True)
+db = TracedPrisma(log_queries=False, auto_register=True)
@@ -1,16 +1,21 @@
 from .afk import AfkController
 from .case import CaseController
+from .case_search import CaseSearchController
 from .guild import GuildController
 from .guild_config import GuildConfigController
 from .note import NoteController
 from .reminder import ReminderController
+from .role_snapshot import RoleSnapshotController
 from .snippet import SnippetController
 from .starboard import StarboardController, StarboardMessageController
+from .temp_vc import TempVcController
+from .xp_role_sync import XpRoleSyncController
 
 
 class DatabaseController:
     def __init__(self):
         self.case = CaseController()
+        self.case_search = CaseSearchController()
         self.note = NoteController()
         self.snippet = SnippetController()
         self.reminder = ReminderController()
@@ -19,3 +24,6 @@ class DatabaseController:
         self.afk = AfkController()
         self.starboard = StarboardController()
         self.starboard_message = StarboardMessageController()
+        self.role_snapshot = RoleSnapshotController()
+        self.temp_vc = TempVcController()
+        self.xp_role_sync = XpRoleSyncController()
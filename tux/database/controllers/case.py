@@ -313,22 +313,30 @@ class CaseController:
             return await self.table.delete(where={"case_id": case.case_id})
         return None
 
-    async def get_expired_tempbans(self) -> list[Case]:
+    async def get_expired_tempbans(self, guild_ids: list[int] | None = None) -> list[Case]:
         """
         Get all cases that have expired tempbans.
 
+        Parameters
+        ----------
+        guild_ids : list[int] | None
+            The IDs of the guilds to get the cases of, by default every guild.
+
         Returns
         -------
         list[Case]
             A list of cases of the type in the guild.
         """
-        return await self.table.find_many(
-            where={
-                "case_type": CaseType.TEMPBAN,
-                "case_expires_at": {"lt": datetime.now(UTC)},
-                "case_tempban_expired": False,
-            },
-        )
+        where: CaseWhereInput = {
+            "case_type": CaseType.TEMPBAN,
+            "case_expires_at": {"lt": datetime.now(UTC)},
+            "case_tempban_expired": False,
+        }
+
+        if guild_ids is not None:
+            where["guild_id"] = {"in": guild_ids}
+
+        return await self.table.find_many(where=where)
 
     async def set_tempban_expired(self, case_number: int | None, guild_id: int) -> int | None:
         """
@@ -0,0 +1,213 @@
+import datetime
+from dataclasses import dataclass
+from typing import Any, LiteralString
+
+from tux.database.client import db
+
+# The most recent matching cases, and as many notes, that a search ranks and counts
+MAX_RANKED = 500
+
+# Turns the search columns into columns Postgres generates from the text they index, which the Prisma schema
+# cannot express; `prisma db push` creates them as plain columns. Dropping a column drops its index, so the
+# indexes are recreated under the names the schema gives them. Adding a stored generated column rewrites the
+# table under an ACCESS EXCLUSIVE lock, so this is run explicitly with `python -m tux.database.search_setup`.
+SEARCH_COLUMN_SETUP: list[LiteralString] = [
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'Case' AND column_name = 'case_search' AND is_generated = 'ALWAYS'
+        ) THEN
+            ALTER TABLE "Case" DROP COLUMN IF EXISTS "case_search";
+            ALTER TABLE "Case" ADD COLUMN "case_search" tsvector
+                GENERATED ALWAYS AS (to_tsvector('english'::regconfig, "case_reason")) STORED;
+        END IF;
+    END $$
+    """,
+    'CREATE INDEX IF NOT EXISTS "Case_guild_id_case_search_idx" ON "Case" USING GIN ("guild_id", "case_search")',
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'Note' AND column_name = 'note_search' AND is_generated = 'ALWAYS'
+        ) THEN
+            ALTER TABLE "Note" DROP COLUMN IF EXISTS "note_search";
+            ALTER TABLE "Note" ADD COLUMN "note_search" tsvector
+                GENERATED ALWAYS AS (to_tsvector('english'::regconfig, "note_content")) STORED;
+        END IF;
+    END $$
+    """,
+    'CREATE INDEX IF NOT EXISTS "Note_guild_id_note_search_idx" ON "Note" USING GIN ("guild_id", "note_search")',
+]
+
+
+@dataclass
+class CaseSearchResult:
+    """
+    A case or note matching a search. Notes have no type, and are numbered by their note ID if they have no number.
+    """
+
+    kind: str
+    number: int | None
+    case_type: str | None
+    content: str
+    user_id: int
+    moderator_id: int
+    created_at: datetime.datetime | None
+    rank: float
+
+    @classmethod
+    def from_row(cls, row: dict[str, Any]) -> "CaseSearchResult":
+        created_at = row["created_at"]
+
+        return cls(
+            kind=row["kind"],
+            number=int(row["number"]) if row["number"] is not None else None,
+            case_type=row["case_type"],
+            content=row["content"],
+            user_id=int(row["user_id"]),
+            moderator_id=int(row["moderator_id"]),
+            created_at=datetime.datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at,
+            rank=float(row["rank"]),
+        )
+
+
+class CaseSearchController:
+    async def search_columns_ready(self) -> bool:
+        """
+        Check whether the full-text search columns of cases and notes are generated columns, without changing them.
+        """
+        results = await db.query_raw(
+            """
+            SELECT count(*) AS generated
+            FROM information_schema.columns
+            WHERE is_generated = 'ALWAYS'
+                AND (
+                    (table_name = 'Case' AND column_name = 'case_search')
+                    OR (table_name = 'Note' AND column_name = 'note_search')
+                )
+            """,
+        )
+        return int(results[0]["generated"]) == 2
+
+    async def ensure_search_columns(self) -> None:
+        """
+        Make sure the full-text search columns of cases and notes are generated columns with their indexes.
+        Only the first run after a schema push does any work, but that run rewrites both tables while locking
+        them, so it must not run while the bot serves a large database.
+        """
+        for statement in SEARCH_COLUMN_SETUP:
+            await db.execute_raw(statement)
+
+    async def search(
+        self,
+        guild_id: int,
+        query: str,
+        limit: int,
+        offset: int = 0,
+    ) -> tuple[list[CaseSearchResult], int, bool]:
+        """
+        Search the reasons of a guild's cases and the content of its notes, best matches first.
+
+        The query is parsed like a web search: words, "quoted phrases", `or` and `-excluded` words, matched
+        against stemmed English words through the GIN index of the generated search columns. Rows matching
+        none of the words in full, e.g. for a partial word or a typo, are found through the trigram index of
+        the text instead and rank below full matches, by word similarity. Both indexes include the guild ID, so
+        the index scans match the guild too, rather than fetching every guild's matching rows to filter them.
+
+        Only the MAX_RANKED most recent matching cases and notes are ranked and counted, so a common word
+        matching much of a large guild's history costs a bounded sort rather than ranking every match.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        query : str
+            The search query.
+        limit : int
+            The results to return at most.
+        offset : int
+            The results to skip, for pagination.
+
+        Returns
+        -------
+        tuple[list[CaseSearchResult], int, bool]
+            The page of results, the number of results, and whether there were more matches than were ranked.
+        """
+        results = await db.query_raw(
+            """
+            WITH matches AS (
+                (
+                    SELECT
+                        'case' AS kind,
+                        "case_number" AS number,
+                        "case_type"::text AS case_type,
+                        "case_reason" AS content,
+                        "case_user_id" AS user_id,
+                        "case_moderator_id" AS moderator_id,
+                        "case_created_at" AS created_at,
+                        CASE
+                            WHEN "case_search" @@ websearch_to_tsquery('english'::regconfig, $2::text)
+                            THEN 1 + ts_rank_cd("case_search", websearch_to_tsquery('english'::regconfig, $2::text))
+                            ELSE word_similarity($2::text, "case_reason")
+                        END AS rank
+                    FROM "Case"
+                    WHERE "guild_id" = $1::bigint
+                        AND (
+                            "case_search" @@ websearch_to_tsquery('english'::regconfig, $2::text)
+                            OR $2::text <% "case_reason"
+                        )
+                    ORDER BY "case_created_at" DESC NULLS LAST
+                    LIMIT $5::int
+                )
+                UNION ALL
+                (
+                    SELECT
+                        'note',
+                        COALESCE("note_number", "note_id"),
+                        NULL,
+                        "note_content",
+                        "note_user_id",
+                        "note_moderator_id",
+                        "note_created_at",
+                        CASE
+                            WHEN "note_search" @@ websearch_to_tsquery('english'::regconfig, $2::text)
+                            THEN 1 + ts_rank_cd("note_search", websearch_to_tsquery('english'::regconfig, $2::text))
+                            ELSE word_similarity($2::text, "note_content")
+                        END
+                    FROM "Note"
+                    WHERE "guild_id" = $1::bigint
+                        AND (
+                            "note_search" @@ websearch_to_tsquery('english'::regconfig, $2::text)
+                            OR $2::text <% "note_content"
+                        )
+                    ORDER BY "note_created_at" DESC
+                    LIMIT $5::int
+                )
+            )
+            SELECT
+                *,
+                count(*) OVER () AS total,
+                count(*) FILTER (WHERE kind = 'case') OVER () >= $5::int
+                    OR count(*) FILTER (WHERE kind = 'note') OVER () >= $5::int AS capped
+            FROM matches
+            ORDER BY rank DESC, created_at DESC NULLS LAST
+            LIMIT $3::int OFFSET $4::int
+            """,
+            guild_id,
+            query,
+            limit,
+            offset,
+            MAX_RANKED,
+        )
+
+        if not results:
+            return [], 0, False
+
+        return (
+            [CaseSearchResult.from_row(result) for result in results],
+            int(results[0]["total"]),
+            bool(results[0]["capped"]),
+        )
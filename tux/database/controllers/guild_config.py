@@ -7,8 +7,22 @@ from prisma.types import (
     GuildConfigScalarFieldKeys,
     GuildConfigUpdateInput,
 )
+from tux.cluster.bus import INVALIDATE_PREFIX, cluster_bus
 from tux.database.client import db
 
+# Guild ID -> prefix, read for every message. Changes are published on the cluster bus so every process drops them.
+prefix_cache: dict[int, str | None] = {}
+
+
+def drop_cached_prefix(data: dict[str, Any]) -> None:
+    if (guild_id := data.get("guild_id")) is None:
+        prefix_cache.clear()
+    else:
+        prefix_cache.pop(guild_id, None)
+
+
+cluster_bus.subscribe(f"{INVALIDATE_PREFIX}guild_prefix", drop_cached_prefix)
+
 
 class GuildConfigController:
     def __init__(self):
@@ -37,8 +51,16 @@ class GuildConfigController:
         return await self.table.find_first(where={"guild_id": guild_id})
 
     async def get_guild_prefix(self, guild_id: int) -> str | None:
+        if guild_id in prefix_cache:
+            return prefix_cache[guild_id]
+
         config = await self.table.find_first(where={"guild_id": guild_id})
-        return None if config is None else config.prefix
+        prefix = prefix_cache[guild_id] = None if config is None else config.prefix
+        return prefix
+
+    async def invalidate_guild_prefix(self, guild_id: int) -> None:
+        prefix_cache.pop(guild_id, None)
+        await cluster_bus.invalidate("guild_prefix", guild_id)
 
     async def get_log_channel(self, guild_id: int, log_type: str) -> int | None:
         log_channel_ids: dict[str, GuildConfigScalarFieldKeys] = {
@@ -154,13 +176,15 @@ class GuildConfigController:
         prefix: str,
     ) -> GuildConfig | None:
         await self.ensure_guild_exists(guild_id)
-        return await self.table.upsert(
+        config = await self.table.upsert(
             where={"guild_id": guild_id},
             data={
                 "create": {"guild_id": guild_id, "prefix": prefix},
                 "update": {"prefix": prefix},
             },
         )
+        await self.invalidate_guild_prefix(guild_id)
+        return config
 
     async def update_perm_level_role(
         self,
@@ -411,7 +435,12 @@ class GuildConfigController:
     ) -> GuildConfig | None:
         await self.ensure_guild_exists(guild_id)
 
-        return await self.table.update(where={"guild_id": guild_id}, data=data)
+        config = await self.table.update(where={"guild_id": guild_id}, data=data)
+
+        if "prefix" in data:
+            await self.invalidate_guild_prefix(guild_id)
+
+        return config
 
     """
     DELETE
@@ -419,6 +448,8 @@ class GuildConfigController:
 
     async def delete_guild_config(self, guild_id: int) -> None:
         await self.table.delete(where={"guild_id": guild_id})
+        await self.invalidate_guild_prefix(guild_id)
 
     async def delete_guild_prefix(self, guild_id: int) -> None:
         await self.table.update(where={"guild_id": guild_id}, data={"prefix": None})
+        await self.invalidate_guild_prefix(guild_id)
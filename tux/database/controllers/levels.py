@@ -1,9 +1,19 @@
 import datetime
+import json
+from typing import Any, LiteralString
 
 from loguru import logger
 
-from prisma.models import Guild
+from prisma.models import Guild, Levels
 from tux.database.client import db
+from tux.utils.rank_index import rank_index
+
+# Member IDs per update query when levels are written back in bulk
+LEVEL_UPDATE_BATCH_SIZE = 1000
+# Rows per upsert statement when importing XP
+IMPORT_BATCH_SIZE = 10_000
+# Rows per statement for guild-wide XP changes, so no statement holds its row locks for long
+XP_CHANGE_BATCH_SIZE = 5000
 
 
 class LevelsController:
@@ -155,6 +165,42 @@ class LevelsController:
         else:
             return blacklisted.blacklisted if blacklisted else False
 
+    async def get_guild_rankings(self, guild_id: int) -> list[tuple[int, float]]:
+        """
+        Get the XP of every ranked member of a guild, highest first. Blacklisted members are not ranked.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        list[tuple[int, float]]
+            The member IDs and XP.
+        """
+        records = await self.levels_table.find_many(
+            where={"guild_id": guild_id, "blacklisted": False},
+            order={"xp": "desc"},
+        )
+        return [(record.member_id, record.xp) for record in records]
+
+    async def get_guild_levels(self, guild_id: int) -> list[Levels]:
+        """
+        Get the levels record of every member of a guild in one query.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        list[Levels]
+            The levels records, including blacklisted members.
+        """
+        return await self.levels_table.find_many(where={"guild_id": guild_id})
+
     async def update_xp_and_level(
         self,
         member_id: int,
@@ -185,7 +231,7 @@ class LevelsController:
         """
         await self.ensure_guild_exists(guild_id)
         try:
-            await self.levels_table.upsert(
+            record = await self.levels_table.upsert(
                 where={"member_id_guild_id": {"member_id": member_id, "guild_id": guild_id}},
                 data={
                     "create": {
@@ -200,6 +246,204 @@ class LevelsController:
             )
         except Exception as e:
             logger.error(f"Error updating XP and level for member_id: {member_id}, guild_id: {guild_id}: {e}")
+        else:
+            if not record.blacklisted:
+                rank_index.update(guild_id, member_id, xp)
+
+    async def update_levels(self, guild_id: int, levels: dict[int, int]) -> None:
+        """
+        Set the level of many members of a guild at once, in one transaction.
+
+        Members moving to the same level share an update query, so the number of queries grows with the
+        number of distinct levels rather than the number of members.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        levels : dict[int, int]
+            A mapping of member ID to new level.
+        """
+        members_by_level: dict[int, list[int]] = {}
+
+        for member_id, level in levels.items():
+            members_by_level.setdefault(level, []).append(member_id)
+
+        if not members_by_level:
+            return
+
+        async with db.batch_() as batcher:
+            for level, member_ids in members_by_level.items():
+                for start in range(0, len(member_ids), LEVEL_UPDATE_BATCH_SIZE):
+                    batcher.levels.update_many(
+                        where={
+                            "guild_id": guild_id,
+                            "member_id": {"in": member_ids[start : start + LEVEL_UPDATE_BATCH_SIZE]},
+                        },
+                        data={"level": level},
+                    )
+
+    async def import_levels(
+        self,
+        guild_id: int,
+        rows: list[dict[str, Any]],
+        set_blacklisted: bool,
+        set_last_message: bool,
+    ) -> int:
+        """
+        Insert or overwrite the XP and level of many members of a guild, in one transaction.
+
+        Each batch of rows is sent as one JSON document and merged with a single set-based upsert, instead of
+        a query per member.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        rows : list[dict[str, Any]]
+            The rows to import, each with `member_id`, `xp` and `level`, and `blacklisted` and
+            `last_message` (an ISO 8601 string) when those are set. Member IDs must be unique.
+        set_blacklisted : bool
+            Whether to overwrite the blacklist status of existing members; new members default to not blacklisted.
+        set_last_message : bool
+            Whether to overwrite the last message time of existing members; new members default to now.
+
+        Returns
+        -------
+        int
+            The number of rows inserted or updated.
+        """
+        await self.ensure_guild_exists(guild_id)
+
+        query = """
+            INSERT INTO "Levels" ("member_id", "guild_id", "xp", "level", "blacklisted", "last_message")
+            SELECT r.member_id, $1::bigint, r.xp, r.level, COALESCE(r.blacklisted, false), COALESCE(r.last_message, now())
+            FROM json_to_recordset($2::json)
+                AS r(member_id bigint, xp double precision, level bigint, blacklisted boolean, last_message timestamptz)
+            ON CONFLICT ("member_id", "guild_id") DO UPDATE SET
+                "xp" = EXCLUDED."xp",
+                "level" = EXCLUDED."level",
+                "blacklisted" = CASE WHEN $3::boolean THEN EXCLUDED."blacklisted" ELSE "Levels"."blacklisted" END,
+                "last_message" = CASE WHEN $4::boolean THEN EXCLUDED."last_message" ELSE "Levels"."last_message" END
+        """
+
+        imported = 0
+
+        # Interactive transactions time out after 5 seconds by default, too short for large imports
+        async with db.tx(timeout=datetime.timedelta(minutes=1)) as transaction:
+            for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+                batch = json.dumps(rows[start : start + IMPORT_BATCH_SIZE])
+                imported += await transaction.execute_raw(query, guild_id, batch, set_blacklisted, set_last_message)
+
+        # The guild's ranking is reloaded from the imported rows on next use
+        rank_index.remove(guild_id)
+        return imported
+
+    async def _update_in_batches(self, guild_id: int, query: LiteralString, *args: Any) -> list[dict[str, Any]]:
+        """
+        Run an update over every levels row of a guild, one batch of member IDs per statement.
+
+        `query` selects the batch after member `$2`, `$3` rows long, for guild `$1`, and returns each member of
+        the batch with the columns of the updated row, or NULL for rows it left unchanged.
+        """
+        updated: list[dict[str, Any]] = []
+        after = 0
+
+        while True:
+            results = await db.query_raw(query, guild_id, after, XP_CHANGE_BATCH_SIZE, *args)
+
+            if not results:
+                break
+
+            updated.extend(result for result in results if result["xp"] is not None)
+            after = int(results[-1]["member_id"])
+
+        # The guild's ranking is reloaded from the changed rows on next use
+        rank_index.remove(guild_id)
+        return updated
+
+    async def decay_xp(
+        self, guild_id: int, factor: float, inactive_since: datetime.datetime
+    ) -> list[tuple[int, float, int]]:
+        """
+        Multiply the XP of every member of a guild who has not sent a message since a given time.
+
+        Levels are left as they are, for the caller to recompute with `update_levels`. Blacklisted members
+        keep their XP.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        factor : float
+            The factor to multiply XP by, e.g. 0.95 to take away 5%.
+        inactive_since : datetime.datetime
+            Members whose last message is older than this lose XP.
+
+        Returns
+        -------
+        list[tuple[int, float, int]]
+            The member ID, new XP and unchanged level of every member who lost XP.
+        """
+        updated = await self._update_in_batches(
+            guild_id,
+            """
+            WITH batch AS (
+                SELECT "member_id" FROM "Levels"
+                WHERE "guild_id" = $1::bigint AND "member_id" > $2::bigint
+                ORDER BY "member_id"
+                LIMIT $3::int
+            ), updated AS (
+                UPDATE "Levels" AS l SET "xp" = l."xp" * $4::double precision
+                FROM batch
+                WHERE l."guild_id" = $1::bigint AND l."member_id" = batch."member_id"
+                    AND l."last_message" < $5::timestamptz AND NOT l."blacklisted" AND l."xp" > 0
+                RETURNING l."member_id", l."xp", l."level"
+            )
+            SELECT batch."member_id", updated."xp", updated."level"
+            FROM batch LEFT JOIN updated USING ("member_id")
+            ORDER BY batch."member_id"
+            """,
+            factor,
+            inactive_since.isoformat(),
+        )
+        return [(int(row["member_id"]), float(row["xp"]), int(row["level"])) for row in updated]
+
+    async def reset_guild_xp(self, guild_id: int) -> list[int]:
+        """
+        Reset the XP and level of every member of a guild, e.g. at the end of a season.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        list[int]
+            The IDs of the members who had any XP or level.
+        """
+        updated = await self._update_in_batches(
+            guild_id,
+            """
+            WITH batch AS (
+                SELECT "member_id" FROM "Levels"
+                WHERE "guild_id" = $1::bigint AND "member_id" > $2::bigint
+                ORDER BY "member_id"
+                LIMIT $3::int
+            ), updated AS (
+                UPDATE "Levels" AS l SET "xp" = 0, "level" = 0
+                FROM batch
+                WHERE l."guild_id" = $1::bigint AND l."member_id" = batch."member_id"
+                    AND (l."xp" <> 0 OR l."level" <> 0)
+                RETURNING l."member_id", l."xp"
+            )
+            SELECT batch."member_id", updated."xp"
+            FROM batch LEFT JOIN updated USING ("member_id")
+            ORDER BY batch."member_id"
+            """,
+        )
+        return [int(row["member_id"]) for row in updated]
 
     async def toggle_blacklist(self, member_id: int, guild_id: int) -> bool:
         """
@@ -222,6 +466,7 @@ class LevelsController:
             levels = await self.levels_table.find_first(where={"member_id": member_id, "guild_id": guild_id})
             if levels is None:
                 await self.levels_table.create(data={"member_id": member_id, "guild_id": guild_id, "blacklisted": True})
+                rank_index.remove_member(guild_id, member_id)
                 return True
             new_blacklist_status = not levels.blacklisted
             await self.levels_table.update(
@@ -232,6 +477,11 @@ class LevelsController:
             logger.error(f"Error toggling blacklist for member_id: {member_id}, guild_id: {guild_id}: {e}")
             return False
         else:
+            # Blacklisted members drop off the leaderboard until they are unblacklisted
+            if new_blacklist_status:
+                rank_index.remove_member(guild_id, member_id)
+            else:
+                rank_index.update(guild_id, member_id, levels.xp)
             return new_blacklist_status
 
     async def reset_xp(self, member_id: int, guild_id: int) -> None:
@@ -251,9 +501,12 @@ class LevelsController:
         """
         await self.ensure_guild_exists(guild_id)
         try:
-            await self.levels_table.update(
+            record = await self.levels_table.update(
                 where={"member_id_guild_id": {"member_id": member_id, "guild_id": guild_id}},
                 data={"xp": 0.0, "level": 0},
             )
         except Exception as e:
             logger.error(f"Error resetting XP for member_id: {member_id}, guild_id: {guild_id}: {e}")
+        else:
+            if record is not None and not record.blacklisted:
+                rank_index.update(guild_id, member_id, 0.0)
@@ -1,6 +1,7 @@
 from datetime import UTC, datetime
 
 from prisma.models import Guild, Reminder
+from prisma.types import ReminderWhereInput
 from tux.database.client import db
 
 
@@ -21,9 +22,14 @@ class ReminderController:
     async def get_reminder_by_id(self, reminder_id: int) -> Reminder | None:
         return await self.table.find_first(where={"reminder_id": reminder_id})
 
-    async def get_unsent_reminders(self) -> list[Reminder]:
+    async def get_unsent_reminders(self, guild_ids: list[int] | None = None) -> list[Reminder]:
         now = datetime.now(UTC)
-        return await self.table.find_many(where={"reminder_sent": False, "reminder_expires_at": {"lte": now}})
+        where: ReminderWhereInput = {"reminder_sent": False, "reminder_expires_at": {"lte": now}}
+
+        if guild_ids is not None:
+            where["guild_id"] = {"in": guild_ids}
+
+        return await self.table.find_many(where=where)
 
     async def insert_reminder(
         self,
@@ -0,0 +1,103 @@
+import datetime
+
+from prisma.models import Guild, RoleSnapshot
+from tux.database.client import db
+
+
+class RoleSnapshotController:
+    def __init__(self) -> None:
+        self.table = db.rolesnapshot
+        self.guild_table = db.guild
+
+    async def ensure_guild_exists(self, guild_id: int) -> Guild:
+        guild = await self.guild_table.find_first(where={"guild_id": guild_id})
+
+        if guild is None:
+            return await self.guild_table.create(data={"guild_id": guild_id})
+
+        return guild
+
+    async def insert_snapshots(
+        self,
+        guild_id: int,
+        role_counts: dict[int, int],
+        snapshot_date: datetime.datetime,
+    ) -> int:
+        """
+        Store the member count of each role in a guild for a day, skipping roles already stored for that day.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        role_counts : dict[int, int]
+            A mapping of role ID to member count.
+        snapshot_date : datetime.datetime
+            The day of the snapshot.
+
+        Returns
+        -------
+        int
+            The number of snapshots created.
+        """
+        await self.ensure_guild_exists(guild_id)
+
+        return await self.table.create_many(
+            data=[
+                {
+                    "guild_id": guild_id,
+                    "role_id": role_id,
+                    "member_count": member_count,
+                    "snapshot_date": snapshot_date,
+                }
+                for role_id, member_count in role_counts.items()
+            ],
+            skip_duplicates=True,
+        )
+
+    async def get_snapshots_on(self, guild_id: int, snapshot_date: datetime.datetime) -> dict[int, int]:
+        """
+        Get the member count of each role in a guild on a given day.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        snapshot_date : datetime.datetime
+            The day of the snapshot.
+
+        Returns
+        -------
+        dict[int, int]
+            A mapping of role ID to member count.
+        """
+        snapshots = await self.table.find_many(where={"guild_id": guild_id, "snapshot_date": snapshot_date})
+        return {snapshot.role_id: snapshot.member_count for snapshot in snapshots}
+
+    async def get_role_history(
+        self,
+        guild_id: int,
+        role_id: int,
+        since: datetime.datetime,
+    ) -> list[RoleSnapshot]:
+        """
+        Get the daily snapshots of a role since a given day, oldest first.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        role_id : int
+            The ID of the role.
+        since : datetime.datetime
+            The first day to include.
+
+        Returns
+        -------
+        list[RoleSnapshot]
+            The snapshots of the role.
+        """
+        return await self.table.find_many(
+            where={"guild_id": guild_id, "role_id": role_id, "snapshot_date": {"gte": since}},
+            order={"snapshot_date": "asc"},
+        )
@@ -26,6 +26,16 @@ class SnippetController:
             order={"snippet_created_at": "desc" if newestfirst else "asc"},
         )
 
+    async def get_all_snippets_by_guild_id_sorted(self, guild_id: int, newestfirst: bool = True) -> list[Snippet]:
+        return await self.table.find_many(
+            where={"guild_id": guild_id},
+            order={"snippet_created_at": "desc" if newestfirst else "asc"},
+        )
+
+    async def get_snippet_names_by_guild_id(self, guild_id: int) -> list[str]:
+        snippets = await self.table.find_many(where={"guild_id": guild_id})
+        return [snippet.snippet_name for snippet in snippets]
+
     async def get_snippet_by_name(self, snippet_name: str) -> Snippet | None:
         return await self.table.find_first(where={"snippet_name": {"contains": snippet_name, "mode": "insensitive"}})
 
@@ -38,6 +48,15 @@ class SnippetController:
             where={"snippet_name": {"equals": snippet_name, "mode": "insensitive"}, "guild_id": guild_id},
         )
 
+    async def get_snippet_by_exact_name_and_guild_id(
+        self,
+        snippet_name: str,
+        guild_id: int,
+    ) -> Snippet | None:
+        return await self.table.find_unique(
+            where={"snippet_name_guild_id": {"snippet_name": snippet_name, "guild_id": guild_id}},
+        )
+
     async def create_snippet(
         self,
         snippet_name: str,
@@ -67,16 +86,20 @@ class SnippetController:
             data={"snippet_content": snippet_content},
         )
 
-    async def increment_snippet_uses(self, snippet_id: int) -> Snippet | None:
-        snippet = await self.table.find_first(where={"snippet_id": snippet_id})
-        if snippet is None:
-            return None
-
-        return await self.table.update(
+    async def increment_snippet_uses(self, snippet_id: int, amount: int = 1) -> None:
+        await self.table.update_many(
             where={"snippet_id": snippet_id},
-            data={"uses": snippet.uses + 1},
+            data={"uses": {"increment": amount}},
         )
 
+    async def increment_snippet_uses_batch(self, uses: dict[int, int]) -> None:
+        async with db.batch_() as batcher:
+            for snippet_id, amount in uses.items():
+                batcher.snippet.update_many(
+                    where={"snippet_id": snippet_id},
+                    data={"uses": {"increment": amount}},
+                )
+
     async def lock_snippet_by_id(self, snippet_id: int) -> Snippet | None:
         return await self.table.update(
             where={"snippet_id": snippet_id},
@@ -0,0 +1,36 @@
+from prisma.models import Guild, TempVoiceChannel
+from tux.database.client import db
+
+
+class TempVcController:
+    def __init__(self) -> None:
+        self.table = db.tempvoicechannel
+        self.guild_table = db.guild
+
+    async def ensure_guild_exists(self, guild_id: int) -> Guild:
+        guild = await self.guild_table.find_first(where={"guild_id": guild_id})
+
+        if guild is None:
+            return await self.guild_table.create(data={"guild_id": guild_id})
+
+        return guild
+
+    async def get_all_temp_vcs_by_guild_id(self, guild_id: int) -> list[TempVoiceChannel]:
+        return await self.table.find_many(where={"guild_id": guild_id})
+
+    async def set_temp_vc(self, channel_id: int, owner_id: int, guild_id: int) -> TempVoiceChannel:
+        await self.ensure_guild_exists(guild_id)
+
+        # An owner has at most one channel, so replace any stale record first
+        await self.table.delete_many(where={"owner_id": owner_id, "guild_id": guild_id})
+
+        return await self.table.create(
+            data={
+                "channel_id": channel_id,
+                "owner_id": owner_id,
+                "guild_id": guild_id,
+            },
+        )
+
+    async def delete_temp_vcs_by_channel_ids(self, channel_ids: list[int]) -> int:
+        return await self.table.delete_many(where={"channel_id": {"in": channel_ids}})
@@ -0,0 +1,56 @@
+from prisma.models import Guild, XpRoleSync
+from tux.database.client import db
+
+
+class XpRoleSyncController:
+    def __init__(self) -> None:
+        self.table = db.xprolesync
+        self.guild_table = db.guild
+
+    async def ensure_guild_exists(self, guild_id: int) -> Guild:
+        guild = await self.guild_table.find_first(where={"guild_id": guild_id})
+
+        if guild is None:
+            return await self.guild_table.create(data={"guild_id": guild_id})
+
+        return guild
+
+    async def get_sync(self, guild_id: int) -> XpRoleSync | None:
+        """
+        Get the progress of a guild's XP role sync.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        XpRoleSync | None
+            The progress of the last sync, or None if the guild was never synced.
+        """
+        return await self.table.find_unique(where={"guild_id": guild_id})
+
+    async def save_progress(self, guild_id: int, roles_hash: str, last_member_id: int, completed: bool) -> None:
+        """
+        Store how far a guild's XP role sync got.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        roles_hash : str
+            The hash of the XP role settings the sync applies.
+        last_member_id : int
+            The ID of the last member checked; members are checked in ID order.
+        completed : bool
+            Whether every member has been checked.
+        """
+        await self.ensure_guild_exists(guild_id)
+
+        data = {"roles_hash": roles_hash, "last_member_id": last_member_id, "completed": completed}
+
+        await self.table.upsert(
+            where={"guild_id": guild_id},
+            data={"create": {"guild_id": guild_id, **data}, "update": data},
+        )
@@ -0,0 +1,29 @@
+import asyncio
+
+from loguru import logger
+
+from tux.database.client import db
+from tux.database.controllers.case_search import CaseSearchController
+
+
+async def main() -> None:
+    """
+    Turn the full-text search columns `prisma db push` creates into generated columns and index them.
+
+    The first run after a push rewrites the case and note tables under an ACCESS EXCLUSIVE lock, blocking
+    moderation commands until it is done, so run it at a quiet time. Later runs do nothing.
+    """
+
+    await db.connect()
+
+    try:
+        await CaseSearchController().ensure_search_columns()
+
+    finally:
+        await db.disconnect()
+
+    logger.info("Case search columns are set up.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+import contextlib
+import time
+from collections import Counter
+from collections.abc import Generator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+from tux.utils.config import CONFIG
+from tux.utils.metrics import DB_BUDGET_OVERRUNS, DB_QUERIES, DB_QUERY_TIME, DB_SLOW_QUERIES
+
+
+@dataclass
+class QueryStats:
+    """
+    Aggregate timings for a single kind of query, e.g. `Snippet.find_first`.
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def average_time(self) -> float:
+        return self.total_time / self.count if self.count else 0.0
+
+    def add(self, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        self.max_time = max(self.max_time, duration)
+
+
+@dataclass
+class QueryTrace:
+    """
+    The queries issued while handling a single gateway event or command.
+    """
+
+    name: str
+    started_at: float = field(default_factory=time.perf_counter)
+    queries: list[tuple[str, float]] = field(default_factory=list[tuple[str, float]])
+
+    @property
+    def query_count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def query_time(self) -> float:
+        return sum(duration for _, duration in self.queries)
+
+    def repeated_queries(self, threshold: int) -> dict[str, int]:
+        """
+        Get the queries issued at least `threshold` times in this trace, a sign of an N+1 pattern.
+
+        Parameters
+        ----------
+        threshold : int
+            The minimum number of repetitions.
+
+        Returns
+        -------
+        dict[str, int]
+            A mapping of query name to repetition count.
+        """
+        counts = Counter(query for query, _ in self.queries)
+        return {query: count for query, count in counts.items() if count >= threshold}
+
+
+# The trace of the event or command currently running in this task
+current_trace: ContextVar[QueryTrace | None] = ContextVar("current_trace", default=None)
+
+
+class QueryTracer:
+    """
+    Records the latency of every database query and attributes it to the running event or command.
+
+    Traces that exceed the per-event query budget or repeat the same query too often are logged,
+    as are queries slower than the slow query threshold.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold: float = CONFIG.SLOW_QUERY_MS / 1000,
+        query_budget: int = CONFIG.EVENT_QUERY_BUDGET,
+        repeat_threshold: int = CONFIG.N_PLUS_ONE_THRESHOLD,
+    ) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.query_budget = query_budget
+        self.repeat_threshold = repeat_threshold
+
+        # Query name -> timings
+        self.queries: dict[str, QueryStats] = {}
+        # Event or command name -> number of queries issued across all traces
+        self.sources: Counter[str] = Counter()
+        self.slow_queries = 0
+        self.budget_overruns = 0
+        self.repeated_query_warnings = 0
+
+    def record(self, query: str, duration: float) -> None:
+        """
+        Record a finished query.
+
+        Parameters
+        ----------
+        query : str
+            The name of the query, e.g. `Snippet.find_first`.
+        duration : float
+            The time the query took, in seconds.
+        """
+        self.queries.setdefault(query, QueryStats()).add(duration)
+        DB_QUERIES.inc(query=query)
+        DB_QUERY_TIME.inc(duration, query=query)
+
+        trace = current_trace.get()
+
+        if trace is not None:
+            trace.queries.append((query, duration))
+
+        self.sources[trace.name if trace else "untraced"] += 1
+
+        if duration >= self.slow_query_threshold:
+            self.slow_queries += 1
+            DB_SLOW_QUERIES.inc()
+            logger.warning(
+                f"Slow query {query} took {duration * 1000:.1f}ms in {trace.name if trace else 'untraced code'}.",
+            )
+
+    def finish(self, trace: QueryTrace) -> None:
+        """
+        Check a finished trace against the query budget and for repeated queries.
+
+        Parameters
+        ----------
+        trace : QueryTrace
+            The finished trace.
+        """
+        if trace.query_count > self.query_budget:
+            self.budget_overruns += 1
+            DB_BUDGET_OVERRUNS.inc()
+            logger.warning(
+                f"{trace.name} issued {trace.query_count} queries (budget {self.query_budget}) taking {trace.query_time * 1000:.1f}ms.",
+            )
+
+        if repeated := trace.repeated_queries(self.repeat_threshold):
+            self.repeated_query_warnings += 1
+            details = ", ".join(f"{query} x{count}" for query, count in repeated.items())
+            logger.warning(f"Possible N+1 queries in {trace.name}: {details}")
+
+    @contextlib.contextmanager
+    def trace(self, name: str) -> Generator[QueryTrace, None, None]:
+        """
+        Attribute the queries issued inside the block to `name`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the event or command, e.g. `event:Afk.check_afk` or `command:snippet`.
+
+        Yields
+        ------
+        QueryTrace
+            The trace collecting the queries.
+        """
+        trace = QueryTrace(name)
+        token = current_trace.set(trace)
+
+        try:
+            yield trace
+
+        finally:
+            current_trace.reset(token)
+            self.finish(trace)
+
+    def reset(self) -> None:
+        self.queries.clear()
+        self.sources.clear()
+        self.slow_queries = 0
+        self.budget_overruns = 0
+        self.repeated_query_warnings = 0
+
+
+query_tracer = QueryTracer()
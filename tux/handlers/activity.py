@@ -5,6 +5,7 @@ import discord
 from discord.ext import commands
 
 from tux.bot import Tux
+from tux.utils.guild_stats import guild_stats
 
 
 class ActivityHandler(commands.Cog):
@@ -44,7 +45,7 @@ class ActivityHandler(commands.Cog):
         return activities
 
     def _get_member_count(self) -> int:
-        return sum(guild.member_count for guild in self.bot.guilds if guild.member_count is not None)
+        return guild_stats.total_members
 
     async def run(self) -> NoReturn:
         while True:
@@ -0,0 +1,51 @@
+from typing import Any
+
+from discord.ext import commands, tasks
+from loguru import logger
+
+from tux.bot import Tux
+from tux.cluster.bus import cluster_bus
+from tux.utils.config import CONFIG
+from tux.utils.guild_stats import guild_stats
+
+
+class ClusterHandler(commands.Cog):
+    """
+    Connects this process to the cluster bus when it runs a slice of the shards, and shares the
+    statistics that are aggregated across processes.
+
+    Per-guild caches need no coordination, since a guild's events and commands all arrive on one shard.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+
+    async def cog_load(self) -> None:
+        if CONFIG.SHARD_IDS is None:
+            return
+
+        logger.info(f"Running cluster {CONFIG.CLUSTER_ID} with shards {CONFIG.SHARD_IDS} of {CONFIG.SHARD_COUNT}.")
+
+        cluster_bus.subscribe("stats", self.on_stats)
+        cluster_bus.start(CONFIG.CLUSTER_SOCKET_PATH, CONFIG.CLUSTER_ID)
+        self.publish_stats.start()
+
+    async def cog_unload(self) -> None:
+        self.publish_stats.cancel()
+        cluster_bus.unsubscribe("stats", self.on_stats)
+        await cluster_bus.stop()
+
+    def on_stats(self, data: dict[str, Any]) -> None:
+        guild_stats.remote_members[data["cluster_id"]] = data["members"]
+
+    @tasks.loop(minutes=1)
+    async def publish_stats(self) -> None:
+        await cluster_bus.publish("stats", {"cluster_id": CONFIG.CLUSTER_ID, "members": guild_stats.local_members})
+
+    @publish_stats.before_loop
+    async def before_publish_stats(self) -> None:
+        await self.bot.wait_until_ready()
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(ClusterHandler(bot))
@@ -45,18 +45,9 @@ class EventHandler(commands.Cog):
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
         flag_list = ["🏳️‍🌈", "🏳️‍⚧️"]
 
-        user = self.bot.get_user(payload.user_id)
-        if user is None or user.bot:
-            return
-
-        if payload.guild_id is None:
-            return
-        guild = self.bot.get_guild(payload.guild_id)
-        if guild is None:
-            return
-
-        member = guild.get_member(payload.user_id)
-        if member is None:
+        # Guild reactions carry the reacting member, so this works whether or not the member is cached
+        member = payload.member
+        if member is None or member.bot:
             return
 
         channel = self.bot.get_channel(payload.channel_id)
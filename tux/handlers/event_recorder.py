@@ -0,0 +1,153 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import discord
+from discord.ext import commands, tasks
+from loguru import logger
+
+from tux.bot import Tux
+from tux.loadtest.recording import Anonymizer, RecordingWriter
+from tux.utils.config import CONFIG
+
+
+def _guild_snapshot(guild: discord.Guild) -> dict[str, Any]:
+    """
+    Build a GUILD_CREATE payload from the cache, with every chunked member.
+
+    Parameters
+    ----------
+    guild : discord.Guild
+        The guild to snapshot.
+
+    Returns
+    -------
+    dict[str, Any]
+        The guild payload.
+    """
+
+    return {
+        "id": str(guild.id),
+        "name": guild.name,
+        "owner_id": str(guild.owner_id),
+        "member_count": guild.member_count,
+        "premium_subscription_count": guild.premium_subscription_count,
+        "features": [],
+        "emojis": [],
+        "stickers": [],
+        "roles": [
+            {
+                "id": str(role.id),
+                "name": role.name,
+                "permissions": str(role.permissions.value),
+                "position": role.position,
+                "color": role.color.value,
+            }
+            for role in guild.roles
+        ],
+        "channels": [
+            {
+                "id": str(channel.id),
+                "type": channel.type.value,
+                "name": channel.name,
+                "position": channel.position,
+                "parent_id": str(channel.category_id) if channel.category_id else None,
+                "bitrate": getattr(channel, "bitrate", 64000),
+                "user_limit": getattr(channel, "user_limit", 0),
+            }
+            for channel in guild.channels
+        ],
+        "members": [
+            {
+                "user": {
+                    "id": str(member.id),
+                    "username": member.name,
+                    "discriminator": "0",
+                    "bot": member.bot,
+                },
+                "roles": [str(role_id) for role_id in member._roles],  # pyright: ignore[reportPrivateUsage]
+                "joined_at": member.joined_at.isoformat() if member.joined_at else None,
+                "deaf": False,
+                "mute": False,
+                "flags": 0,
+            }
+            for member in guild.members
+        ],
+    }
+
+
+class EventRecorder(commands.Cog):
+    """
+    Records anonymized gateway events for replay with the load test harness (`python -m tux.loadtest`).
+
+    Guilds are snapshotted from the cache when the bot is ready, then the configured event types are
+    recorded with their offsets. Recording needs raw gateway events, so the bot is started with debug
+    events enabled when it is on.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.event_types = set(CONFIG.EVENT_RECORDING_EVENTS)
+        self.anonymizer = Anonymizer(prefixes=(CONFIG.DEFAULT_PREFIX,))
+        self.writer: RecordingWriter | None = None
+        self.buffer: list[dict[str, Any]] = []
+        self.started_at = time.monotonic()
+
+    async def cog_load(self) -> None:
+        if not CONFIG.EVENT_RECORDING_ENABLED:
+            return
+
+        path = Path(CONFIG.EVENT_RECORDING_PATH.format(timestamp=int(time.time())))
+        self.writer = RecordingWriter(path)
+        self.flush_events.start()
+        logger.info(f"Recording gateway events to {path}")
+
+    async def cog_unload(self) -> None:
+        self.flush_events.cancel()
+
+        if self.writer is not None:
+            await self._flush()
+            self.writer.close()
+
+    def _record(self, event_type: str, data: dict[str, Any]) -> None:
+        self.buffer.append({"ts": round(time.monotonic() - self.started_at, 4), "t": event_type, "d": data})
+
+    async def _flush(self) -> None:
+        if self.writer is None or not self.buffer:
+            return
+
+        events, self.buffer = self.buffer, []
+        # Anonymizing and compressing are CPU bound, so keep them off the event loop
+        await asyncio.to_thread(self._write, events)
+
+    def _write(self, events: list[dict[str, Any]]) -> None:
+        if self.writer is not None:
+            self.writer.write([self.anonymizer(event) for event in events])
+
+    @tasks.loop(seconds=5)
+    async def flush_events(self) -> None:
+        await self._flush()
+
+    @commands.Cog.listener()
+    async def on_ready(self) -> None:
+        if self.writer is None:
+            return
+
+        for guild in self.bot.guilds:
+            self._record("GUILD_CREATE", _guild_snapshot(guild))
+
+    @commands.Cog.listener()
+    async def on_socket_raw_receive(self, msg: str) -> None:
+        if self.writer is None:
+            return
+
+        payload = json.loads(msg)
+
+        if payload.get("op") == 0 and payload.get("t") in self.event_types:
+            self._record(payload["t"], payload["d"])
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(EventRecorder(bot))
@@ -0,0 +1,170 @@
+import asyncio
+import logging
+import time
+from typing import Any
+
+import discord.http
+from aiohttp import web
+from discord.ext import commands, tasks
+from loguru import logger
+
+from tux.bot import Tux
+from tux.database.client import db
+from tux.utils.config import CONFIG
+from tux.utils.metrics import metrics
+
+GATEWAY_LATENCY = metrics.gauge("tux_gateway_latency_seconds", "Gateway heartbeat latency.")
+SHARD_LATENCY = metrics.gauge("tux_shard_latency_seconds", "Gateway heartbeat latency per shard.", ["shard"])
+EVENT_LOOP_LAG = metrics.gauge("tux_event_loop_lag_seconds", "Delay of the last event loop wakeup.")
+RATE_LIMIT_WAIT = metrics.counter(
+    "tux_rate_limit_wait_seconds_total",
+    "Time spent waiting on HTTP rate limits, for exhausted buckets or after a 429.",
+    ["kind"],
+)
+RATE_LIMIT_HITS = metrics.counter(
+    "tux_rate_limit_hits_total",
+    "HTTP requests that waited on a rate limit, for exhausted buckets or after a 429.",
+    ["kind"],
+)
+DB_POOL = metrics.gauge("tux_db_pool", "Prisma connection pool metrics.", ["metric"])
+SNIPPET_CACHE_HIT_RATIO = metrics.gauge("tux_snippet_cache_hit_ratio", "Snippet cache hit ratio.")
+SNIPPET_CACHE_ENTRIES = metrics.gauge("tux_snippet_cache_entries", "Snippets held in the cache.")
+
+
+# Waits on a bucket shorter than this, in seconds, are scheduling noise rather than rate limiting
+MIN_BUCKET_WAIT = 0.001
+# discord.py's bucket class, put back when the handler is unloaded
+UNTIMED_RATELIMIT = discord.http.Ratelimit
+
+
+class TimedRatelimit(UNTIMED_RATELIMIT):
+    """
+    A discord.py rate limit bucket that counts the time requests wait on it.
+
+    discord.py waits for exhausted buckets before sending a request, and after one until the bucket resets,
+    logging these waits at DEBUG only. They are most of the time spent on rate limits, since they are what
+    keeps the bot from getting 429s.
+    """
+
+    async def acquire(self) -> None:
+        start = time.perf_counter()
+        await super().acquire()
+        self.record_wait(time.perf_counter() - start)
+
+    async def __aexit__(self, *args: Any) -> None:
+        start = time.perf_counter()
+        await super().__aexit__(*args)
+        self.record_wait(time.perf_counter() - start)
+
+    @staticmethod
+    def record_wait(waited: float) -> None:
+        if waited >= MIN_BUCKET_WAIT:
+            RATE_LIMIT_HITS.inc(kind="bucket")
+            RATE_LIMIT_WAIT.inc(waited, kind="bucket")
+
+
+class RateLimitLogHandler(logging.Handler):
+    """
+    Counts the time discord.py spends sleeping after 429 responses, from the warnings it logs; the sleep
+    happens inside the request, where the bucket does not see it.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = str(record.msg)
+
+        if "Retrying in" not in message or not record.args or not isinstance(record.args, tuple):
+            return
+
+        # The retry delay is always the last argument of discord.py's rate limit messages
+        retry_after = record.args[-1]
+
+        if isinstance(retry_after, int | float):
+            RATE_LIMIT_HITS.inc(kind="429")
+            RATE_LIMIT_WAIT.inc(float(retry_after), kind="429")
+
+
+class MetricsHandler(commands.Cog):
+    """
+    Serves the metrics registry over HTTP in the Prometheus text format.
+    Cheap gauges are refreshed when scraped; event loop lag is sampled in the background.
+    """
+
+    def __init__(self, bot: Tux) -> None:
+        self.bot = bot
+        self.runner: web.AppRunner | None = None
+        self.rate_limit_handler = RateLimitLogHandler()
+        self.lag_interval = 1.0
+        # Each process of a sharded deployment serves its own metrics on the next port up
+        self.port = CONFIG.METRICS_PORT + CONFIG.CLUSTER_ID
+
+    async def cog_load(self) -> None:
+        if not CONFIG.METRICS_ENABLED:
+            return
+
+        logging.getLogger("discord.http").addHandler(self.rate_limit_handler)
+        # Buckets are created on first use of a route, so every bucket created from now on is timed
+        discord.http.Ratelimit = TimedRatelimit
+        self.measure_loop_lag.start()
+
+        app = web.Application()
+        app.router.add_get("/metrics", self.handle_metrics)
+
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+
+        try:
+            await web.TCPSite(self.runner, CONFIG.METRICS_HOST, self.port).start()
+
+        except OSError as e:
+            logger.error(f"Failed to start the metrics server on {CONFIG.METRICS_HOST}:{self.port}: {e}")
+            return
+
+        logger.info(f"Serving metrics on http://{CONFIG.METRICS_HOST}:{self.port}/metrics")
+
+    async def cog_unload(self) -> None:
+        logging.getLogger("discord.http").removeHandler(self.rate_limit_handler)
+        discord.http.Ratelimit = UNTIMED_RATELIMIT
+        self.measure_loop_lag.cancel()
+
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    @tasks.loop(seconds=5)
+    async def measure_loop_lag(self) -> None:
+        start = time.perf_counter()
+        await asyncio.sleep(self.lag_interval)
+        EVENT_LOOP_LAG.set(max(time.perf_counter() - start - self.lag_interval, 0.0))
+
+    async def collect(self) -> None:
+        """
+        Refresh the gauges that are read from other components at scrape time.
+        """
+
+        if self.bot.is_ready():
+            GATEWAY_LATENCY.set(self.bot.latency)
+
+            for shard_id, latency in self.bot.latencies:
+                SHARD_LATENCY.set(latency, shard=str(shard_id))
+
+        try:
+            prisma_metrics = await db.get_metrics()
+
+        except Exception as e:
+            logger.trace(f"Prisma metrics are unavailable: {e}")
+
+        else:
+            for metric in [*prisma_metrics.counters, *prisma_metrics.gauges]:
+                DB_POOL.set(metric.value, metric=metric.key)
+
+        if (snippets := self.bot.get_cog("Snippets")) and (cache := getattr(snippets, "cache", None)) is not None:
+            stats = cache.stats()
+            SNIPPET_CACHE_HIT_RATIO.set(stats["hit_ratio"])
+            SNIPPET_CACHE_ENTRIES.set(stats["entries"])
+
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        await self.collect()
+        return web.Response(text=metrics.render(), content_type="text/plain", charset="utf-8")
+
+
+async def setup(bot: Tux) -> None:
+    await bot.add_cog(MetricsHandler(bot))
@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from tux.database.client import LOCAL_HOSTS
+from tux.loadtest.fixtures import SYNTHETIC_EVENTS, SyntheticGuild
+from tux.loadtest.harness import LoadTestHarness, at_rate, paced
+from tux.loadtest.recording import read_recording
+from tux.main import get_prefix
+from tux.utils.config import CONFIG
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    """
+    Parse an event mix such as `message=0.8,reaction=0.1,join=0.05,voice=0.05`.
+    """
+
+    mix: dict[str, float] = {}
+
+    for part in value.split(","):
+        kind, _, weight = part.partition("=")
+
+        if kind not in SYNTHETIC_EVENTS:
+            msg = f"Unknown event kind {kind!r}, expected one of {', '.join(SYNTHETIC_EVENTS)}."
+            raise argparse.ArgumentTypeError(msg)
+
+        mix[kind] = float(weight or 1)
+
+    return mix
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m tux.loadtest",
+        description="Replay recorded or synthetic gateway events into Tux with a stubbed HTTP layer.",
+    )
+    parser.add_argument("--recording", type=Path, help="A recording to replay instead of synthetic events.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Recording replay speed; 0 is as fast as possible.")
+    parser.add_argument("--rate", type=float, default=100.0, help="Synthetic events per second.")
+    parser.add_argument("--duration", type=float, default=30.0, help="Synthetic run length in seconds.")
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default="message=0.85,reaction=0.1,join=0.02,voice=0.03",
+        help="Relative weights of synthetic event kinds.",
+    )
+    parser.add_argument("--members", type=int, default=1000, help="Members in the synthetic guild.")
+    parser.add_argument("--seed", type=int, help="Random seed for synthetic events.")
+    parser.add_argument("--http-latency", type=float, default=0.0, help="Simulated HTTP latency in seconds.")
+    parser.add_argument("--allow-remote", action="store_true", help="Allow replaying against a non-local database.")
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_args()
+
+    # The cogs write to the configured database as they handle the replayed events
+    host = urlparse(CONFIG.DATABASE_URL).hostname
+    if host not in LOCAL_HOSTS and not args.allow_remote:
+        logger.critical(f"Refusing to replay events against the database at {host}; pass --allow-remote to override.")
+        return 2
+
+    harness = LoadTestHarness(get_prefix, args.http_latency)
+
+    try:
+        if args.recording:
+            events = list(read_recording(args.recording))
+
+            await harness.start(event["d"] for event in events if event["t"] == "GUILD_CREATE")
+            report = await harness.run(
+                paced(
+                    ((event["ts"], event["t"], event["d"]) for event in events if event["t"] != "GUILD_CREATE"),
+                    args.speed,
+                ),
+            )
+
+        else:
+            guild = SyntheticGuild(members=args.members, prefix=CONFIG.DEFAULT_PREFIX, seed=args.seed)
+
+            await harness.start([guild.guild_payload()])
+            report = await harness.run(at_rate(guild.events(args.mix), args.rate, args.duration))
+
+    finally:
+        await harness.close()
+
+    logger.info(f"Load test finished:\n{report.format()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
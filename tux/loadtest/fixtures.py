@@ -0,0 +1,244 @@
+import itertools
+import random
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from typing import Any
+
+# Discord's epoch, in milliseconds
+DISCORD_EPOCH = 1420070400000
+
+# Gateway event types the synthetic generator produces, by name used on the command line
+SYNTHETIC_EVENTS: dict[str, str] = {
+    "message": "MESSAGE_CREATE",
+    "reaction": "MESSAGE_REACTION_ADD",
+    "join": "GUILD_MEMBER_ADD",
+    "voice": "VOICE_STATE_UPDATE",
+}
+
+_WORDS = ["linux", "kernel", "arch", "btw", "help", "debian", "nixos", "vim", "emacs", "rust", "python", "why", "does"]
+
+
+class SnowflakeFactory:
+    """
+    Generates unique, increasing snowflakes with a current timestamp.
+    """
+
+    def __init__(self) -> None:
+        self.counter = itertools.count()
+
+    def __call__(self) -> int:
+        timestamp = int(datetime.now(UTC).timestamp() * 1000) - DISCORD_EPOCH
+        return (timestamp << 22) | (next(self.counter) & 0x3FFFFF)
+
+
+def user_payload(user_id: int, bot: bool = False) -> dict[str, Any]:
+    return {
+        "id": str(user_id),
+        "username": f"user{user_id % 100000}",
+        "discriminator": "0",
+        "global_name": None,
+        "avatar": None,
+        "bot": bot,
+    }
+
+
+def member_payload(user_id: int, role_ids: list[int], bot: bool = False) -> dict[str, Any]:
+    return {
+        "user": user_payload(user_id, bot),
+        "roles": [str(role_id) for role_id in role_ids],
+        "joined_at": datetime.now(UTC).isoformat(),
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+class SyntheticGuild:
+    """
+    A synthetic guild with text and voice channels, roles and members, and generators for its gateway events.
+
+    Parameters
+    ----------
+    members : int
+        The number of members to create.
+    text_channels : int
+        The number of text channels to create.
+    voice_channels : int
+        The number of voice channels to create.
+    roles : int
+        The number of roles to create, besides @everyone.
+    prefix : str
+        The command prefix used for the share of messages that invoke commands.
+    seed : int | None
+        The random seed, for reproducible event streams.
+    """
+
+    def __init__(
+        self,
+        members: int = 1000,
+        text_channels: int = 20,
+        voice_channels: int = 5,
+        roles: int = 30,
+        prefix: str = "$",
+        seed: int | None = None,
+    ) -> None:
+        self.snowflake = SnowflakeFactory()
+        self.random = random.Random(seed)
+        self.prefix = prefix
+
+        self.id = self.snowflake()
+        self.role_ids = [self.snowflake() for _ in range(roles)]
+        self.text_channel_ids = [self.snowflake() for _ in range(text_channels)]
+        self.voice_channel_ids = [self.snowflake() for _ in range(voice_channels)]
+        self.member_ids = [self.snowflake() for _ in range(members)]
+        # Message IDs sent so far, for reactions
+        self.message_ids: list[tuple[int, int]] = []
+
+    def random_roles(self) -> list[int]:
+        return self.random.sample(self.role_ids, k=min(len(self.role_ids), self.random.randint(0, 3)))
+
+    def guild_payload(self) -> dict[str, Any]:
+        """
+        Build a GUILD_CREATE payload for the guild, including all members.
+
+        Returns
+        -------
+        dict[str, Any]
+            The guild payload.
+        """
+
+        everyone = {"id": str(self.id), "name": "@everyone", "permissions": "1071698660929", "position": 0}
+        roles = [
+            {"id": str(role_id), "name": f"role-{index}", "permissions": "0", "position": index + 1}
+            for index, role_id in enumerate(self.role_ids)
+        ]
+        text_channels = [
+            {"id": str(channel_id), "type": 0, "name": f"text-{index}", "position": index}
+            for index, channel_id in enumerate(self.text_channel_ids)
+        ]
+        voice_channels = [
+            {
+                "id": str(channel_id),
+                "type": 2,
+                "name": f"voice-{index}",
+                "position": index,
+                "bitrate": 64000,
+                "user_limit": 0,
+            }
+            for index, channel_id in enumerate(self.voice_channel_ids)
+        ]
+
+        return {
+            "id": str(self.id),
+            "name": "Load Test",
+            "owner_id": str(self.member_ids[0]),
+            "member_count": len(self.member_ids),
+            "roles": [everyone, *roles],
+            "channels": [*text_channels, *voice_channels],
+            "members": [member_payload(member_id, self.random_roles()) for member_id in self.member_ids],
+            "emojis": [],
+            "stickers": [],
+            "features": [],
+            "premium_subscription_count": 0,
+        }
+
+    def message_create(self) -> dict[str, Any]:
+        channel_id = self.random.choice(self.text_channel_ids)
+        author_id = self.random.choice(self.member_ids)
+        message_id = self.snowflake()
+
+        # A small share of messages invoke commands, the rest is chatter for the message listeners
+        if self.random.random() < 0.05:
+            content = f"{self.prefix}{self.random.choice(['ping', 'help', 'level', 'snippet linux', 'afk'])}"
+        else:
+            content = " ".join(self.random.choices(_WORDS, k=self.random.randint(1, 20)))
+
+        self.message_ids.append((channel_id, message_id))
+        del self.message_ids[:-1000]
+
+        return {
+            "id": str(message_id),
+            "channel_id": str(channel_id),
+            "guild_id": str(self.id),
+            "author": user_payload(author_id),
+            "member": {"roles": [], "joined_at": datetime.now(UTC).isoformat(), "deaf": False, "mute": False},
+            "content": content,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": [],
+            "pinned": False,
+            "type": 0,
+        }
+
+    def message_reaction_add(self) -> dict[str, Any]:
+        if not self.message_ids:
+            self.message_create()
+
+        channel_id, message_id = self.random.choice(self.message_ids)
+
+        return {
+            "user_id": str(self.random.choice(self.member_ids)),
+            "channel_id": str(channel_id),
+            "message_id": str(message_id),
+            "guild_id": str(self.id),
+            "emoji": {"id": None, "name": self.random.choice(["⭐", "👍", "🐧"])},
+            "burst": False,
+            "type": 0,
+        }
+
+    def guild_member_add(self) -> dict[str, Any]:
+        member_id = self.snowflake()
+        self.member_ids.append(member_id)
+        return {**member_payload(member_id, []), "guild_id": str(self.id)}
+
+    def voice_state_update(self) -> dict[str, Any]:
+        member_id = self.random.choice(self.member_ids)
+        channel_id = self.random.choice([*self.voice_channel_ids, None])
+
+        return {
+            "guild_id": str(self.id),
+            "channel_id": str(channel_id) if channel_id else None,
+            "user_id": str(member_id),
+            "member": member_payload(member_id, []),
+            "session_id": "loadtest",
+            "deaf": False,
+            "mute": False,
+            "self_deaf": False,
+            "self_mute": False,
+            "self_video": False,
+            "suppress": False,
+            "request_to_speak_timestamp": None,
+        }
+
+    def events(self, mix: dict[str, float]) -> Iterator[tuple[str, dict[str, Any]]]:
+        """
+        Generate an endless stream of gateway events.
+
+        Parameters
+        ----------
+        mix : dict[str, float]
+            The relative weight of each event kind in `SYNTHETIC_EVENTS`.
+
+        Yields
+        ------
+        tuple[str, dict[str, Any]]
+            The gateway event type and its payload.
+        """
+
+        generators = {
+            "MESSAGE_CREATE": self.message_create,
+            "MESSAGE_REACTION_ADD": self.message_reaction_add,
+            "GUILD_MEMBER_ADD": self.guild_member_add,
+            "VOICE_STATE_UPDATE": self.voice_state_update,
+        }
+        kinds = [SYNTHETIC_EVENTS[kind] for kind in mix]
+        weights = list(mix.values())
+
+        while True:
+            event_type = self.random.choices(kinds, weights)[0]
+            yield event_type, generators[event_type]()
@@ -0,0 +1,319 @@
+import asyncio
+import time
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import discord
+import psutil
+from loguru import logger
+
+from tux.bot import Tux
+from tux.database.tracing import query_tracer
+from tux.loadtest.fixtures import user_payload
+from tux.loadtest.http import StubHTTP
+
+
+def _percentile(samples: list[float], percentile: float) -> float:
+    if not samples:
+        return 0.0
+
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percentile))]
+
+
+@dataclass
+class LoadTestReport:
+    """
+    The results of a replay.
+    """
+
+    events: int
+    duration: float
+    queries: int
+    rss_before: int
+    rss_after: int
+    errors: int
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    requests: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.events / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        all_latencies = [latency for samples in self.latencies.values() for latency in samples]
+
+        lines = [
+            f"Events:          {self.events} in {self.duration:.1f}s ({self.throughput:.1f}/s)",
+            f"Handler latency: p50 {_percentile(all_latencies, 0.5) * 1000:.2f}ms, "
+            f"p99 {_percentile(all_latencies, 0.99) * 1000:.2f}ms",
+            f"DB queries:      {self.queries} ({self.queries / max(self.events, 1):.2f} per event)",
+            f"Memory growth:   {(self.rss_after - self.rss_before) / 1024 / 1024:+.1f} MiB "
+            f"({self.rss_after / 1024 / 1024:.1f} MiB RSS)",
+            f"Handler errors:  {self.errors}",
+            "",
+            "Slowest listeners (p99):",
+        ]
+
+        slowest = sorted(self.latencies.items(), key=lambda item: _percentile(item[1], 0.99), reverse=True)
+
+        lines.extend(
+            f"  {listener}: p50 {_percentile(samples, 0.5) * 1000:.2f}ms, "
+            f"p99 {_percentile(samples, 0.99) * 1000:.2f}ms over {len(samples)} calls"
+            for listener, samples in slowest[:10]
+        )
+
+        lines.extend(["", "Stubbed HTTP requests:"])
+        lines.extend(f"  {route}: {count}" for route, count in sorted(self.requests.items(), key=lambda item: -item[1]))
+
+        return "\n".join(lines)
+
+
+class ReplayTux(Tux):
+    """
+    A `Tux` that records the latency of every listener it runs and waits for them to finish.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.listener_latencies: defaultdict[str, list[float]] = defaultdict(list)
+        self.in_flight = 0
+        self.errors = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    async def _run_event(
+        self,
+        coro: Callable[..., Coroutine[Any, Any, Any]],
+        event_name: str,
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        self.in_flight += 1
+        self.idle.clear()
+        start = time.perf_counter()
+
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+
+        finally:
+            self.listener_latencies[getattr(coro, "__qualname__", event_name)].append(time.perf_counter() - start)
+            self.in_flight -= 1
+
+            if self.in_flight == 0:
+                self.idle.set()
+
+    async def on_error(self, event_method: str, /, *args: Any, **kwargs: Any) -> None:
+        self.errors += 1
+        await super().on_error(event_method, *args, **kwargs)
+
+
+class LoadTestHarness:
+    """
+    Feeds gateway events into a real bot with a stubbed HTTP layer, connected to the configured database.
+
+    Events go through discord.py's own gateway parsers, so the cache is updated and every loaded cog's
+    listeners run exactly as they would for a live connection.
+
+    Parameters
+    ----------
+    command_prefix : Any
+        The command prefix, or prefix callable, for the bot.
+    http_latency : float
+        Simulated round trip time for stubbed HTTP requests, in seconds.
+    """
+
+    def __init__(self, command_prefix: Any, http_latency: float = 0.0) -> None:
+        self.bot = ReplayTux(
+            command_prefix=command_prefix,
+            strip_after_prefix=True,
+            case_insensitive=True,
+            intents=discord.Intents.all(),
+            allowed_mentions=discord.AllowedMentions(everyone=False),
+        )
+        self.user = user_payload(1, bot=True) | {"username": "tux"}
+        self.http = StubHTTP(self.bot.http, self.user, http_latency)
+
+    @property
+    def state(self) -> Any:
+        return self.bot._connection  # pyright: ignore[reportPrivateUsage]
+
+    async def start(self, guilds: Iterable[dict[str, Any]]) -> None:
+        """
+        Load the cogs, build the cache from guild payloads and dispatch ready.
+
+        Parameters
+        ----------
+        guilds : Iterable[dict[str, Any]]
+            GUILD_CREATE payloads for the guilds to load, including their members.
+        """
+
+        await self.bot._async_setup_hook()  # pyright: ignore[reportPrivateUsage]
+        self.http.install()
+
+        state = self.state
+        state.user = discord.ClientUser(state=state, data=self.user)  # type: ignore
+        state._users[state.user.id] = state.user
+
+        for guild in guilds:
+            state._add_guild_from_data(guild)
+
+        await self.bot.setup_task
+        self.bot.dispatch("ready")
+        self.bot._handle_ready()  # pyright: ignore[reportPrivateUsage]
+        await self.drain()
+
+        logger.info(f"Load test bot ready with {len(self.bot.guilds)} guilds and {len(self.bot.cogs)} cogs.")
+
+    async def drain(self) -> None:
+        """
+        Wait until every scheduled listener has finished.
+        """
+
+        # Listeners are scheduled as tasks, so give them a chance to start before checking
+        await asyncio.sleep(0)
+        await self.bot.idle.wait()
+
+    def feed(self, event_type: str, data: dict[str, Any]) -> bool:
+        """
+        Feed a single gateway event through discord.py's parser for it.
+
+        Parameters
+        ----------
+        event_type : str
+            The gateway event type, e.g. `MESSAGE_CREATE`.
+        data : dict[str, Any]
+            The event payload.
+
+        Returns
+        -------
+        bool
+            Whether a parser exists for the event.
+        """
+
+        if (parser := self.state.parsers.get(event_type)) is None:
+            return False
+
+        parser(data)
+        return True
+
+    async def run(self, events: AsyncIterator[tuple[str, dict[str, Any]]]) -> LoadTestReport:
+        """
+        Replay a stream of events, then wait for every listener to finish.
+
+        Parameters
+        ----------
+        events : AsyncIterator[tuple[str, dict[str, Any]]]
+            The paced stream of gateway event types and payloads.
+
+        Returns
+        -------
+        LoadTestReport
+            Throughput, latency, query and memory figures for the replay.
+        """
+
+        process = psutil.Process()
+        rss_before = process.memory_info().rss
+
+        query_tracer.reset()
+        self.bot.listener_latencies.clear()
+        self.http.requests.clear()
+        errors_before = self.bot.errors
+
+        count = 0
+        start = time.perf_counter()
+
+        async for event_type, data in events:
+            if event_type != "GUILD_CREATE" and self.feed(event_type, data):
+                count += 1
+
+        await self.drain()
+        duration = time.perf_counter() - start
+
+        return LoadTestReport(
+            events=count,
+            duration=duration,
+            queries=sum(stats.count for stats in query_tracer.queries.values()),
+            rss_before=rss_before,
+            rss_after=process.memory_info().rss,
+            errors=self.bot.errors - errors_before,
+            latencies=dict(self.bot.listener_latencies),
+            requests=dict(self.http.requests),
+        )
+
+    async def close(self) -> None:
+        await self.bot.shutdown()
+
+
+async def paced(
+    events: Iterable[tuple[float, str, dict[str, Any]]],
+    speed: float = 1.0,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Yield events at their recorded offsets, scaled by `speed`.
+
+    Parameters
+    ----------
+    events : Iterable[tuple[float, str, dict[str, Any]]]
+        The events with their offsets in seconds from the start of the stream.
+    speed : float
+        The replay speed multiplier; 0 replays as fast as possible.
+
+    Yields
+    ------
+    tuple[str, dict[str, Any]]
+        The gateway event type and payload.
+    """
+
+    start = time.perf_counter()
+    first: float | None = None
+
+    for offset, event_type, data in events:
+        first = offset if first is None else first
+        delay = (offset - first) / speed - (time.perf_counter() - start) if speed else 0
+
+        # Sleeping even when behind schedule lets the listeners of earlier events run
+        await asyncio.sleep(max(delay, 0))
+
+        yield event_type, data
+
+
+async def at_rate(
+    events: Iterable[tuple[str, dict[str, Any]]],
+    rate: float,
+    duration: float,
+) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+    """
+    Yield events at a fixed rate for a fixed time.
+
+    Parameters
+    ----------
+    events : Iterable[tuple[str, dict[str, Any]]]
+        The events to yield, typically an endless synthetic stream.
+    rate : float
+        Events per second.
+    duration : float
+        How long to yield events for, in seconds.
+
+    Yields
+    ------
+    tuple[str, dict[str, Any]]
+        The gateway event type and payload.
+    """
+
+    timed = ((index / rate, event_type, data) for index, (event_type, data) in enumerate(events))
+
+    async for event in paced(_until(timed, duration)):
+        yield event
+
+
+def _until(
+    events: Iterable[tuple[float, str, dict[str, Any]]],
+    duration: float,
+) -> Iterable[tuple[float, str, dict[str, Any]]]:
+    for event in events:
+        if event[0] >= duration:
+            return
+        yield event
@@ -0,0 +1,76 @@
+import asyncio
+import json
+from collections import Counter
+from datetime import UTC, datetime
+from typing import Any
+
+from discord.http import HTTPClient, Route
+
+from tux.loadtest.fixtures import SnowflakeFactory
+
+
+class StubHTTP:
+    """
+    Replaces the bot's HTTP requests with canned responses, so cogs can run without reaching Discord.
+
+    Message sends and edits echo a message payload back, since discord.py builds a `Message` from the response;
+    other requests get an empty response. Every request is counted by route.
+
+    Parameters
+    ----------
+    http : HTTPClient
+        The bot's HTTP client, whose `request` method is replaced.
+    author : dict[str, Any]
+        The user payload of the bot, used as the author of sent messages.
+    latency : float
+        Simulated round trip time for every request, in seconds.
+    """
+
+    def __init__(self, http: HTTPClient, author: dict[str, Any], latency: float = 0.0) -> None:
+        self.http = http
+        self.author = author
+        self.latency = latency
+        self.snowflake = SnowflakeFactory()
+        self.requests: Counter[str] = Counter()
+
+    def install(self) -> None:
+        self.http.request = self.request  # type: ignore
+
+    def _message(self, route: Route, payload: dict[str, Any], message_id: str | None = None) -> dict[str, Any]:
+        return {
+            "id": message_id or str(self.snowflake()),
+            "channel_id": str(route.channel_id),
+            "author": self.author,
+            "content": payload.get("content") or "",
+            "timestamp": datetime.now(UTC).isoformat(),
+            "edited_timestamp": None,
+            "tts": False,
+            "mention_everyone": False,
+            "mentions": [],
+            "mention_roles": [],
+            "attachments": [],
+            "embeds": payload.get("embeds") or [],
+            "components": payload.get("components") or [],
+            "pinned": False,
+            "type": 0,
+        }
+
+    async def request(self, route: Route, **kwargs: Any) -> Any:
+        self.requests[route.key] += 1
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        payload: dict[str, Any] = kwargs.get("json") or {}
+
+        # Multipart requests carry the JSON payload as the first form field
+        if not payload and (form := kwargs.get("form")):
+            payload = json.loads(form[0]["value"])
+
+        if route.path.endswith("/messages") and route.method == "POST":
+            return self._message(route, payload)
+
+        if route.path.endswith("/messages/{message_id}") and route.method == "PATCH":
+            return self._message(route, payload, route.url.rsplit("/", 1)[-1])
+
+        return None if route.method in {"DELETE", "PUT"} else {}
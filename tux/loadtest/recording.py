@@ -0,0 +1,148 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+# Keys holding personal data that a replay does not need
+_DROPPED_KEYS = {"avatar", "banner", "avatar_decoration_data", "email", "phone", "bio", "clan", "primary_guild"}
+# Keys holding user content, emptied rather than dropped since discord.py requires some of them in messages
+_EMPTIED_KEYS = {"embeds", "attachments", "sticker_items"}
+_NAME_KEYS = {"username", "global_name", "nick"}
+_SNOWFLAKE = re.compile(r"^\d{15,20}$")
+
+
+class Anonymizer:
+    """
+    Rewrites gateway payloads so they carry no user data, while keeping their structure replayable.
+
+    Snowflakes are mapped through a keyed hash that keeps their timestamp bits, so the same ID maps to the
+    same fake ID throughout a recording and account ages survive. User, guild, channel, role and custom emoji
+    names are replaced, channel topics and message content are scrubbed, the latter keeping only a leading
+    command name, and embeds, attachments and stickers are emptied.
+
+    Parameters
+    ----------
+    key : bytes | None
+        The hashing key. A random key is used by default, so mappings cannot be reversed across recordings.
+    prefixes : tuple[str, ...]
+        The command prefixes whose command names are kept in scrubbed content.
+    """
+
+    def __init__(self, key: bytes | None = None, prefixes: tuple[str, ...] = ()) -> None:
+        self.key = key or os.urandom(16)
+        self.prefixes = prefixes
+
+    def hash(self, value: str) -> str:
+        return hashlib.blake2b(value.encode(), key=self.key, digest_size=3).hexdigest()
+
+    def snowflake(self, value: str) -> str:
+        digest = hashlib.blake2b(value.encode(), key=self.key, digest_size=8).digest()
+        return str((int(value) >> 22 << 22) | (int.from_bytes(digest) & 0x3FFFFF))
+
+    def content(self, content: str) -> str:
+        """
+        Scrub message content, keeping its length and any leading command name.
+
+        Parameters
+        ----------
+        content : str
+            The message content.
+
+        Returns
+        -------
+        str
+            The scrubbed content.
+        """
+
+        command = ""
+
+        if content.startswith(self.prefixes):
+            command, _, content = content.partition(" ")
+            command += " " if content else ""
+
+        return command + re.sub(r"\S", "x", content)
+
+    def __call__(self, data: Any, key: str = "") -> Any:
+        if isinstance(data, dict):
+            # Unicode emoji have no ID and are named by the emoji itself, which reaction listeners match on
+            if key == "emoji" and data.get("id") is None:
+                return data
+
+            return {
+                item_key: [] if item_key in _EMPTIED_KEYS else self(value, item_key)
+                for item_key, value in data.items()
+                if item_key not in _DROPPED_KEYS
+            }
+
+        if isinstance(data, list):
+            return [self(value, key) for value in data]
+
+        if isinstance(data, str):
+            return self.text(data, key)
+
+        return data
+
+    def text(self, value: str, key: str) -> str:
+        """
+        Anonymize a string value by the key it is stored under.
+        """
+
+        if key in _NAME_KEYS:
+            return f"user{self.hash(value)}"
+
+        if key == "name":
+            return f"name{self.hash(value)}"
+
+        if key == "content":
+            return self.content(value)
+
+        if key == "topic":
+            return re.sub(r"\S", "x", value)
+
+        if _SNOWFLAKE.match(value) and (key == "id" or key.endswith(("_id", "_ids", "roles"))):
+            return self.snowflake(value)
+
+        return value
+
+
+class RecordingWriter:
+    """
+    Appends gateway events to a gzipped JSON lines file, one `{"ts", "t", "d"}` object per line.
+    """
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.file = gzip.open(path, "at", encoding="utf-8")  # noqa: SIM115
+
+    def write(self, events: list[dict[str, Any]]) -> None:
+        self.file.writelines(json.dumps(event, separators=(",", ":")) + "\n" for event in events)
+        self.file.flush()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def read_recording(path: Path) -> Iterator[dict[str, Any]]:
+    """
+    Read the events of a recording.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the recording.
+
+    Yields
+    ------
+    dict[str, Any]
+        Each event, with its offset in seconds (`ts`), type (`t`) and payload (`d`).
+    """
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
@@ -3,6 +3,7 @@ import asyncio
 import discord
 import sentry_sdk
 from discord.ext import commands
+from dotenv import dotenv_values, set_key
 from loguru import logger
 from sentry_sdk.integrations.asyncio import AsyncioIntegration
 from sentry_sdk.integrations.loguru import LoguruIntegration
@@ -13,6 +14,8 @@ from tux.help import TuxHelp
 
 # from tux.utils.console import Console
 from tux.utils.config import CONFIG
+from tux.utils.member_cache import get_profile
+from tux.utils.sampling import trace_sampler
 
 
 async def get_prefix(bot: Tux, message: discord.Message) -> list[str]:
@@ -29,27 +32,41 @@ async def main() -> None:
         logger.critical("No token provided, exiting.")
         return
 
+    # The Prisma CLI reads the database URL from .env; cluster processes all start here, so only write on change
+    if dotenv_values(".env").get("DATABASE_URL") != CONFIG.DATABASE_URL:
+        set_key(".env", "DATABASE_URL", CONFIG.DATABASE_URL)
+
     logger.info("Setting up Sentry...")
 
     sentry_sdk.init(
         dsn=CONFIG.SENTRY_URL,
         environment="dev" if CONFIG.DEV == "True" else "prod",
-        traces_sample_rate=1.0,
-        profiles_sample_rate=1.0,
+        traces_sampler=trace_sampler,
+        profiles_sample_rate=CONFIG.SENTRY_PROFILES_SAMPLE_RATE,
         enable_tracing=True,
         integrations=[AsyncioIntegration(), LoguruIntegration()],
     )
 
     logger.info(f"Sentry setup intitalized: {sentry_sdk.is_initialized()}")
 
+    member_cache_profile = get_profile(CONFIG.MEMBER_CACHE_PROFILE, CONFIG.MEMBER_CACHE_PRESENCES)
+    logger.info(f"Using the {member_cache_profile.name} member cache profile.")
+
     bot = Tux(
         command_prefix=get_prefix,
         strip_after_prefix=True,
         case_insensitive=True,
-        intents=discord.Intents.all(),
+        intents=member_cache_profile.intents(),
+        member_cache_flags=member_cache_profile.member_cache_flags(),
+        chunk_guilds_at_startup=member_cache_profile.chunk_at_startup,
         owner_ids=[*CONFIG.SYSADMIN_IDS, CONFIG.BOT_OWNER_ID],
         allowed_mentions=discord.AllowedMentions(everyone=False),
         help_command=TuxHelp(),
+        # Raw gateway events are only needed to record them for load tests
+        enable_debug_events=CONFIG.EVENT_RECORDING_ENABLED,
+        # Set by the cluster supervisor when this process runs a slice of the shards
+        shard_ids=CONFIG.SHARD_IDS,
+        shard_count=CONFIG.SHARD_COUNT,
     )
 
     # Initialize the console and console task
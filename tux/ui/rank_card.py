@@ -0,0 +1,280 @@
+import asyncio
+import functools
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+
+import discord
+from loguru import logger
+from PIL import Image, ImageDraw, ImageFont
+
+from tux.ui.starboard.image_gen import get_font
+
+WIDTH, HEIGHT = 900, 250
+AVATAR_SIZE = 180
+PADDING = 35
+BAR_X, BAR_Y = PADDING * 2 + AVATAR_SIZE, 165
+BAR_WIDTH, BAR_HEIGHT = WIDTH - BAR_X - PADDING, 36
+# Shapes are drawn this many times larger and scaled down, to smooth their edges
+SUPERSAMPLE = 4
+
+BACKGROUND_COLOR = "#2b2d31"
+TRACK_COLOR = "#1e1f22"
+TEXT_COLOR = "#f2f3f5"
+MUTED_COLOR = "#b5bac1"
+
+RENDER_WORKERS = 2
+# Circularized avatars kept by each worker, and avatar images and rendered cards kept by the bot
+WORKER_AVATAR_CACHE_SIZE = 256
+AVATAR_CACHE_SIZE = 512
+CARD_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class RankCard:
+    """
+    Everything shown on a rank card; two equal cards render to the same image.
+
+    The member's rank is sent alongside the card rather than drawn on it, since any leaderboard change
+    would make every cached card stale.
+    """
+
+    name: str
+    avatar_key: str
+    level: int
+    xp: int
+    progress: int
+    required: int
+    color: str
+
+
+# Layers cached within each worker process
+
+
+@functools.cache
+def font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    return get_font(size, bold)
+
+
+def smooth_mask(size: tuple[int, int], radius: int | None = None) -> Image.Image:
+    """
+    Make an anti-aliased mask of a rounded rectangle, or of an ellipse if no radius is given.
+    """
+
+    large = Image.new("L", (size[0] * SUPERSAMPLE, size[1] * SUPERSAMPLE), 0)
+    draw = ImageDraw.Draw(large)
+    box = (0, 0, large.width - 1, large.height - 1)
+
+    if radius is None:
+        draw.ellipse(box, fill=255)
+    else:
+        draw.rounded_rectangle(box, radius * SUPERSAMPLE, fill=255)
+
+    return large.resize(size, Image.Resampling.LANCZOS)
+
+
+@functools.cache
+def background() -> Image.Image:
+    """
+    The card without any member data: the rounded background and the empty XP bar.
+    """
+
+    card = Image.new("RGBA", (WIDTH, HEIGHT), (0, 0, 0, 0))
+    card.paste(Image.new("RGBA", (WIDTH, HEIGHT), BACKGROUND_COLOR), (0, 0), smooth_mask((WIDTH, HEIGHT), 24))
+    card.paste(
+        Image.new("RGBA", (BAR_WIDTH, BAR_HEIGHT), TRACK_COLOR),
+        (BAR_X, BAR_Y),
+        bar_mask(BAR_WIDTH),
+    )
+    return card
+
+
+@functools.cache
+def bar_mask(width: int) -> Image.Image:
+    return smooth_mask((width, BAR_HEIGHT), BAR_HEIGHT // 2)
+
+
+@functools.cache
+def avatar_mask() -> Image.Image:
+    return smooth_mask((AVATAR_SIZE, AVATAR_SIZE))
+
+
+_avatars: OrderedDict[str, Image.Image] = OrderedDict()
+
+
+def circular_avatar(key: str, data: bytes | None) -> Image.Image:
+    """
+    Get an avatar cropped to a circle, from the worker's cache if it was circularized before.
+    """
+
+    if (avatar := _avatars.get(key)) is not None:
+        _avatars.move_to_end(key)
+        return avatar
+
+    avatar = Image.new("RGBA", (AVATAR_SIZE, AVATAR_SIZE), (0, 0, 0, 0))
+
+    # A placeholder is not cached, so the avatar shows once it can be fetched
+    if data is None:
+        avatar.paste(Image.new("RGBA", avatar.size, TRACK_COLOR), (0, 0), avatar_mask())
+        return avatar
+
+    source = Image.open(BytesIO(data)).convert("RGBA").resize(avatar.size, Image.Resampling.LANCZOS)
+    avatar.paste(source, (0, 0), avatar_mask())
+
+    _avatars[key] = avatar
+
+    if len(_avatars) > WORKER_AVATAR_CACHE_SIZE:
+        _avatars.popitem(last=False)
+
+    return avatar
+
+
+def fit_text(draw: ImageDraw.ImageDraw, text: str, text_font: ImageFont.FreeTypeFont, max_width: int) -> str:
+    if draw.textlength(text, font=text_font) <= max_width:
+        return text
+
+    while text and draw.textlength(f"{text}…", font=text_font) > max_width:
+        text = text[:-1]
+
+    return f"{text}…"
+
+
+def render_rank_card(card: RankCard, avatar: bytes | None) -> bytes:
+    """
+    Render a rank card to PNG. Runs in a worker process.
+
+    Parameters
+    ----------
+    card : RankCard
+        The data to show on the card.
+    avatar : bytes | None
+        The member's avatar image, or None if it could not be fetched.
+
+    Returns
+    -------
+    bytes
+        The PNG image.
+    """
+
+    image = background().copy()
+    image.alpha_composite(circular_avatar(card.avatar_key, avatar), (PADDING, PADDING))
+
+    draw = ImageDraw.Draw(image)
+    right = WIDTH - PADDING
+
+    name_font = font(40, bold=True)
+    name = fit_text(draw, card.name, name_font, right - BAR_X)
+    draw.text((BAR_X, PADDING), name, font=name_font, fill=TEXT_COLOR)  # type: ignore
+
+    draw.text((BAR_X, BAR_Y - 50), f"Level {card.level}", font=font(30, bold=True), fill=card.color)  # type: ignore
+
+    xp_text = f"{card.progress}/{card.required} XP • {card.xp} total"
+    xp_font = font(22)
+    xp_width = draw.textlength(xp_text, font=xp_font)
+    draw.text((right - xp_width, BAR_Y - 42), xp_text, font=xp_font, fill=MUTED_COLOR)  # type: ignore
+
+    fraction = min(max(card.progress / card.required, 0), 1) if card.required > 0 else 1
+    # Keep a started bar at least as wide as it is tall, so its rounded ends stay round
+    if filled := round(BAR_WIDTH * fraction):
+        filled = max(filled, BAR_HEIGHT)
+        image.paste(Image.new("RGBA", (filled, BAR_HEIGHT), card.color), (BAR_X, BAR_Y), bar_mask(filled))
+
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class RankCardRenderer:
+    """
+    Renders rank cards in a pool of worker processes, keeping the bot's event loop free.
+
+    Rendered cards are cached by their content, so a card is only rendered again once the member's XP, name
+    or avatar changes. Avatars are downloaded once per avatar hash.
+    """
+
+    def __init__(self, workers: int = RENDER_WORKERS) -> None:
+        self.workers = workers
+        self.executor: ProcessPoolExecutor | None = None
+        self.avatars: OrderedDict[str, bytes] = OrderedDict()
+        self.cards: OrderedDict[RankCard, bytes] = OrderedDict()
+        # Renders in progress, so concurrent requests for the same card share one render
+        self.rendering: dict[RankCard, asyncio.Task[bytes]] = {}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            # Spawned workers do not inherit the bot's threads and sockets
+            self.executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+        return self.executor
+
+    async def fetch_avatar(self, asset: discord.Asset) -> bytes | None:
+        if (data := self.avatars.get(asset.key)) is not None:
+            self.avatars.move_to_end(asset.key)
+            return data
+
+        try:
+            data = await asset.with_static_format("png").with_size(256).read()
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to fetch avatar {asset.key} for a rank card: {e}")
+            # Not cached, so the next render tries again
+            return None
+
+        self.avatars[asset.key] = data
+
+        if len(self.avatars) > AVATAR_CACHE_SIZE:
+            self.avatars.popitem(last=False)
+
+        return data
+
+    async def render(self, member: discord.Member, card: RankCard) -> bytes:
+        """
+        Get a member's rank card, rendering it unless the same card was rendered recently.
+
+        Parameters
+        ----------
+        member : discord.Member
+            The member, for their avatar.
+        card : RankCard
+            The data to show on the card.
+
+        Returns
+        -------
+        bytes
+            The PNG image.
+        """
+
+        if (image := self.cards.get(card)) is not None:
+            self.cards.move_to_end(card)
+            return image
+
+        if (task := self.rendering.get(card)) is None:
+            task = asyncio.create_task(self._render(member, card))
+            self.rendering[card] = task
+            task.add_done_callback(lambda _: self.rendering.pop(card, None))
+
+        # A cancelled command does not cancel a render other commands may be waiting for
+        return await asyncio.shield(task)
+
+    async def _render(self, member: discord.Member, card: RankCard) -> bytes:
+        avatar = await self.fetch_avatar(member.display_avatar)
+        image = await asyncio.get_running_loop().run_in_executor(self.get_executor(), render_rank_card, card, avatar)
+
+        if avatar is None:
+            return image
+
+        self.cards[card] = image
+
+        if len(self.cards) > CARD_CACHE_SIZE:
+            self.cards.popitem(last=False)
+
+        return image
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+rank_card_renderer = RankCardRenderer()
@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import Final
 
 import yaml
-from dotenv import load_dotenv, set_key
+from dotenv import load_dotenv
 
 from tux.utils.functions import convert_dict_str_to_int
 
@@ -40,6 +40,14 @@ class Config:
 
     # Sentry-related
     SENTRY_URL: Final[str | None] = os.getenv("SENTRY_URL", "")
+    SENTRY_TRACES_PER_MINUTE: Final[int] = config.get("SENTRY_SAMPLING", {}).get("TRACES_PER_MINUTE", 60)
+    SENTRY_DEFAULT_SAMPLE_RATE: Final[float] = config.get("SENTRY_SAMPLING", {}).get("DEFAULT_RATE", 0.25)
+    SENTRY_PROFILES_SAMPLE_RATE: Final[float] = config.get("SENTRY_SAMPLING", {}).get("PROFILES_SAMPLE_RATE", 0.1)
+    SENTRY_SAMPLE_RULES: Final[dict[str, float]] = config.get("SENTRY_SAMPLING", {}).get("RULES", {})
+    SENTRY_ALWAYS_SAMPLE_COGS: Final[list[str]] = config.get("SENTRY_SAMPLING", {}).get(
+        "ALWAYS_SAMPLE_COGS",
+        ["tux.cogs.moderation"],
+    )
 
     # Database
     PROD_DATABASE_URL: Final[str] = os.getenv("PROD_DATABASE_URL", "")
@@ -47,7 +55,66 @@ class Config:
 
     DATABASE_URL: Final[str] = DEV_DATABASE_URL if DEV and DEV.lower() == "true" else PROD_DATABASE_URL
 
-    set_key(".env", "DATABASE_URL", DATABASE_URL)
+    # For the Prisma client of this process; the bot also writes it to .env for the Prisma CLI at startup. Not
+    # written here, since worker and cluster processes import this module too and would write .env at once.
+    os.environ["DATABASE_URL"] = DATABASE_URL
+
+    # Database query tracing
+    SLOW_QUERY_MS: Final[int] = config.get("QUERY_TRACING", {}).get("SLOW_QUERY_MS", 100)
+    EVENT_QUERY_BUDGET: Final[int] = config.get("QUERY_TRACING", {}).get("EVENT_QUERY_BUDGET", 10)
+    N_PLUS_ONE_THRESHOLD: Final[int] = config.get("QUERY_TRACING", {}).get("N_PLUS_ONE_THRESHOLD", 5)
+
+    # Metrics exporter
+    METRICS_ENABLED: Final[bool] = config.get("METRICS", {}).get("ENABLED", False)
+    METRICS_HOST: Final[str] = config.get("METRICS", {}).get("HOST", "127.0.0.1")
+    METRICS_PORT: Final[int] = config.get("METRICS", {}).get("PORT", 9090)
+
+    # Gateway event recording for load tests
+    EVENT_RECORDING_ENABLED: Final[bool] = config.get("EVENT_RECORDING", {}).get("ENABLED", False)
+    EVENT_RECORDING_PATH: Final[str] = config.get("EVENT_RECORDING", {}).get(
+        "PATH",
+        "recordings/events-{timestamp}.jsonl.gz",
+    )
+    EVENT_RECORDING_EVENTS: Final[list[str]] = config.get("EVENT_RECORDING", {}).get(
+        "EVENTS",
+        [
+            "MESSAGE_CREATE",
+            "MESSAGE_UPDATE",
+            "MESSAGE_DELETE",
+            "MESSAGE_REACTION_ADD",
+            "MESSAGE_REACTION_REMOVE",
+            "GUILD_MEMBER_ADD",
+            "GUILD_MEMBER_REMOVE",
+            "GUILD_MEMBER_UPDATE",
+            "VOICE_STATE_UPDATE",
+        ],
+    )
+
+    # Event loop stall detector
+    STALL_DETECTOR_ENABLED: Final[bool] = config.get("STALL_DETECTOR", {}).get("ENABLED", True)
+    STALL_THRESHOLD_MS: Final[int] = config.get("STALL_DETECTOR", {}).get("THRESHOLD_MS", 250)
+    STALL_FAIL_ON_STALL: Final[bool] = bool(DEV and DEV.lower() == "true") and config.get("STALL_DETECTOR", {}).get(
+        "FAIL_ON_STALL",
+        False,
+    )
+
+    # Sharding; the TUX_* variables are set by the cluster supervisor for each bot process
+    CLUSTERS: Final[int] = config.get("SHARDING", {}).get("CLUSTERS", 1)
+    SHARD_COUNT: Final[int | None] = int(os.getenv("TUX_SHARD_COUNT") or 0) or config.get("SHARDING", {}).get(
+        "SHARD_COUNT",
+    )
+    SHARD_IDS: Final[list[int] | None] = (
+        [int(shard_id) for shard_id in os.environ["TUX_SHARD_IDS"].split(",")] if os.getenv("TUX_SHARD_IDS") else None
+    )
+    CLUSTER_ID: Final[int] = int(os.getenv("TUX_CLUSTER_ID") or 0)
+    CLUSTER_SOCKET_PATH: Final[str] = os.getenv("TUX_CLUSTER_SOCKET") or config.get("SHARDING", {}).get(
+        "SOCKET_PATH",
+        "/tmp/tux-cluster.sock",
+    )
+
+    # Member cache
+    MEMBER_CACHE_PROFILE: Final[str] = config.get("MEMBER_CACHE", {}).get("PROFILE", "full")
+    MEMBER_CACHE_PRESENCES: Final[bool | None] = config.get("MEMBER_CACHE", {}).get("PRESENCES")
 
     # GitHub
     GITHUB_REPO_URL: Final[str] = os.getenv("GITHUB_REPO_URL", "")
@@ -73,6 +140,17 @@ class Config:
     TEMPVC_CATEGORY_ID: Final[str | None] = config["TEMPVC_CATEGORY_ID"]
     TEMPVC_CHANNEL_ID: Final[str | None] = config["TEMPVC_CHANNEL_ID"]
 
+    # Raid protection
+    RAID_PROTECTION: Final[bool] = config.get("RAID_PROTECTION", {}).get("ENABLED", False)
+    RAID_JOIN_THRESHOLD: Final[int] = config.get("RAID_PROTECTION", {}).get("JOIN_THRESHOLD", 10)
+    RAID_JOIN_WINDOW: Final[float] = config.get("RAID_PROTECTION", {}).get("JOIN_WINDOW_SECONDS", 10)
+    RAID_MIN_ACCOUNT_AGE_DAYS: Final[float] = config.get("RAID_PROTECTION", {}).get("MIN_ACCOUNT_AGE_DAYS", 7)
+    RAID_ACTION: Final[str] = config.get("RAID_PROTECTION", {}).get("ACTION", "timeout")
+    RAID_TIMEOUT_MINUTES: Final[int] = config.get("RAID_PROTECTION", {}).get("TIMEOUT_MINUTES", 60)
+    RAID_SLOWMODE_SECONDS: Final[int] = config.get("RAID_PROTECTION", {}).get("SLOWMODE_SECONDS", 30)
+    RAID_DURATION_MINUTES: Final[float] = config.get("RAID_PROTECTION", {}).get("DURATION_MINUTES", 10)
+    RAID_CONCURRENCY: Final[int] = config.get("RAID_PROTECTION", {}).get("CONCURRENCY", 4)
+
     # GIF ratelimiter
     RECENT_GIF_AGE: Final[int] = config["GIF_LIMITER"]["RECENT_GIF_AGE"]
     GIF_LIMIT_EXCLUDE: Final[list[int]] = config["GIF_LIMITER"]["GIF_LIMIT_EXCLUDE"]
@@ -87,6 +165,10 @@ class Config:
     LEVELS_EXPONENT: Final[int] = config["XP"]["LEVELS_EXPONENT"]
     SHOW_XP_PROGRESS: Final[bool] = config["XP"].get("SHOW_XP_PROGRESS", False)
     ENABLE_XP_CAP: Final[bool] = config["XP"].get("ENABLE_XP_CAP", True)
+    RANK_CARDS: Final[bool] = config["XP"].get("RANK_CARDS", False)
+    XP_DECAY_DAYS: Final[int] = config["XP"].get("XP_DECAY_DAYS", 0)
+    XP_DECAY_PERCENT: Final[float] = config["XP"].get("XP_DECAY_PERCENT", 0)
+    XP_SEASON_MONTHS: Final[int] = config["XP"].get("XP_SEASON_MONTHS", 0)
 
 
 CONFIG = Config()
@@ -1,11 +1,18 @@
+import asyncio
 import csv
 import datetime
+import gzip
 import io
+import tempfile
+from collections.abc import AsyncIterable, Callable, Iterable
+from typing import IO, Literal, TypeVar, cast
 
 import discord
 
 from tux.ui.embeds import EmbedCreator
 
+T = TypeVar("T")
+
 _flags = {
     "user": "User",
     "display": "Display Name",
@@ -15,6 +22,65 @@ _flags = {
     "created": "Creation Date",
 }
 
+# Column extractors, resolved once per export instead of per header per row
+_ban_columns: dict[str, Callable[[discord.guild.BanEntry], str]] = {
+    _flags["user"]: lambda ban: ban.user.name,
+    _flags["display"]: lambda ban: ban.user.display_name,
+    _flags["id"]: lambda ban: str(ban.user.id),
+    _flags["reason"]: lambda ban: str(ban.reason),
+    _flags["mention"]: lambda ban: ban.user.mention,
+    _flags["created"]: lambda ban: ban.user.created_at.isoformat(),
+}
+
+_member_columns: dict[str, Callable[[discord.Member], str]] = {
+    _flags["user"]: lambda member: member.name,
+    _flags["display"]: lambda member: member.display_name,
+    _flags["id"]: lambda member: str(member.id),
+    _flags["mention"]: lambda member: member.mention,
+    _flags["created"]: lambda member: member.created_at.isoformat(),
+}
+
+# The csv module's QUOTE_MINIMAL, QUOTE_ALL, QUOTE_NONNUMERIC and QUOTE_NONE
+Quoting = Literal[0, 1, 2, 3]
+
+# Rows are spooled in memory up to this size before spilling to disk
+_SPOOL_MAX_SIZE = 4 * 1024 * 1024
+# Headroom kept below the upload limit for data still buffered by the text and gzip layers
+_SIZE_LIMIT_MARGIN = 1024 * 1024
+# Number of rows written between yields to the event loop
+_ROWS_PER_YIELD = 1000
+
+
+class _CSVPart:
+    """
+    A single CSV output file, written to a spooled temporary file and optionally gzip-compressed.
+    """
+
+    def __init__(self, headers: list[str], compress: bool, quoting: Quoting) -> None:
+        self.raw: IO[bytes] = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)  # noqa: SIM115
+        self.gzip: gzip.GzipFile | None = gzip.GzipFile(fileobj=self.raw, mode="wb") if compress else None
+        self.text = io.TextIOWrapper(self.gzip or self.raw, encoding="utf-8", newline="")
+        self.writer = csv.writer(self.text, quoting=quoting)
+        self.writer.writerow(headers)
+
+    @property
+    def size(self) -> int:
+        return self.raw.tell()
+
+    def write(self, row: list[str]) -> None:
+        self.writer.writerow(row)
+
+    def finish(self, filename: str) -> discord.File:
+        self.text.flush()
+        self.text.detach()
+
+        if self.gzip is not None:
+            self.gzip.close()
+
+        self.raw.seek(0)
+        # discord.File only reads and seeks the file, which the spool supports like any buffered file
+        return discord.File(cast(io.BufferedIOBase, self.raw), filename=filename)
+
 
 async def _define_headers(
     args: list[str],
@@ -41,19 +107,50 @@ async def _define_headers(
     return headers or default
 
 
-async def _create_encoded_string(
+async def _stream_csv(
+    items: AsyncIterable[T] | Iterable[T],
     headers: list[str],
-    rows: list[dict[str, str]],
-    quoting: int = csv.QUOTE_ALL,
-) -> io.BytesIO:
+    columns: dict[str, Callable[[T], str]],
+    filename: str,
+    size_limit: int,
+    compress: bool = False,
+    quoting: Quoting = csv.QUOTE_ALL,
+) -> tuple[list[discord.File], int]:
     """
-    Create an encoded string from the retrieved data.
+    Write items to CSV files as they arrive, starting a new file whenever the upload size limit is reached.
+
+    Returns the finished files and the number of rows written.
     """
-    csvfile = io.StringIO()
-    writer = csv.DictWriter(csvfile, fieldnames=headers, quoting=quoting)
-    writer.writeheader()
-    writer.writerows(rows)
-    return io.BytesIO(csvfile.getvalue().encode())
+    extractors = [columns[header] for header in headers]
+    part_limit = max(size_limit - _SIZE_LIMIT_MARGIN, size_limit // 2)
+    parts: list[_CSVPart] = [_CSVPart(headers, compress, quoting)]
+    total = 0
+
+    async def write(item: T) -> None:
+        nonlocal total
+
+        if parts[-1].size >= part_limit:
+            parts.append(_CSVPart(headers, compress, quoting))
+
+        parts[-1].write([extract(item) for extract in extractors])
+        total += 1
+
+        if total % _ROWS_PER_YIELD == 0:
+            await asyncio.sleep(0)
+
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            await write(item)
+    else:
+        for item in items:
+            await write(item)
+
+    extension = ".csv.gz" if compress else ".csv"
+
+    if len(parts) == 1:
+        return [parts[0].finish(f"{filename}{extension}")], total
+
+    return [part.finish(f"{filename}_part{i}{extension}") for i, part in enumerate(parts, start=1)], total
 
 
 async def get_help_embed(
@@ -69,16 +166,16 @@ async def get_help_embed(
     return EmbedCreator.create_embed(
         embed_type=EmbedCreator.INFO,
         title=title,
-        description=f"Use any combination of the following flags to export a list of {data_description} to a CSV file:\n```--all\n{'\n'.join([f'--{flag}' for flag in valid_flags])}```",
+        description=f"Use any combination of the following flags to export a list of {data_description} to a CSV file:\n```--all\n{'\n'.join([f'--{flag}' for flag in valid_flags])}```\nAdd `--gzip` to compress the export. Large exports are split into multiple files.",
     )
 
 
 async def get_ban_list_csv(
     interaction: discord.Interaction,
-    bans: list[discord.guild.BanEntry],
+    bans: AsyncIterable[discord.guild.BanEntry] | Iterable[discord.guild.BanEntry],
     valid_flags: list[str],
     args: list[str],
-) -> discord.File:
+) -> tuple[list[discord.File], int]:
     """
     Export a list of banned users in CSV format.
     """
@@ -88,70 +185,46 @@ async def get_ban_list_csv(
         default=[_flags["user"], _flags["id"], _flags["reason"]],
     )
 
-    rows: list[dict[str, str]] = []
-    for ban in bans:
-        row: dict[str, str] = {}
-        for header in headers:
-            if header == _flags["user"]:
-                row[header] = ban.user.name
-            elif header == _flags["display"]:
-                row[header] = ban.user.display_name
-            elif header == _flags["id"]:
-                row[header] = str(ban.user.id)
-            elif header == _flags["reason"]:
-                row[header] = str(ban.reason)
-            elif header == _flags["mention"]:
-                row[header] = ban.user.mention
-            elif header == _flags["created"]:
-                row[header] = ban.user.created_at.isoformat()
-
-        rows.append(row)
-
     if interaction.guild is None:
         msg = "Interaction does not have a guild attribute."
         raise ValueError(msg)
 
     guild_id = interaction.guild.id
     timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d_%H%M%S")
-    csvfile = await _create_encoded_string(headers, rows)
 
-    return discord.File(csvfile, filename=f"{guild_id}_bans_{timestamp}.csv")
+    return await _stream_csv(
+        bans,
+        headers,
+        _ban_columns,
+        f"{guild_id}_bans_{timestamp}",
+        interaction.guild.filesize_limit,
+        compress="--gzip" in args,
+    )
 
 
 async def get_member_list_csv(
     interaction: discord.Interaction,
-    members: list[discord.Member],
+    members: AsyncIterable[discord.Member] | Iterable[discord.Member],
     valid_flags: list[str],
     args: list[str],
-) -> discord.File:
+) -> tuple[list[discord.File], int]:
     """
     Export a list of members in CSV format.
     """
     headers: list[str] = await _define_headers(args, valid_flags, [_flags["user"], _flags["id"]])
 
-    rows: list[dict[str, str]] = []
-    for member in members:
-        row: dict[str, str] = {}
-        for header in headers:
-            if header == _flags["user"]:
-                row[header] = member.name
-            elif header == _flags["display"]:
-                row[header] = member.display_name
-            elif header == _flags["id"]:
-                row[header] = str(member.id)
-            elif header == _flags["mention"]:
-                row[header] = member.mention
-            elif header == _flags["created"]:
-                row[header] = member.created_at.isoformat()
-
-        rows.append(row)
-
     if interaction.guild is None:
         msg = "Interaction does not have a guild attribute."
         raise ValueError(msg)
 
     guild_id = interaction.guild.id
     timestamp = datetime.datetime.now(tz=datetime.UTC).strftime("%Y%m%d_%H%M%S")
-    csvfile = await _create_encoded_string(headers, rows)
 
-    return discord.File(csvfile, filename=f"{guild_id}_members_{timestamp}.csv")
+    return await _stream_csv(
+        members,
+        headers,
+        _member_columns,
+        f"{guild_id}_members_{timestamp}",
+        interaction.guild.filesize_limit,
+        compress="--gzip" in args,
+    )
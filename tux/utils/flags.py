@@ -224,6 +224,55 @@ class UnjailFlags(commands.FlagConverter, case_insensitive=True, delimiter=" ",
     )
 
 
+class PurgeFlags(commands.FlagConverter, case_insensitive=True, delimiter=" ", prefix="-"):
+    user: discord.User = commands.flag(
+        name="user",
+        description="Only delete messages from this user.",
+        aliases=["u", "member", "m"],
+        default=None,
+    )
+    bots: bool = commands.flag(
+        name="bots",
+        description="Only delete messages from bots.",
+        aliases=["b"],
+        default=False,
+    )
+    regex: str = commands.flag(
+        name="regex",
+        description="Only delete messages matching this regular expression.",
+        aliases=["re", "match"],
+        default=None,
+    )
+    attachments: bool = commands.flag(
+        name="attachments",
+        description="Only delete messages with attachments.",
+        aliases=["a", "files"],
+        default=False,
+    )
+    links: bool = commands.flag(
+        name="links",
+        description="Only delete messages with links.",
+        aliases=["l"],
+        default=False,
+    )
+    invites: bool = commands.flag(
+        name="invites",
+        description="Only delete messages with Discord invites.",
+        aliases=["i"],
+        default=False,
+    )
+    before: str = commands.flag(
+        name="before",
+        description="Only delete messages before this message ID, or older than this. (e.g. 1d, 2h)",
+        default=None,
+    )
+    after: str = commands.flag(
+        name="after",
+        description="Only delete messages after this message ID, or newer than this. (e.g. 1d, 2h)",
+        default=None,
+    )
+
+
 class CasesViewFlags(commands.FlagConverter, case_insensitive=True, delimiter=" ", prefix="-"):
     type: CaseType = commands.flag(
         name="type",
@@ -246,6 +295,21 @@ class CasesViewFlags(commands.FlagConverter, case_insensitive=True, delimiter="
     )
 
 
+class CasesSearchFlags(commands.FlagConverter, case_insensitive=True, delimiter=" ", prefix="-"):
+    query: str = commands.flag(
+        name="query",
+        description="Words to search case reasons and notes for.",
+        aliases=["q"],
+        positional=True,
+    )
+    page: int = commands.flag(
+        name="page",
+        description="Page of results to show.",
+        aliases=["p"],
+        default=1,
+    )
+
+
 class CaseModifyFlags(commands.FlagConverter, case_insensitive=True, delimiter=" ", prefix="-"):
     status: bool | None = commands.flag(
         name="status",
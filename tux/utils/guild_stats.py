@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+
+import discord
+
+
+@dataclass
+class GuildStats:
+    """
+    Counters for a single guild, kept current by the guild stats service.
+
+    `bans` is None until the ban list has been counted (or if the bot cannot read it).
+    """
+
+    humans: int = 0
+    bots: int = 0
+    bans: int | None = None
+    boosts: int = 0
+    roles: int = 0
+    channels: int = 0
+
+    @property
+    def members(self) -> int:
+        return self.humans + self.bots
+
+    def add_member(self, member: discord.Member) -> None:
+        if member.bot:
+            self.bots += 1
+        else:
+            self.humans += 1
+
+    def remove_member(self, member: discord.User | discord.Member) -> None:
+        if member.bot:
+            self.bots = max(self.bots - 1, 0)
+        else:
+            self.humans = max(self.humans - 1, 0)
+
+
+class GuildStatsCache:
+    """
+    Per-guild statistics, computed once from the member cache and then updated incrementally.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: dict[int, GuildStats] = {}
+        # Member totals reported by the other processes of a sharded deployment, by cluster ID
+        self.remote_members: dict[int, int] = {}
+
+    def compute(self, guild: discord.Guild) -> GuildStats:
+        """
+        Count a guild's members, roles and channels from the cache, keeping any known ban count.
+
+        Until a guild is chunked, the total comes from Discord's member count and only cached bots are
+        counted, so the split between humans and bots is approximate.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to count.
+
+        Returns
+        -------
+        GuildStats
+            The computed statistics.
+        """
+        bots = sum(member.bot for member in guild.members)
+        members = len(guild.members) if guild.chunked else max(guild.member_count or 0, len(guild.members))
+        previous = self.guilds.get(guild.id)
+
+        stats = GuildStats(
+            humans=members - bots,
+            bots=bots,
+            bans=previous.bans if previous else None,
+            boosts=guild.premium_subscription_count or 0,
+            roles=len(guild.roles),
+            channels=len(guild.channels),
+        )
+
+        self.guilds[guild.id] = stats
+        return stats
+
+    def get(self, guild: discord.Guild) -> GuildStats:
+        """
+        Get the statistics for a guild, computing them if they are not cached yet.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to get statistics for.
+
+        Returns
+        -------
+        GuildStats
+            The statistics for the guild.
+        """
+        return self.guilds.get(guild.id) or self.compute(guild)
+
+    def peek(self, guild_id: int) -> GuildStats | None:
+        """
+        Get the cached statistics for a guild without computing them.
+
+        Event handlers use this, since discord.py updates its own cache before dispatching,
+        so freshly computed statistics already include the change being handled.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        GuildStats | None
+            The cached statistics, or None if the guild has not been computed yet.
+        """
+        return self.guilds.get(guild_id)
+
+    def remove(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
+
+    @property
+    def local_members(self) -> int:
+        return sum(stats.members for stats in self.guilds.values())
+
+    @property
+    def total_members(self) -> int:
+        return self.local_members + sum(self.remote_members.values())
+
+
+guild_stats = GuildStatsCache()
@@ -0,0 +1,154 @@
+import asyncio
+import contextlib
+from collections import deque
+
+import discord
+from loguru import logger
+
+# Discord's limits on the embeds of one message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARACTERS = 6000
+# Seconds a log message waits for more embeds before it is sent anyway
+FLUSH_INTERVAL = 1.0
+# Retries of a message Discord rate limited or failed to take, with exponential backoff from RETRY_DELAY seconds
+MAX_RETRIES = 5
+RETRY_DELAY = 2.0
+# Seconds a flush waits at most for queued embeds to be sent
+FLUSH_TIMEOUT = 10.0
+
+
+class LogChannelQueue:
+    """
+    The embeds waiting to be sent to one log channel, sent in order by a single flusher task.
+    """
+
+    def __init__(self, channel: discord.abc.Messageable) -> None:
+        self.channel = channel
+        self.embeds: deque[discord.Embed] = deque()
+        self.full = asyncio.Event()
+        self.task: asyncio.Task[None] | None = None
+        # Set when shutting down, so queued embeds are sent without waiting for more
+        self.draining = False
+
+    def put(self, embed: discord.Embed) -> None:
+        self.embeds.append(embed)
+
+        if len(self.embeds) >= MAX_EMBEDS:
+            self.full.set()
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def take(self) -> list[discord.Embed]:
+        """
+        Take the oldest embeds that fit in one message.
+        """
+
+        batch: list[discord.Embed] = []
+        characters = 0
+
+        while self.embeds and len(batch) < MAX_EMBEDS:
+            size = len(self.embeds[0])
+
+            if batch and characters + size > MAX_EMBED_CHARACTERS:
+                break
+
+            batch.append(self.embeds.popleft())
+            characters += size
+
+        return batch
+
+    async def run(self) -> None:
+        while self.embeds:
+            # Wait a moment for more embeds, unless there are already enough for a full message
+            if len(self.embeds) < MAX_EMBEDS and not self.draining:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self.full.wait(), FLUSH_INTERVAL)
+
+            batch = self.take()
+
+            if len(self.embeds) < MAX_EMBEDS:
+                self.full.clear()
+
+            await self.send(batch)
+
+    async def send(self, batch: list[discord.Embed]) -> None:
+        """
+        Send a batch of embeds, retrying with backoff while Discord rate limits or fails to take it.
+
+        Later batches wait for this one, so logs keep their order.
+        """
+
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                await self.channel.send(embeds=batch)
+
+            except (discord.Forbidden, discord.NotFound) as e:
+                logger.warning(f"Dropping {len(batch)} log embeds, the log channel cannot be used: {e}")
+                return
+
+            except discord.HTTPException as e:
+                if e.status != 429 and e.status < 500:
+                    logger.error(f"Dropping {len(batch)} log embeds Discord rejected: {e}")
+                    return
+
+                if attempt == MAX_RETRIES:
+                    logger.error(f"Dropping {len(batch)} log embeds after {MAX_RETRIES} retries: {e}")
+                    return
+
+                delay = RETRY_DELAY * 2**attempt
+                logger.warning(f"Sending {len(batch)} log embeds failed with {e.status}, retrying in {delay:.0f}s.")
+                await asyncio.sleep(delay)
+
+            else:
+                return
+
+
+class LogDispatcher:
+    """
+    Coalesces log embeds into messages of up to 10 embeds per log channel.
+
+    A burst of moderation actions, e.g. during a raid, then takes a tenth of the messages and stays within the
+    channel's rate limit. Embeds are sent in the order they were queued.
+    """
+
+    def __init__(self) -> None:
+        self.queues: dict[int, LogChannelQueue] = {}
+
+    def send(self, channel: discord.TextChannel | discord.Thread, embed: discord.Embed) -> None:
+        """
+        Queue an embed for a log channel. It is sent within FLUSH_INTERVAL seconds, sooner if the queue fills a
+        message.
+
+        Parameters
+        ----------
+        channel : discord.TextChannel | discord.Thread
+            The log channel.
+        embed : discord.Embed
+            The embed to send.
+        """
+
+        if (queue := self.queues.get(channel.id)) is None:
+            queue = self.queues[channel.id] = LogChannelQueue(channel)
+
+        queue.put(embed)
+
+    async def flush(self) -> None:
+        """
+        Send every queued embed without waiting for more, e.g. before shutting down.
+
+        Waits FLUSH_TIMEOUT seconds at most, so a rate limited log channel cannot hold up a shutdown.
+        """
+
+        for queue in self.queues.values():
+            queue.draining = True
+            queue.full.set()
+
+        if tasks := [queue.task for queue in self.queues.values() if queue.task is not None and not queue.task.done()]:
+            _, pending = await asyncio.wait(tasks, timeout=FLUSH_TIMEOUT)
+
+            if pending:
+                logger.warning(f"{len(pending)} log channels still had embeds queued after {FLUSH_TIMEOUT:.0f}s.")
+
+
+log_dispatcher = LogDispatcher()
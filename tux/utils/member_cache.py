@@ -0,0 +1,132 @@
+import asyncio
+import enum
+from dataclasses import dataclass
+
+import discord
+from loguru import logger
+
+
+class MemberNeeds(enum.Flag):
+    """
+    What a cog needs from the member cache, declared as a `member_needs` class attribute on the cog.
+    """
+
+    NONE = 0
+    # Every member of a guild, e.g. to count members per role; guilds are chunked on first use
+    MEMBER_LIST = enum.auto()
+    # Member statuses and activities, which only the profiles with the presences intent receive
+    PRESENCES = enum.auto()
+
+
+@dataclass(frozen=True)
+class MemberCacheProfile:
+    """
+    How much of each guild's member list is kept in memory.
+
+    Members in voice channels and the bot itself are always cached. With `cache_joined`, members who join
+    (and every member of a chunked guild) stay cached; without it, only chunked members do.
+    """
+
+    name: str
+    presences: bool
+    cache_joined: bool
+    chunk_at_startup: bool
+
+    def intents(self) -> discord.Intents:
+        intents = discord.Intents.all()
+        intents.presences = self.presences
+        return intents
+
+    def member_cache_flags(self) -> discord.MemberCacheFlags:
+        return discord.MemberCacheFlags(voice=True, joined=self.cache_joined)
+
+
+PROFILES: dict[str, MemberCacheProfile] = {
+    # Every member and presence of every guild, chunked before ready
+    "full": MemberCacheProfile("full", presences=True, cache_joined=True, chunk_at_startup=True),
+    # No presences; guilds are chunked when a cog first needs their member list
+    "lazy": MemberCacheProfile("lazy", presences=False, cache_joined=True, chunk_at_startup=False),
+    # No presences and only voice members until a guild's member list is needed
+    "minimal": MemberCacheProfile("minimal", presences=False, cache_joined=False, chunk_at_startup=False),
+}
+
+
+def get_profile(name: str, presences: bool | None = None) -> MemberCacheProfile:
+    """
+    Get a member cache profile by name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the profile.
+    presences : bool | None
+        Whether to receive presences regardless of the profile, or None to use the profile's default.
+
+    Returns
+    -------
+    MemberCacheProfile
+        The profile, or the full profile if the name is unknown.
+    """
+
+    if (profile := PROFILES.get(name)) is None:
+        logger.warning(f"Unknown member cache profile {name!r}, using the full profile.")
+        profile = PROFILES["full"]
+
+    if presences is not None and presences != profile.presences:
+        profile = MemberCacheProfile(profile.name, presences, profile.cache_joined, profile.chunk_at_startup)
+
+    return profile
+
+
+class MemberCache:
+    """
+    Chunks guilds on first need, once per guild, when the member cache profile does not chunk at startup.
+    """
+
+    def __init__(self) -> None:
+        self.locks: dict[int, asyncio.Lock] = {}
+        # Guilds chunked so far; kept separately since `Guild.chunked` turns false when a new member is not cached
+        self.chunked: set[int] = set()
+
+    def is_chunked(self, guild: discord.Guild) -> bool:
+        return guild.id in self.chunked or guild.chunked
+
+    async def ensure_members(self, bot: discord.Client, guild: discord.Guild) -> bool:
+        """
+        Make sure every member of a guild is cached, chunking it if needed.
+
+        Dispatches `on_members_cached(guild)` after a guild is chunked, so services counting members can recount.
+
+        Parameters
+        ----------
+        bot : discord.Client
+            The bot, to dispatch the event.
+        guild : discord.Guild
+            The guild whose members are needed.
+
+        Returns
+        -------
+        bool
+            True if the guild had to be chunked.
+        """
+
+        if self.is_chunked(guild):
+            return False
+
+        async with self.locks.setdefault(guild.id, asyncio.Lock()):
+            if self.is_chunked(guild):
+                return False
+
+            logger.info(f"Chunking {guild.member_count} members of guild {guild.name} on first need.")
+            await guild.chunk(cache=True)
+            self.chunked.add(guild.id)
+
+        bot.dispatch("members_cached", guild)
+        return True
+
+    def remove(self, guild_id: int) -> None:
+        self.chunked.discard(guild_id)
+        self.locks.pop(guild_id, None)
+
+
+member_cache = MemberCache()
@@ -0,0 +1,174 @@
+import abc
+import bisect
+import math
+from collections.abc import Sequence
+from typing import TypeVar
+
+# Default histogram buckets, in seconds
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues, strict=True)]
+
+    if extra:
+        pairs.append(extra)
+
+    return f"{{{",".join(pairs)}}}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+M = TypeVar("M", bound="Metric")
+
+
+class Metric(abc.ABC):
+    """
+    Base class for a metric family with optional labels.
+    """
+
+    kind: str = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abc.abstractmethod
+    def samples(self) -> list[str]: ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self.values[self._key(labels)] = value
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self.values.items()
+        ]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> (per-bucket counts, sum, count)
+        self.values: dict[tuple[str, ...], tuple[list[int], float, int]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts, total, count = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> list[str]:
+        lines: list[str] = []
+
+        for key, (counts, total, count) in self.values.items():
+            cumulative = 0
+
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A minimal in-process metrics registry rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: M) -> M:
+        existing = self.metrics.setdefault(metric.name, metric)
+
+        if not isinstance(existing, type(metric)):
+            msg = f"Metric {metric.name} is already registered as a {existing.kind}."
+            raise TypeError(msg)
+
+        return existing
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
+
+
+metrics = MetricsRegistry()
+
+COMMANDS_TOTAL = metrics.counter("tux_commands_total", "Commands invoked.", ["command", "status"])
+COMMAND_LATENCY = metrics.histogram("tux_command_latency_seconds", "Command execution time.", ["command"])
+LISTENER_LATENCY = metrics.histogram("tux_listener_latency_seconds", "Event listener execution time.", ["listener"])
+DB_QUERIES = metrics.counter("tux_db_queries_total", "Database queries issued.", ["query"])
+DB_QUERY_TIME = metrics.counter("tux_db_query_seconds_total", "Time spent in database queries.", ["query"])
+DB_SLOW_QUERIES = metrics.counter("tux_db_slow_queries_total", "Queries slower than the slow query threshold.")
+DB_BUDGET_OVERRUNS = metrics.counter("tux_db_budget_overruns_total", "Events or commands over the query budget.")
@@ -0,0 +1,227 @@
+import asyncio
+import contextlib
+import datetime
+import re
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import discord
+from loguru import logger
+
+from tux.utils.regex import DISCORD_INVITE
+
+# Messages older than this cannot be bulk deleted, in seconds; a minute of margin covers clock drift
+BULK_DELETE_MAX_AGE = 14 * 24 * 60 * 60 - 60
+BULK_DELETE_SIZE = 100
+# Pause between single deletes of old messages, in seconds, on top of discord.py's rate limit handling
+SINGLE_DELETE_INTERVAL = 1.0
+# Seconds between progress reports
+PROGRESS_INTERVAL = 3.0
+# Messages read from history at most, so a narrow filter cannot scan a huge channel forever
+MAX_SCANNED = 250_000
+
+LINK = re.compile(r"https?://\S+", flags=re.IGNORECASE)
+
+MessagePredicate = Callable[[discord.Message], bool]
+
+
+@dataclass
+class PurgeFilter:
+    """
+    Which messages a purge deletes; a message must match every filter that is set.
+    """
+
+    author_id: int | None = None
+    bots: bool = False
+    pattern: re.Pattern[str] | None = None
+    attachments: bool = False
+    links: bool = False
+    invites: bool = False
+
+    def compile(self) -> MessagePredicate:
+        """
+        Build a predicate running only the checks of the filters that are set.
+        """
+
+        checks: list[MessagePredicate] = []
+
+        if self.author_id is not None:
+            author_id = self.author_id
+            checks.append(lambda message: message.author.id == author_id)
+
+        if self.bots:
+            checks.append(lambda message: message.author.bot)
+
+        if self.pattern is not None:
+            search = self.pattern.search
+            checks.append(lambda message: search(message.content) is not None)
+
+        if self.attachments:
+            checks.append(lambda message: bool(message.attachments))
+
+        if self.links:
+            checks.append(lambda message: LINK.search(message.content) is not None)
+
+        if self.invites:
+            checks.append(lambda message: DISCORD_INVITE.search(message.content) is not None)
+
+        if not checks:
+            return lambda message: True
+
+        if len(checks) == 1:
+            return checks[0]
+
+        return lambda message: all(check(message) for check in checks)
+
+
+@dataclass
+class PurgeProgress:
+    scanned: int = 0
+    matched: int = 0
+    deleted: int = 0
+    failed: int = 0
+    # Old messages waiting for a single delete
+    queued: int = 0
+    done: bool = False
+
+
+ProgressCallback = Callable[[PurgeProgress], Awaitable[None]]
+
+
+class PurgeJob:
+    """
+    Deletes up to `limit` messages matching a filter, newest first.
+
+    History is read lazily, page by page. Matches younger than 14 days are bulk deleted 100 at a time, while
+    older matches, which Discord does not bulk delete, go to a queue deleted one by one alongside the scan.
+
+    Parameters
+    ----------
+    channel : discord.TextChannel | discord.Thread
+        The channel to purge.
+    limit : int
+        The number of matching messages to delete at most.
+    message_filter : PurgeFilter
+        Which messages to delete.
+    before : discord.abc.Snowflake | datetime.datetime | None
+        Only delete messages before this message or time.
+    after : discord.abc.Snowflake | datetime.datetime | None
+        Only delete messages after this message or time.
+    on_progress : ProgressCallback | None
+        Called every few seconds with the progress so far, and once when the purge is done.
+    reason : str | None
+        The reason for the audit log.
+    """
+
+    def __init__(
+        self,
+        channel: discord.TextChannel | discord.Thread,
+        limit: int,
+        message_filter: PurgeFilter,
+        before: discord.abc.Snowflake | datetime.datetime | None = None,
+        after: discord.abc.Snowflake | datetime.datetime | None = None,
+        on_progress: ProgressCallback | None = None,
+        reason: str | None = None,
+    ) -> None:
+        self.channel = channel
+        self.limit = limit
+        self.predicate = message_filter.compile()
+        self.before = before
+        self.after = after
+        self.on_progress = on_progress
+        self.reason = reason
+        self.progress = PurgeProgress()
+        self.batch: list[discord.Message] = []
+        self.old_messages: asyncio.Queue[discord.Message | None] = asyncio.Queue()
+        self.last_report = time.monotonic()
+
+    async def run(self) -> PurgeProgress:
+        worker = asyncio.create_task(self.delete_old_messages())
+
+        try:
+            await self.scan()
+            await self.flush()
+            self.old_messages.put_nowait(None)
+
+            while not worker.done():
+                await asyncio.sleep(1)
+                await self.report()
+
+            await worker
+
+        finally:
+            if not worker.done():
+                worker.cancel()
+
+                with contextlib.suppress(asyncio.CancelledError):
+                    await worker
+
+        self.progress.done = True
+
+        if self.on_progress is not None:
+            await self.on_progress(self.progress)
+
+        return self.progress
+
+    async def scan(self) -> None:
+        async for message in self.channel.history(
+            limit=MAX_SCANNED,
+            before=self.before,
+            after=self.after,
+            oldest_first=False,
+        ):
+            self.progress.scanned += 1
+
+            if self.predicate(message):
+                self.progress.matched += 1
+
+                if time.time() - message.created_at.timestamp() < BULK_DELETE_MAX_AGE:
+                    self.batch.append(message)
+
+                    if len(self.batch) >= BULK_DELETE_SIZE:
+                        await self.flush()
+
+                else:
+                    self.progress.queued += 1
+                    self.old_messages.put_nowait(message)
+
+                if self.progress.matched >= self.limit:
+                    return
+
+            await self.report()
+
+    async def flush(self) -> None:
+        if not self.batch:
+            return
+
+        try:
+            await self.channel.delete_messages(self.batch, reason=self.reason)
+            self.progress.deleted += len(self.batch)
+
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to bulk delete {len(self.batch)} messages in {self.channel}: {e}")
+            self.progress.failed += len(self.batch)
+
+        self.batch.clear()
+
+    async def delete_old_messages(self) -> None:
+        while (message := await self.old_messages.get()) is not None:
+            try:
+                await message.delete()
+                self.progress.deleted += 1
+
+            except discord.NotFound:
+                pass
+
+            except discord.HTTPException as e:
+                logger.warning(f"Failed to delete message {message.id} in {self.channel}: {e}")
+                self.progress.failed += 1
+
+            self.progress.queued -= 1
+            await asyncio.sleep(SINGLE_DELETE_INTERVAL)
+
+    async def report(self) -> None:
+        if self.on_progress is not None and time.monotonic() - self.last_report >= PROGRESS_INTERVAL:
+            self.last_report = time.monotonic()
+            await self.on_progress(self.progress)
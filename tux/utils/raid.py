@@ -0,0 +1,220 @@
+import asyncio
+import contextlib
+import datetime
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+import discord
+from loguru import logger
+
+# Discord bans at most this many users per bulk ban
+BULK_BAN_SIZE = 200
+
+
+@dataclass
+class GuildJoins:
+    """
+    The recent joins of a guild, oldest first, and until when the guild is in raid mode.
+    """
+
+    # (monotonic time, member ID, suspicious)
+    joins: deque[tuple[float, int, bool]] = field(default_factory=deque)
+    raid_until: float = 0.0
+
+    def in_raid(self, now: float) -> bool:
+        return now < self.raid_until
+
+
+class RaidDetector:
+    """
+    Detects join floods with a sliding window of recent joins per guild.
+
+    A guild enters raid mode when `threshold` members join within `window` seconds. Raid mode lasts `duration`
+    seconds after the last join that kept the rate above the threshold. Accounts younger than `min_account_age`
+    that joined in the window or join during raid mode are reported as offenders; with no minimum age, every
+    such account is.
+
+    Recording a join is O(1) amortized and never awaits, so the detector keeps up with any join rate the gateway
+    delivers.
+
+    Parameters
+    ----------
+    threshold : int
+        The joins within the window that trigger raid mode.
+    window : float
+        The length of the sliding window, in seconds.
+    duration : float
+        How long raid mode lasts after the join rate drops, in seconds.
+    min_account_age : datetime.timedelta
+        Accounts younger than this are treated as raid accounts.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        window: float,
+        duration: float,
+        min_account_age: datetime.timedelta,
+    ) -> None:
+        self.threshold = threshold
+        self.window = window
+        self.duration = duration
+        self.min_account_age = min_account_age
+        self.guilds: dict[int, GuildJoins] = {}
+
+    def is_suspicious(self, member: discord.Member) -> bool:
+        return discord.utils.utcnow() - member.created_at < self.min_account_age
+
+    def record(self, member: discord.Member, now: float | None = None) -> tuple[bool, list[int]]:
+        """
+        Record a join.
+
+        Parameters
+        ----------
+        member : discord.Member
+            The member that joined.
+        now : float | None
+            The monotonic time of the join, by default the current time.
+
+        Returns
+        -------
+        tuple[bool, list[int]]
+            Whether this join started raid mode, and the IDs of the accounts to act on because of it.
+        """
+
+        now = time.monotonic() if now is None else now
+        guild = self.guilds.setdefault(member.guild.id, GuildJoins())
+        suspicious = self.is_suspicious(member)
+
+        guild.joins.append((now, member.id, suspicious))
+
+        while guild.joins[0][0] <= now - self.window:
+            guild.joins.popleft()
+
+        flooding = len(guild.joins) >= self.threshold
+
+        if guild.in_raid(now):
+            if flooding:
+                guild.raid_until = now + self.duration
+
+            return False, [member.id] if suspicious else []
+
+        if not flooding:
+            return False, []
+
+        guild.raid_until = now + self.duration
+        return True, [member_id for _, member_id, is_suspicious in guild.joins if is_suspicious]
+
+    def raid_remaining(self, guild_id: int, now: float | None = None) -> float:
+        """
+        Get the seconds until a guild leaves raid mode, or 0 if it is not in raid mode.
+        """
+
+        if (guild := self.guilds.get(guild_id)) is None:
+            return 0.0
+
+        return max(guild.raid_until - (time.monotonic() if now is None else now), 0.0)
+
+    def end_raid(self, guild_id: int) -> None:
+        if guild := self.guilds.get(guild_id):
+            guild.raid_until = 0.0
+            guild.joins.clear()
+
+    def remove(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
+
+
+RaidAction = Callable[[discord.Guild, list[int]], Awaitable[None]]
+
+
+class RaidResponder:
+    """
+    Acts on raid accounts with a fixed number of workers, so a flood of joins turns into a bounded number of
+    concurrent API calls rather than one task per join.
+
+    Each worker takes as many queued accounts of one guild as one call of `action` handles, e.g. a bulk ban of
+    up to 200 users, or a single account for per-member actions.
+
+    Parameters
+    ----------
+    action : RaidAction
+        Called with a guild and the IDs of the accounts to act on.
+    workers : int
+        The number of concurrent calls of `action`.
+    batch_size : int
+        The accounts passed to `action` at most.
+    max_queued : int
+        The accounts queued at most; further accounts are dropped with a warning.
+    """
+
+    def __init__(self, action: RaidAction, workers: int, batch_size: int, max_queued: int) -> None:
+        self.action = action
+        self.batch_size = batch_size
+        self.queue: asyncio.Queue[tuple[discord.Guild, int]] = asyncio.Queue(max_queued)
+        self.queued: set[tuple[int, int]] = set()
+        self.dropped = 0
+        self.workers = [asyncio.create_task(self.run()) for _ in range(workers)]
+
+    def put(self, guild: discord.Guild, member_ids: list[int]) -> None:
+        for member_id in member_ids:
+            if (guild.id, member_id) in self.queued:
+                continue
+
+            try:
+                self.queue.put_nowait((guild, member_id))
+
+            except asyncio.QueueFull:
+                self.dropped += 1
+                continue
+
+            self.queued.add((guild.id, member_id))
+
+        if self.dropped:
+            logger.warning(f"The raid response queue is full, {self.dropped} accounts were not acted on.")
+            self.dropped = 0
+
+    def take(self, guild: discord.Guild, member_id: int) -> list[int]:
+        """
+        Take further queued accounts of the same guild, up to the batch size, without waiting.
+        """
+
+        batch = [member_id]
+        others: list[tuple[discord.Guild, int]] = []
+
+        while len(batch) < self.batch_size and not self.queue.empty():
+            item = self.queue.get_nowait()
+
+            if item[0].id == guild.id:
+                batch.append(item[1])
+            else:
+                others.append(item)
+
+        # Accounts of other guilds go back to the queue; there is room, since they were just taken out of it
+        for item in others:
+            self.queue.put_nowait(item)
+
+        return batch
+
+    async def run(self) -> None:
+        while True:
+            guild, member_id = await self.queue.get()
+            batch = self.take(guild, member_id)
+
+            for queued_id in batch:
+                self.queued.discard((guild.id, queued_id))
+
+            try:
+                await self.action(guild, batch)
+
+            except Exception as e:
+                logger.error(f"Error acting on {len(batch)} raid accounts in guild {guild.name}: {e}")
+
+    async def close(self) -> None:
+        for worker in self.workers:
+            worker.cancel()
+
+        for worker in self.workers:
+            with contextlib.suppress(asyncio.CancelledError):
+                await worker
@@ -0,0 +1,268 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable, Iterator
+from typing import Any
+
+# Enough levels for about 16 million entries per guild
+MAX_LEVELS = 24
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key: Any, levels: int) -> None:
+        self.key = key
+        self.next: list[_Node] = [self] * levels
+        # Number of positions each link skips
+        self.width: list[int] = [1] * levels
+
+
+class RankedList:
+    """
+    A sorted list with positional lookups, as an indexable skip list.
+
+    Inserting, removing, finding the position of a key and getting the key at a position all take
+    O(log n) expected time.
+    """
+
+    def __init__(self, seed: int | None = None) -> None:
+        self.random = random.Random(seed)
+        self.size = 0
+        self.tail = _Node(None, 0)
+        self.head = _Node(None, MAX_LEVELS)
+        self.head.next = [self.tail] * MAX_LEVELS
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _level(self) -> int:
+        # Each node is promoted to the next level with probability 1/2
+        level = 1
+
+        while level < MAX_LEVELS and self.random.random() < 0.5:
+            level += 1
+
+        return level
+
+    def _find(self, key: Any) -> tuple[list[_Node], list[int]]:
+        """
+        Find the last node before `key` on every level, and the position of each of those nodes.
+        """
+
+        chain: list[_Node] = [self.head] * MAX_LEVELS
+        positions = [0] * MAX_LEVELS
+        node = self.head
+        position = 0
+
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level] is not self.tail and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+
+            chain[level] = node
+            positions[level] = position
+
+        return chain, positions
+
+    def insert(self, key: Any) -> None:
+        chain, positions = self._find(key)
+        # The position the new node takes, counting the head as 0
+        position = positions[0] + 1
+        levels = self._level()
+        node = _Node(key, levels)
+
+        for level in range(levels):
+            previous = chain[level]
+            node.next[level] = previous.next[level]
+            node.width[level] = positions[level] + previous.width[level] - position + 1
+            previous.next[level] = node
+            previous.width[level] = position - positions[level]
+
+        for level in range(levels, MAX_LEVELS):
+            chain[level].width[level] += 1
+
+        self.size += 1
+
+    def remove(self, key: Any) -> None:
+        chain, _ = self._find(key)
+        node = chain[0].next[0]
+
+        if node is self.tail or node.key != key:
+            raise KeyError(key)
+
+        for level in range(len(node.next)):
+            previous = chain[level]
+            previous.width[level] += node.width[level] - 1
+            previous.next[level] = node.next[level]
+
+        for level in range(len(node.next), MAX_LEVELS):
+            chain[level].width[level] -= 1
+
+        self.size -= 1
+
+    def index(self, key: Any) -> int:
+        """
+        Get the 0-based position of a key.
+
+        Raises
+        ------
+        KeyError
+            If the key is not in the list.
+        """
+
+        chain, positions = self._find(key)
+        node = chain[0].next[0]
+
+        if node is self.tail or node.key != key:
+            raise KeyError(key)
+
+        return positions[0]
+
+    def iter_from(self, start: int) -> Iterator[Any]:
+        """
+        Iterate over the keys from a 0-based position on.
+        """
+
+        if start >= self.size:
+            return
+
+        node = self.head
+        # Positions count the head as 0
+        remaining = max(start, 0) + 1
+
+        for level in reversed(range(MAX_LEVELS)):
+            while node.next[level] is not self.tail and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        while node is not self.tail:
+            yield node.key
+            node = node.next[0]
+
+
+class GuildRanking:
+    """
+    The XP ranking of one guild's members, highest XP first; ties go to the lower member ID.
+    """
+
+    def __init__(self) -> None:
+        self.xp: dict[int, float] = {}
+        self.order = RankedList()
+
+    def __len__(self) -> int:
+        return len(self.xp)
+
+    def update(self, member_id: int, xp: float) -> None:
+        if (old_xp := self.xp.get(member_id)) is not None:
+            self.order.remove((-old_xp, member_id))
+
+        self.xp[member_id] = xp
+        self.order.insert((-xp, member_id))
+
+    def remove(self, member_id: int) -> None:
+        if (xp := self.xp.pop(member_id, None)) is not None:
+            self.order.remove((-xp, member_id))
+
+    def rank(self, member_id: int) -> int | None:
+        """
+        Get a member's 1-based rank, or None if the member is not ranked.
+        """
+
+        if (xp := self.xp.get(member_id)) is None:
+            return None
+
+        return self.order.index((-xp, member_id)) + 1
+
+    def page(self, offset: int, limit: int) -> list[tuple[int, float]]:
+        """
+        Get `limit` members and their XP, from the 0-based rank `offset` on.
+        """
+
+        entries: list[tuple[int, float]] = []
+
+        for negative_xp, member_id in self.order.iter_from(offset):
+            if len(entries) >= limit:
+                break
+
+            entries.append((member_id, -negative_xp))
+
+        return entries
+
+
+class RankIndex:
+    """
+    XP rankings per guild, loaded from the database once and then updated on every XP change.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: dict[int, GuildRanking] = {}
+        self.locks: dict[int, asyncio.Lock] = {}
+        # Changes made while a guild is loading, applied once it has loaded; None removes the member
+        self.pending: dict[int, dict[int, float | None]] = {}
+
+    async def get(
+        self,
+        guild_id: int,
+        loader: Callable[[int], Awaitable[list[tuple[int, float]]]],
+    ) -> GuildRanking:
+        """
+        Get a guild's ranking, loading it if needed.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        loader : Callable[[int], Awaitable[list[tuple[int, float]]]]
+            Loads the member IDs and XP of every ranked member of a guild.
+
+        Returns
+        -------
+        GuildRanking
+            The guild's ranking.
+        """
+
+        if (ranking := self.guilds.get(guild_id)) is not None:
+            return ranking
+
+        async with self.locks.setdefault(guild_id, asyncio.Lock()):
+            if (ranking := self.guilds.get(guild_id)) is not None:
+                return ranking
+
+            self.pending[guild_id] = {}
+
+            try:
+                ranking = GuildRanking()
+
+                for member_id, xp in await loader(guild_id):
+                    ranking.update(member_id, xp)
+
+                for member_id, xp in self.pending[guild_id].items():
+                    if xp is None:
+                        ranking.remove(member_id)
+                    else:
+                        ranking.update(member_id, xp)
+
+            finally:
+                del self.pending[guild_id]
+
+            self.guilds[guild_id] = ranking
+            return ranking
+
+    def update(self, guild_id: int, member_id: int, xp: float) -> None:
+        if (ranking := self.guilds.get(guild_id)) is not None:
+            ranking.update(member_id, xp)
+        elif guild_id in self.pending:
+            self.pending[guild_id][member_id] = xp
+
+    def remove_member(self, guild_id: int, member_id: int) -> None:
+        if (ranking := self.guilds.get(guild_id)) is not None:
+            ranking.remove(member_id)
+        elif guild_id in self.pending:
+            self.pending[guild_id][member_id] = None
+
+    def remove(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
+        self.locks.pop(guild_id, None)
+
+
+rank_index = RankIndex()
@@ -0,0 +1,85 @@
+from collections import Counter
+
+import discord
+
+
+class RoleStatsCache:
+    """
+    Live member counts per role, computed once per guild from the member cache and then updated from role diffs.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: dict[int, Counter[int]] = {}
+
+    def compute(self, guild: discord.Guild) -> Counter[int]:
+        """
+        Count the members of every role in a guild from the member cache.
+
+        Parameters
+        ----------
+        guild : discord.Guild
+            The guild to count.
+
+        Returns
+        -------
+        Counter[int]
+            A mapping of role ID to member count.
+        """
+        counts: Counter[int] = Counter()
+
+        for member in guild.members:
+            counts.update(role.id for role in member.roles)
+
+        self.guilds[guild.id] = counts
+        return counts
+
+    def get(self, guild: discord.Guild) -> Counter[int]:
+        counts = self.guilds.get(guild.id)
+        return self.compute(guild) if counts is None else counts
+
+    def peek(self, guild_id: int) -> Counter[int] | None:
+        """
+        Get the cached counts for a guild without computing them.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        Counter[int] | None
+            The cached counts, or None if the guild has not been computed yet.
+        """
+        return self.guilds.get(guild_id)
+
+    def count(self, guild: discord.Guild, role_id: int) -> int:
+        return self.get(guild)[role_id]
+
+    def apply_diff(self, guild_id: int, added: set[int], removed: set[int]) -> None:
+        """
+        Apply a member's role changes to the counts of a guild.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+        added : set[int]
+            The IDs of roles the member gained.
+        removed : set[int]
+            The IDs of roles the member lost.
+        """
+        if (counts := self.guilds.get(guild_id)) is None:
+            return
+
+        for role_id in added:
+            counts[role_id] += 1
+
+        for role_id in removed:
+            counts[role_id] = max(counts[role_id] - 1, 0)
+
+    def remove(self, guild_id: int) -> None:
+        self.guilds.pop(guild_id, None)
+
+
+role_stats = RoleStatsCache()
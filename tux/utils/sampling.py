@@ -0,0 +1,97 @@
+import fnmatch
+import time
+from typing import Any
+
+from tux.utils.config import CONFIG
+from tux.utils.metrics import metrics
+
+SAMPLING_FACTOR = metrics.gauge("tux_trace_sampling_factor", "Adaptive factor applied to trace sample rates.")
+
+
+class TraceSampler:
+    """
+    A Sentry `traces_sampler` that applies per-transaction rules and adapts to a traces-per-minute budget.
+
+    Each transaction gets a base rate from the first matching rule (or the default rate), which is scaled by
+    a factor recomputed every window so that the expected number of sampled traces stays near the budget.
+    Transactions from the always-sampled cogs, such as moderation commands, bypass both.
+
+    Error events are not affected; they are sent regardless of trace sampling.
+    """
+
+    def __init__(
+        self,
+        traces_per_minute: int = CONFIG.SENTRY_TRACES_PER_MINUTE,
+        default_rate: float = CONFIG.SENTRY_DEFAULT_SAMPLE_RATE,
+        rules: dict[str, float] = CONFIG.SENTRY_SAMPLE_RULES,
+        always_sample_cogs: list[str] = CONFIG.SENTRY_ALWAYS_SAMPLE_COGS,
+        window: float = 60.0,
+    ) -> None:
+        self.traces_per_minute = traces_per_minute
+        self.default_rate = default_rate
+        self.rules = list(rules.items())
+        self.always_sample_cogs = tuple(always_sample_cogs)
+        self.window = window
+
+        self.factor = 1.0
+        self.window_started = time.monotonic()
+        # Traces the rules alone would have sampled in the current window
+        self.expected = 0.0
+        self.rate_cache: dict[str, float] = {}
+
+    def base_rate(self, name: str) -> float:
+        """
+        Get the rule-based sample rate for a transaction name.
+
+        Parameters
+        ----------
+        name : str
+            The transaction name, e.g. `event:on_message:Afk.check_afk` or `command:ban`.
+
+        Returns
+        -------
+        float
+            The rate of the first matching rule, or the default rate.
+        """
+
+        if (rate := self.rate_cache.get(name)) is not None:
+            return rate
+
+        rate = next((rate for pattern, rate in self.rules if fnmatch.fnmatchcase(name, pattern)), self.default_rate)
+        self.rate_cache[name] = rate
+        return rate
+
+    def _roll_window(self, now: float) -> None:
+        elapsed = now - self.window_started
+
+        if elapsed < self.window:
+            return
+
+        # Scale the expected volume to a full minute, then move the factor halfway to the new target
+        per_minute = self.expected * 60 / elapsed
+        target = min(1.0, self.traces_per_minute / per_minute) if per_minute else 1.0
+        self.factor = (self.factor + target) / 2
+
+        self.window_started = now
+        self.expected = 0.0
+        SAMPLING_FACTOR.set(self.factor)
+
+    def __call__(self, sampling_context: dict[str, Any]) -> float:
+        if (parent_sampled := sampling_context.get("parent_sampled")) is not None:
+            return float(parent_sampled)
+
+        transaction = sampling_context.get("transaction_context") or {}
+        cog = sampling_context.get("cog") or ""
+
+        if self.always_sample_cogs and cog.startswith(self.always_sample_cogs):
+            return 1.0
+
+        rate = self.base_rate(transaction.get("name") or "")
+
+        self._roll_window(time.monotonic())
+        self.expected += rate
+
+        return rate * self.factor
+
+
+trace_sampler = TraceSampler()
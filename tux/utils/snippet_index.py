@@ -0,0 +1,280 @@
+import asyncio
+import bisect
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Iterable
+
+
+def _trigrams(name: str) -> set[str]:
+    """
+    Split a lowercase name into padded trigrams.
+
+    Parameters
+    ----------
+    name : str
+        The lowercase name to split.
+
+    Returns
+    -------
+    set[str]
+        The trigrams of the name.
+    """
+    padded = f"  {name} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """
+    Compute the Levenshtein distance between two strings.
+
+    Parameters
+    ----------
+    a : str
+        The first string.
+    b : str
+        The second string.
+
+    Returns
+    -------
+    int
+        The number of single character edits needed to turn `a` into `b`.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+
+    previous = list(range(len(b) + 1))
+
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+
+    return previous[-1]
+
+
+class GuildSnippetIndex:
+    """
+    In-memory name index for the snippets of a single guild.
+
+    Keeps a sorted list of lowercase names for prefix lookups and a trigram
+    posting list for fuzzy suggestions.
+    """
+
+    def __init__(self, names: Iterable[str] = ()) -> None:
+        # Lowercase name -> name as stored in the database
+        self.names: dict[str, str] = {}
+        # Sorted lowercase names, used for prefix lookups
+        self.sorted_names: list[str] = []
+        # Trigram -> lowercase names containing it
+        self.trigrams: defaultdict[str, set[str]] = defaultdict(set)
+
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.names
+
+    def add(self, name: str) -> None:
+        key = name.lower()
+
+        if key in self.names:
+            self.names[key] = name
+            return
+
+        self.names[key] = name
+        bisect.insort(self.sorted_names, key)
+
+        for trigram in _trigrams(key):
+            self.trigrams[trigram].add(key)
+
+    def remove(self, name: str) -> None:
+        key = name.lower()
+
+        if self.names.pop(key, None) is None:
+            return
+
+        position = bisect.bisect_left(self.sorted_names, key)
+        if position < len(self.sorted_names) and self.sorted_names[position] == key:
+            del self.sorted_names[position]
+
+        for trigram in _trigrams(key):
+            if bucket := self.trigrams.get(trigram):
+                bucket.discard(key)
+                if not bucket:
+                    del self.trigrams[trigram]
+
+    def get(self, name: str) -> str | None:
+        """
+        Get the stored name of a snippet, ignoring case.
+
+        Parameters
+        ----------
+        name : str
+            The name to look up.
+
+        Returns
+        -------
+        str | None
+            The name as stored in the database, or None if it does not exist.
+        """
+        return self.names.get(name.lower())
+
+    def complete(self, prefix: str, limit: int = 25) -> list[str]:
+        """
+        Get snippet names starting with a prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            The prefix to complete.
+        limit : int
+            The maximum number of names to return.
+
+        Returns
+        -------
+        list[str]
+            The matching names in alphabetical order.
+        """
+        key = prefix.lower()
+        results: list[str] = []
+
+        for position in range(bisect.bisect_left(self.sorted_names, key), len(self.sorted_names)):
+            candidate = self.sorted_names[position]
+            if not candidate.startswith(key) or len(results) >= limit:
+                break
+            results.append(self.names[candidate])
+
+        return results
+
+    def suggest(self, name: str, limit: int = 3, max_distance: int = 3) -> list[str]:
+        """
+        Get the snippet names closest to a name that does not exist.
+
+        Candidates sharing a trigram with the name are ranked by edit distance,
+        so only a small part of the index is compared.
+
+        Parameters
+        ----------
+        name : str
+            The misspelled name.
+        limit : int
+            The maximum number of suggestions to return.
+        max_distance : int
+            The maximum edit distance for a suggestion.
+
+        Returns
+        -------
+        list[str]
+            The suggested names, closest first.
+        """
+        key = name.lower()
+        shared: defaultdict[str, int] = defaultdict(int)
+
+        for trigram in _trigrams(key):
+            for candidate in self.trigrams.get(trigram, ()):
+                shared[candidate] += 1
+
+        scored: list[tuple[int, int, str]] = []
+
+        for candidate, overlap in shared.items():
+            distance = _edit_distance(key, candidate)
+            if distance <= max_distance:
+                scored.append((distance, -overlap, candidate))
+
+        scored.sort()
+
+        return [self.names[candidate] for _, _, candidate in scored[:limit]]
+
+
+class SnippetIndex:
+    """
+    Per-guild snippet name indexes, loaded lazily from the database.
+
+    The index must be kept current by calling `add` and `remove` whenever a
+    snippet is created or deleted. Changes made while a guild's index is
+    loading are recorded and applied once it has loaded, since the names
+    read may or may not include them.
+    """
+
+    def __init__(self, loader: Callable[[int], Awaitable[list[str]]]) -> None:
+        self.loader = loader
+        self.guilds: dict[int, GuildSnippetIndex] = {}
+        self.locks: defaultdict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
+        # Guild ID -> (added, name) changes made while the guild's index is loading
+        self.pending: dict[int, list[tuple[bool, str]]] = {}
+
+    async def get_guild(self, guild_id: int) -> GuildSnippetIndex:
+        """
+        Get the index for a guild, loading it on first use.
+
+        Parameters
+        ----------
+        guild_id : int
+            The ID of the guild.
+
+        Returns
+        -------
+        GuildSnippetIndex
+            The index for the guild.
+        """
+        if (index := self.guilds.get(guild_id)) is not None:
+            return index
+
+        async with self.locks[guild_id]:
+            if (index := self.guilds.get(guild_id)) is None:
+                pending: list[tuple[bool, str]] = []
+                self.pending[guild_id] = pending
+
+                try:
+                    index = GuildSnippetIndex(await self.loader(guild_id))
+
+                    for added, name in pending:
+                        if added:
+                            index.add(name)
+                        else:
+                            index.remove(name)
+
+                    self.guilds[guild_id] = index
+
+                finally:
+                    del self.pending[guild_id]
+
+        return index
+
+    async def get(self, guild_id: int, name: str) -> str | None:
+        return (await self.get_guild(guild_id)).get(name)
+
+    async def complete(self, guild_id: int, prefix: str, limit: int = 25) -> list[str]:
+        return (await self.get_guild(guild_id)).complete(prefix, limit)
+
+    async def suggest(self, guild_id: int, name: str, limit: int = 3) -> list[str]:
+        return (await self.get_guild(guild_id)).suggest(name, limit)
+
+    def add(self, guild_id: int, name: str) -> None:
+        if (index := self.guilds.get(guild_id)) is not None:
+            index.add(name)
+        elif (pending := self.pending.get(guild_id)) is not None:
+            pending.append((True, name))
+
+    def remove(self, guild_id: int, name: str) -> None:
+        if (index := self.guilds.get(guild_id)) is not None:
+            index.remove(name)
+        elif (pending := self.pending.get(guild_id)) is not None:
+            pending.append((False, name))
+
+    def invalidate(self, guild_id: int | None = None) -> None:
+        """
+        Drop a guild's index (or every index) so it is reloaded on next use.
+
+        Parameters
+        ----------
+        guild_id : int | None
+            The ID of the guild, or None to drop all indexes.
+        """
+        if guild_id is None:
+            self.guilds.clear()
+        else:
+            self.guilds.pop(guild_id, None)
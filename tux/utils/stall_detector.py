@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass
+
+from loguru import logger
+
+from tux.database.tracing import current_trace
+from tux.utils.config import CONFIG
+from tux.utils.metrics import metrics
+
+STALLS_TOTAL = metrics.counter("tux_event_loop_stalls_total", "Event loop stalls over the threshold.", ["source"])
+STALL_DURATION = metrics.histogram(
+    "tux_event_loop_stall_seconds",
+    "Duration of event loop stalls.",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+
+class EventLoopStallError(RuntimeError):
+    """
+    Raised in strict mode when the event loop stalled while it was being watched.
+    """
+
+
+@dataclass
+class Stall:
+    """
+    A period in which the event loop did not run, with the stack of the code that was blocking it.
+    """
+
+    source: str
+    stack: list[str]
+    duration: float = 0.0
+
+
+class StallDetector:
+    """
+    Watches the responsiveness of the event loop from a separate thread.
+
+    A heartbeat task stamps the time every `interval` seconds. If the watchdog thread sees no heartbeat for
+    longer than `threshold`, it captures the loop thread's stack and the command or listener that was running,
+    which is reported once the loop recovers.
+    """
+
+    def __init__(
+        self,
+        threshold: float = CONFIG.STALL_THRESHOLD_MS / 1000,
+        interval: float = 0.1,
+        strict: bool = CONFIG.STALL_FAIL_ON_STALL,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.strict = strict
+
+        # The most recent stalls, for inspection and strict mode
+        self.stalls: deque[Stall] = deque(maxlen=100)
+        self.last_beat = time.monotonic()
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._sample: Stall | None = None
+
+    def start(self) -> None:
+        """
+        Start the heartbeat task and the watchdog thread. Must be called from the event loop.
+        """
+
+        if self._heartbeat_task is not None:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self.last_beat = time.monotonic()
+
+        self._heartbeat_task = self._loop.create_task(self._heartbeat(), name="stall-detector-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stopped,), name="stall-detector", daemon=True)
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+        self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            self.last_beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+
+            lag = time.monotonic() - self.last_beat - self.interval
+            sample, self._sample = self._sample, None
+
+            if sample is not None and lag >= self.threshold:
+                sample.duration = lag
+                self._report(sample)
+
+    def _watch(self, stopped: threading.Event) -> None:
+        while not stopped.wait(self.interval):
+            if self._sample is None and time.monotonic() - self.last_beat - self.interval >= self.threshold:
+                self._sample = self._capture()
+
+    def _capture(self) -> Stall:
+        """
+        Capture the loop thread's stack and the source of the stall. Runs in the watchdog thread.
+
+        Returns
+        -------
+        Stall
+            The captured stall, without its final duration.
+        """
+
+        frame = sys._current_frames().get(self._loop_thread_id or 0)  # pyright: ignore[reportPrivateUsage]
+        stack = traceback.format_stack(frame) if frame is not None else []
+
+        return Stall(source=self._current_source(), stack=stack)
+
+    def _current_source(self) -> str:
+        """
+        Get the name of the command or listener running on the loop, falling back to the task's coroutine.
+
+        Returns
+        -------
+        str
+            The name of the running command, listener or coroutine.
+        """
+
+        if self._loop is None or (task := asyncio.current_task(self._loop)) is None:
+            return "unknown"
+
+        if (trace := task.get_context().get(current_trace)) is not None:
+            return trace.name
+
+        return getattr(task.get_coro(), "__qualname__", task.get_name())
+
+    def _report(self, stall: Stall) -> None:
+        self.stalls.append(stall)
+        STALLS_TOTAL.inc(source=stall.source)
+        STALL_DURATION.observe(stall.duration)
+
+        # The innermost frames are where the loop was blocked
+        stack = "".join(stall.stack[-12:])
+        log = logger.error if self.strict else logger.warning
+        log(f"Event loop stalled for {stall.duration * 1000:.0f}ms in {stall.source}:\n{stack}")
+
+    def raise_for_stalls(self) -> None:
+        """
+        Raise if any stalls have been recorded since the last call, clearing them.
+
+        Raises
+        ------
+        EventLoopStallError
+            If the event loop stalled.
+        """
+
+        stalls = list(self.stalls)
+        self.stalls.clear()
+
+        if stalls:
+            details = ", ".join(f"{stall.source} ({stall.duration * 1000:.0f}ms)" for stall in stalls)
+            msg = f"The event loop stalled {len(stalls)} time(s): {details}"
+            raise EventLoopStallError(msg)
+
+    @contextlib.asynccontextmanager
+    async def watch(self) -> AsyncGenerator[None, None]:
+        """
+        Watch a block for stalls, raising at the end of it in strict mode. Intended for tests and dev runs.
+
+        Raises
+        ------
+        EventLoopStallError
+            If strict mode is on and the event loop stalled inside the block.
+        """
+
+        started = self._heartbeat_task is None
+        if started:
+            self.start()
+
+        self.stalls.clear()
+
+        try:
+            yield
+            # Give the heartbeat a chance to report a stall at the very end of the block
+            await asyncio.sleep(self.interval * 2)
+
+        finally:
+            if started:
+                self.stop()
+
+        if self.strict:
+            self.raise_for_stalls()
+
+
+stall_detector = StallDetector()
@@ -0,0 +1,265 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+from prisma.models import Levels
+
+# Largest member ID and XP accepted, matching the database's bigint columns
+MAX_VALUE = 2**63 - 1
+FORMATS = ("csv", "jsonl")
+COLUMNS = ["member_id", "xp", "level", "blacklisted", "last_message"]
+
+_TRUE = {"true", "1", "yes"}
+_FALSE = {"false", "0", "no"}
+
+
+@dataclass
+class XpImportRow:
+    member_id: int
+    xp: float
+    blacklisted: bool | None = None
+    last_message: datetime.datetime | None = None
+
+
+@dataclass
+class XpImport:
+    """
+    The valid rows of an XP import file, and the line number and reason of every skipped row.
+
+    `has_blacklisted` and `has_last_message` tell whether the file sets those columns; members already stored
+    keep their values for columns the file leaves out.
+    """
+
+    rows: list[XpImportRow] = field(default_factory=list)
+    skipped: list[tuple[int, str]] = field(default_factory=list)
+    has_blacklisted: bool = False
+    has_last_message: bool = False
+
+
+def get_format(filename: str) -> tuple[str, bool]:
+    """
+    Get the format of an XP file from its name, and whether it is gzip-compressed.
+
+    Raises
+    ------
+    ValueError
+        If the file is not CSV or JSONL.
+    """
+
+    name = filename.lower()
+    compressed = name.endswith(".gz")
+    name = name.removesuffix(".gz")
+
+    if name.endswith(".csv"):
+        return "csv", compressed
+
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl", compressed
+
+    msg = "XP files must be .csv or .jsonl, optionally gzip-compressed."
+    raise ValueError(msg)
+
+
+def parse_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    text = str(value).strip().lower()
+
+    if text in _TRUE:
+        return True
+
+    if text in _FALSE:
+        return False
+
+    msg = f"invalid blacklisted value {value!r}"
+    raise ValueError(msg)
+
+
+def parse_row(data: dict[str, Any], imported: XpImport) -> XpImportRow:
+    """
+    Validate one row of an XP file.
+
+    Raises
+    ------
+    ValueError
+        If the row is invalid, with the reason.
+    """
+
+    try:
+        member_id = int(str(data["member_id"]).strip())
+    except (KeyError, TypeError, ValueError):
+        msg = f"invalid member_id {data.get("member_id")!r}"
+        raise ValueError(msg) from None
+
+    if not 0 < member_id <= MAX_VALUE:
+        msg = f"member_id {member_id} is out of range"
+        raise ValueError(msg)
+
+    try:
+        xp = float(data["xp"])
+    except (KeyError, TypeError, ValueError):
+        msg = f"invalid xp {data.get("xp")!r}"
+        raise ValueError(msg) from None
+
+    if not math.isfinite(xp) or not 0 <= xp <= MAX_VALUE:
+        msg = f"xp {xp} is out of range"
+        raise ValueError(msg)
+
+    row = XpImportRow(member_id, xp)
+
+    if imported.has_blacklisted:
+        row.blacklisted = parse_bool(data.get("blacklisted"))
+
+    if imported.has_last_message:
+        try:
+            last_message = datetime.datetime.fromisoformat(str(data["last_message"]).strip())
+        except (KeyError, ValueError):
+            msg = f"invalid last_message {data.get("last_message")!r}"
+            raise ValueError(msg) from None
+
+        row.last_message = last_message if last_message.tzinfo else last_message.replace(tzinfo=datetime.UTC)
+
+    return row
+
+
+def parse_levels_file(data: bytes, filename: str) -> XpImport:
+    """
+    Parse and validate an XP file exported by Tux or written by hand.
+
+    CSV files need a header row; JSONL files hold one object per line. `member_id` and `xp` are required,
+    `blacklisted` and `last_message` are optional, and `level` is ignored since levels are computed from XP.
+    Invalid rows and repeated members are skipped and reported.
+
+    Parameters
+    ----------
+    data : bytes
+        The file contents.
+    filename : str
+        The file name, which decides the format.
+
+    Returns
+    -------
+    XpImport
+        The valid rows and the skipped ones.
+
+    Raises
+    ------
+    ValueError
+        If the file format is not supported or the file lacks the required columns.
+    """
+
+    file_format, compressed = get_format(filename)
+
+    if compressed:
+        data = gzip.decompress(data)
+
+    text = io.StringIO(data.decode("utf-8-sig"))
+    imported = XpImport()
+
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        columns = set(reader.fieldnames or [])
+        # The header is line 1
+        lines = ((reader.line_num, record) for record in reader)
+    else:
+        records: list[tuple[int, dict[str, Any]]] = []
+
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                imported.skipped.append((line_number, f"invalid JSON: {e.msg}"))
+                continue
+
+            if not isinstance(record, dict):
+                imported.skipped.append((line_number, "not a JSON object"))
+                continue
+
+            records.append((line_number, record))
+
+        columns = set().union(*(record.keys() for _, record in records))
+        lines = iter(records)
+
+    if missing := {"member_id", "xp"} - columns:
+        msg = f"The file is missing the {", ".join(sorted(missing))} column(s)."
+        raise ValueError(msg)
+
+    imported.has_blacklisted = "blacklisted" in columns
+    imported.has_last_message = "last_message" in columns
+
+    seen: dict[int, int] = {}
+
+    for line_number, record in lines:
+        try:
+            row = parse_row(record, imported)
+        except ValueError as e:
+            imported.skipped.append((line_number, str(e)))
+            continue
+
+        if (first := seen.get(row.member_id)) is not None:
+            imported.skipped.append((line_number, f"member {row.member_id} already appears on line {first}"))
+            continue
+
+        seen[row.member_id] = line_number
+        imported.rows.append(row)
+
+    imported.skipped.sort()
+    return imported
+
+
+def serialize_levels(records: list[Levels], file_format: str) -> bytes:
+    """
+    Write levels records to CSV or JSONL, highest XP first.
+
+    Member IDs are written as strings in JSONL, since they do not fit in a JavaScript number.
+
+    Parameters
+    ----------
+    records : list[Levels]
+        The records to export.
+    file_format : str
+        Either "csv" or "jsonl".
+
+    Returns
+    -------
+    bytes
+        The file contents.
+    """
+
+    records = sorted(records, key=lambda record: (-record.xp, record.member_id))
+    output = io.StringIO()
+
+    if file_format == "csv":
+        writer = csv.writer(output)
+        writer.writerow(COLUMNS)
+
+        for record in records:
+            writer.writerow(
+                [record.member_id, record.xp, record.level, record.blacklisted, record.last_message.isoformat()],
+            )
+
+    else:
+        for record in records:
+            output.write(
+                json.dumps(
+                    {
+                        "member_id": str(record.member_id),
+                        "xp": record.xp,
+                        "level": record.level,
+                        "blacklisted": record.blacklisted,
+                        "last_message": record.last_message.isoformat(),
+                    },
+                ),
+            )
+            output.write("\n")
+
+    return output.getvalue().encode()